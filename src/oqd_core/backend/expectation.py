@@ -0,0 +1,126 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import scipy.sparse as sp
+
+########################################################################################
+from oqd_core.compiler.analog.passes import analog_operator_matrix
+
+########################################################################################
+
+__all__ = [
+    "ExpectationEngine",
+]
+
+########################################################################################
+
+
+def _vecdot(x, y):
+    # sum of conj(x) * y over the states, broadcast over the operators
+    if hasattr(np, "vecdot"):
+        return np.vecdot(x, y, axis=-2)
+    return np.einsum("dk,mdk->mk", x.conj(), y)
+
+
+class ExpectationEngine:
+    """
+    Evaluates the expectation values of many operators over blocks of states with stacked sparse products.
+
+    Args:
+        operators (dict[str, Operator]): Canonical [`Operator`][oqd_core.interface.analog.operator.Operator] of
+            each metric, e.g. of the [`Expectation`][oqd_core.backend.metric.Expectation] of
+            [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog]
+        fock_cutoff (int): Dimension of the truncated Fock space of the modes
+        cache_bytes (int): Target size of the intermediate products, see Note
+
+    Note:
+        The matrices of the operators are stacked vertically into sparse matrices, such that a single sparse-dense
+        product applies all of the operators of a stack to a block of states, followed by a single reduction against
+        the conjugate states. Operators are split into stacks whose products with a single state fit into cache_bytes,
+        which for small systems is a single stack of all operators, and the states into blocks whose products with a
+        stack fit into cache_bytes.
+
+    Example:
+        engine = ExpectationEngine({"Z": 1*Z}, 4)
+        engine.allocate(n_times); engine.write(states, start=0) => engine.values["Z"][:len(states)]
+    """
+
+    def __init__(self, operators, fock_cutoff, *, cache_bytes=2**18):
+        self.names = list(operators.keys())
+        self._values = np.empty((len(self.names), 0))
+
+        matrices = [
+            analog_operator_matrix(operator, fock_cutoff)
+            for operator in operators.values()
+        ]
+        self.dim = matrices[0].shape[0] if matrices else 1
+
+        # operators are stacked first, the blocks of states are sized from the stacks
+        itemsize = np.dtype(complex).itemsize
+        n_operators = max(1, min(len(matrices), cache_bytes // (itemsize * self.dim)))
+        self._n_states = max(1, cache_bytes // (itemsize * self.dim * n_operators))
+        self._stacks = [
+            (start, sp.vstack(matrices[start : start + n_operators], format="csr"))
+            for start in range(0, len(matrices), n_operators)
+        ]
+
+    def evaluate(self, states):
+        """
+        Returns the expectation values of the operators.
+
+        Args:
+            states (np.ndarray): States of shape (n_states, dim)
+
+        Returns:
+            values (np.ndarray): Real parts of the expectation values, of shape (n_operators, n_states)
+        """
+        if not self.names:
+            return np.empty((0, len(states)))
+
+        states = np.asarray(states, dtype=complex).reshape(-1, self.dim)
+        values = np.empty((len(self.names), len(states)))
+
+        for first in range(0, len(states), self._n_states):
+            block = np.ascontiguousarray(states[first : first + self._n_states].T)
+            for start, stack in self._stacks:
+                products = (stack @ block).reshape(-1, self.dim, block.shape[1])
+                values[
+                    start : start + len(products), first : first + block.shape[1]
+                ] = _vecdot(block, products).real
+        return values
+
+    def allocate(self, n_times):
+        """
+        Preallocates the expectation values of n_times states.
+        """
+        self._values = np.zeros((len(self.names), n_times))
+
+    def write(self, states, start):
+        """
+        Writes the expectation values of a block of consecutive states into the preallocated values.
+
+        Args:
+            states (np.ndarray): States of shape (n_states, dim)
+            start (int): Index of the first state
+        """
+        values = self.evaluate(states)
+        self._values[:, start : start + values.shape[1]] = values
+
+    @property
+    def values(self):
+        """
+        Expectation values of each operator, as views of the preallocated values.
+        """
+        return dict(zip(self.names, self._values))
@@ -0,0 +1,382 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, expm_multiply
+
+from oqd_core.backend.base import BackendBase
+from oqd_core.backend.expectation import ExpectationEngine
+from oqd_core.backend.metric import (
+    Expectation,
+)
+from oqd_core.backend.task import Task, TaskArgsAnalog, TaskResultAnalog
+
+########################################################################################
+from oqd_core.compiler.analog.matrix import MatrixFreeOperator
+from oqd_core.compiler.analog.passes import (
+    analog_circuit_canonicalization,
+    analog_operator_canonicalization,
+    analog_operator_coefficient_grid,
+    analog_operator_term_matrices,
+    assign_analog_circuit_dim,
+    verify_analog_args_dim,
+)
+from oqd_core.interface.analog.operation import (
+    AnalogCircuit,
+    Evolve,
+    Initialize,
+    Measure,
+)
+
+########################################################################################
+
+__all__ = [
+    "LocalBackend",
+]
+
+########################################################################################
+
+
+class _ParallelOperator(LinearOperator):
+    """
+    LinearOperator splitting its applications across threads, either over blocks of rows or over summands.
+    """
+
+    def __init__(self, parts, executor, *, rows=None):
+        self.parts = parts
+        self.executor = executor
+        # boundaries of the row blocks, None if the parts are summed
+        self.rows = rows
+        super().__init__(dtype=complex, shape=(parts[0].shape[1], parts[0].shape[1]))
+
+    def _matmat(self, X):
+        results = list(self.executor.map(lambda part: part @ X, self.parts))
+        if self.rows is None:
+            return sum(results)
+        return np.concatenate(results)
+
+    def _rmatmat(self, X):
+        if self.rows is None:
+            blocks = [X] * len(self.parts)
+        else:
+            blocks = [X[start:stop] for start, stop in zip(self.rows, self.rows[1:])]
+        return sum(self.executor.map(_adjoint_matmat, self.parts, blocks))
+
+
+def _adjoint_matmat(part, X):
+    if isinstance(part, LinearOperator):
+        return part.H @ X
+    return part.conj().T @ X
+
+
+def _entropy(state, dims, subsystems, alpha=1):
+    # Schmidt coefficients of the bipartition into the subsystems and the rest
+    others = [n for n in range(len(dims)) if n not in subsystems]
+    psi = np.transpose(state.reshape(dims), list(subsystems) + others)
+    psi = psi.reshape(int(np.prod([dims[n] for n in subsystems])), -1)
+    p = np.linalg.svd(psi, compute_uv=False) ** 2
+    p = p[p > 1e-15]
+
+    if alpha == 1:
+        return float(-np.sum(p * np.log(p)))
+    return float(np.log(np.sum(p**alpha)) / (1 - alpha))
+
+
+class LocalBackend(BackendBase):
+    """
+    Reference backend simulating analog tasks on the CPU with state vectors.
+
+    Args:
+        engine (Literal["dense", "sparse", "matrix-free"]): Representation of the Hamiltonians, see Note
+        n_threads (Optional[int]): Number of threads applying the Hamiltonians, None for a single thread
+        seed (Optional[int]): Seed of the sampling of the counts
+        block_size (int): Number of states whose [`Expectation`][oqd_core.backend.metric.Expectation] metrics are
+            evaluated together, see [`ExpectationEngine`][oqd_core.backend.expectation.ExpectationEngine]
+
+    Note:
+        - "dense": propagators of the time steps are exponentiated exactly, and reused over consecutive steps with the
+            same coefficients.
+        - "sparse": Hamiltonians are assembled as sparse matrices, from a single stacked sparse matrix mapping the
+            coefficients of the terms to the entries, and exponentiated with `scipy.sparse.linalg.expm_multiply`.
+        - "matrix-free": Hamiltonians are applied through
+            [`MatrixFreeOperator`][oqd_core.compiler.analog.matrix.MatrixFreeOperator] and exponentiated with
+            `scipy.sparse.linalg.expm_multiply`.
+
+        Time-dependent coefficients are sampled once per [`Evolve`][oqd_core.interface.analog.operation.Evolve] on
+        the time grid given by the dt of [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog], see
+        [`analog_operator_coefficient_grid`][oqd_core.compiler.analog.passes.matrix.analog_operator_coefficient_grid].
+        Registers start in the state 0 and modes in the vacuum, and metrics are evaluated at the start and at the
+        end of each time step.
+
+    Example:
+        LocalBackend(engine="sparse").run(Task(program=circuit, args=TaskArgsAnalog()))
+    """
+
+    engines = ("dense", "sparse", "matrix-free")
+
+    def __init__(self, *, engine="sparse", n_threads=None, seed=None, block_size=64):
+        if engine not in self.engines:
+            raise ValueError(
+                f"Unknown engine {engine}, expected one of {', '.join(self.engines)}"
+            )
+
+        self.engine = engine
+        self.n_threads = n_threads
+        self.seed = seed
+        self.block_size = block_size
+
+    def run(self, task: Task):
+        """
+        Simulates an analog task.
+
+        Args:
+            task (Task): [`Task`][oqd_core.backend.task.Task] with an
+                [`AnalogCircuit`][oqd_core.interface.analog.operation.AnalogCircuit] and
+                [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog]
+
+        Returns:
+            result (TaskResultAnalog):
+        """
+        if not isinstance(task.program, AnalogCircuit) or not isinstance(
+            task.args, TaskArgsAnalog
+        ):
+            raise TypeError("LocalBackend only simulates analog tasks")
+
+        start = time.perf_counter()
+
+        # canonicalized in the calling process, such that the backend does not spawn worker processes
+        circuit = assign_analog_circuit_dim(
+            analog_circuit_canonicalization(task.program, max_workers=1)
+        )
+        args = task.args.model_copy(
+            update={
+                "metrics": {
+                    name: metric.model_copy(
+                        update={
+                            "operator": analog_operator_canonicalization(
+                                metric.operator
+                            )
+                        }
+                    )
+                    if isinstance(metric, Expectation)
+                    else metric
+                    for name, metric in task.args.metrics.items()
+                }
+            }
+        )
+        verify_analog_args_dim(args, circuit.n_qreg, circuit.n_qmode)
+
+        self._n_qreg = circuit.n_qreg
+        self._dims = [2] * circuit.n_qreg + [args.fock_cutoff] * circuit.n_qmode
+        self._fock_cutoff = args.fock_cutoff
+
+        grids = [
+            analog_operator_coefficient_grid(
+                statement.gate.hamiltonian, statement.duration, args.dt
+            )
+            if isinstance(statement, Evolve)
+            else None
+            for statement in circuit.sequence
+        ]
+        n_times = 1 + sum(len(grid[0]) for grid in grids if grid is not None)
+
+        # metrics of all times are written into preallocated arrays
+        self._times = np.zeros(n_times)
+        self._expectation = ExpectationEngine(
+            {
+                name: metric.operator
+                for name, metric in args.metrics.items()
+                if isinstance(metric, Expectation)
+            },
+            args.fock_cutoff,
+        )
+        self._expectation.allocate(n_times)
+        self._entropies = {
+            name: (metric, np.zeros(n_times))
+            for name, metric in args.metrics.items()
+            if not isinstance(metric, Expectation)
+        }
+        self._buffer = []
+        self._n_times = 0
+
+        state = self._ground_state()
+        counts = {}
+        self._record([0.0], [state])
+
+        with ThreadPoolExecutor(max_workers=self.n_threads or 1) as executor:
+            self._executor = executor
+            for statement, grid in zip(circuit.sequence, grids):
+                if isinstance(statement, Initialize):
+                    state = self._ground_state()
+                elif isinstance(statement, Evolve):
+                    state = self._evolve(statement, state, grid)
+                elif isinstance(statement, Measure):
+                    counts = self._sample(state, args.n_shots)
+        self._flush()
+
+        values = {
+            **self._expectation.values,
+            **{name: values for name, (_, values) in self._entropies.items()},
+        }
+        return TaskResultAnalog(
+            times=self._times.tolist(),
+            state=[complex(amplitude) for amplitude in state],
+            metrics={name: values[name].tolist() for name in args.metrics},
+            counts=counts,
+            runtime=time.perf_counter() - start,
+        )
+
+    def _ground_state(self):
+        state = np.zeros(int(np.prod(self._dims)), dtype=complex)
+        state[0] = 1
+        return state
+
+    def _record(self, times, states):
+        start = self._n_times
+        self._n_times += len(times)
+        self._times[start : self._n_times] = times
+
+        for metric, values in self._entropies.values():
+            subsystems = metric.qreg + [self._n_qreg + m for m in metric.qmode]
+            alpha = getattr(metric, "alpha", 1)
+            for n, state in enumerate(states):
+                values[start + n] = _entropy(state, self._dims, subsystems, alpha)
+
+        # expectation values are evaluated per block of states
+        self._buffer.extend(states)
+        if len(self._buffer) >= self.block_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._expectation.write(
+                np.stack(self._buffer), start=self._n_times - len(self._buffer)
+            )
+            self._buffer = []
+
+    def _sample(self, state, n_shots):
+        if not n_shots:
+            return {}
+
+        p = np.abs(state) ** 2
+        outcomes = np.random.default_rng(self.seed).choice(
+            len(p), size=n_shots, p=p / p.sum()
+        )
+        counts = {}
+        for outcome, count in zip(*np.unique(outcomes, return_counts=True)):
+            key = "".join(map(str, np.unravel_index(outcome, self._dims)))
+            counts[key] = int(count)
+        return counts
+
+    def _evolve(self, statement, state, grid):
+        hamiltonian = statement.gate.hamiltonian
+        times, coefficients = grid
+        step = statement.duration / len(times)
+        static = np.all(coefficients == coefficients[:, :1])
+        t0 = self._times[self._n_times - 1]
+
+        operator = self._operator(hamiltonian)
+
+        if self.engine == "dense":
+            propagator = None
+            for n in range(len(times)):
+                if propagator is None or np.any(
+                    coefficients[:, n] != coefficients[:, n - 1]
+                ):
+                    propagator = self._parallel(
+                        scipy.linalg.expm(-1j * step * operator(coefficients[:, n]))
+                    )
+                state = propagator @ state
+                self._record([t0 + (n + 1) * step], [state])
+            return state
+
+        if static:
+            # states on the whole grid from a single exponentiation
+            H = operator(coefficients[:, 0])
+            states = expm_multiply(
+                -1j * self._parallel(H),
+                state,
+                start=0,
+                stop=statement.duration,
+                num=len(times) + 1,
+                endpoint=True,
+                traceA=-1j * H.trace(),
+            )
+            self._record(t0 + step * np.arange(1, len(times) + 1), states[1:])
+            return states[-1]
+
+        for n in range(len(times)):
+            H = operator(coefficients[:, n])
+            state = expm_multiply(
+                -1j * step * self._parallel(H),
+                state,
+                traceA=-1j * step * H.trace(),
+            )
+            self._record([t0 + (n + 1) * step], [state])
+        return state
+
+    def _operator(self, hamiltonian):
+        """
+        Returns the function assembling the Hamiltonian from the coefficients of its terms.
+        """
+        if self.engine == "matrix-free":
+            # coefficients are substituted at each step, the values of the lowering are placeholders
+            operator = MatrixFreeOperator(
+                hamiltonian, self._fock_cutoff, variables={"t": 0}
+            )
+            return operator.with_coefficients
+
+        terms = analog_operator_term_matrices(hamiltonian, self._fock_cutoff)
+        rows, cols, data, index = [], [], [], []
+        for n, (_, matrix) in enumerate(terms):
+            matrix = matrix.tocoo()
+            rows.append(matrix.row)
+            cols.append(matrix.col)
+            data.append(matrix.data)
+            index.append(np.full(matrix.nnz, n))
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        dim = terms[0][1].shape[0]
+
+        # stacked matrix mapping the coefficients of the terms to the entries of the Hamiltonian
+        entries, inverse = np.unique(rows * dim + cols, return_inverse=True)
+        stack = sp.csr_matrix(
+            (np.concatenate(data), (inverse, np.concatenate(index))),
+            shape=(len(entries), len(terms)),
+        )
+        indptr = np.searchsorted(entries // dim, np.arange(dim + 1))
+
+        def assemble(coefficients):
+            H = sp.csr_matrix(
+                (stack @ coefficients, entries % dim, indptr), shape=(dim, dim)
+            )
+            return H.toarray() if self.engine == "dense" else H
+
+        return assemble
+
+    def _parallel(self, operator):
+        if not self.n_threads or self.n_threads == 1:
+            return operator
+
+        if isinstance(operator, MatrixFreeOperator):
+            # the groups of terms are summed
+            return _ParallelOperator(operator.split(self.n_threads), self._executor)
+
+        rows = np.linspace(0, operator.shape[0], self.n_threads + 1).astype(int)
+        parts = [operator[start:stop] for start, stop in zip(rows, rows[1:])]
+        return _ParallelOperator(parts, self._executor, rows=rows)
@@ -0,0 +1,431 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+
+import numpy as np
+import scipy.sparse as sp
+from oqd_compiler_infrastructure import ConversionRule
+from scipy.sparse.linalg import LinearOperator
+
+from oqd_core.compiler.analog.error import CanonicalFormError
+from oqd_core.compiler.math.rules import EvaluateMathExpr
+from oqd_core.compiler.walk import Post
+
+########################################################################################
+from oqd_core.interface.analog import (
+    Identity,
+    OperatorAdd,
+    OperatorKron,
+    OperatorMul,
+    OperatorScalarMul,
+    OperatorSub,
+    OperatorTerminal,
+    Pauli,
+    PauliX,
+    PauliY,
+    PauliZ,
+)
+from oqd_core.interface.math import MathExpr
+
+########################################################################################
+
+__all__ = [
+    "OperatorMatrix",
+    "MatrixFreeOperator",
+    "factor_matrix",
+]
+
+########################################################################################
+
+
+@functools.lru_cache(maxsize=None)
+def _factor_matrix(name, fock_cutoff):
+    if name == "PauliI":
+        data = np.eye(2)
+    elif name == "PauliX":
+        data = np.array([[0, 1], [1, 0]])
+    elif name == "PauliY":
+        data = np.array([[0, -1j], [1j, 0]])
+    elif name == "PauliZ":
+        data = np.array([[1, 0], [0, -1]])
+    elif name == "Identity":
+        data = np.eye(fock_cutoff)
+    elif name == "Annihilation":
+        data = np.diag(np.sqrt(np.arange(1, fock_cutoff)), k=1)
+    elif name == "Creation":
+        data = np.diag(np.sqrt(np.arange(1, fock_cutoff)), k=-1)
+    else:
+        raise TypeError(f"No matrix representation of {name}")
+
+    matrix = sp.csr_matrix(data, dtype=complex)
+    # the matrices are shared by all of their uses
+    matrix.data.flags.writeable = False
+    return matrix
+
+
+def factor_matrix(model: OperatorTerminal, fock_cutoff: int):
+    """
+    Returns the sparse matrix of a single-site operator, cached per type and Fock cutoff.
+
+    Args:
+        model (OperatorTerminal): [`Pauli`][oqd_core.interface.analog.operator.Pauli] or
+            [`Ladder`][oqd_core.interface.analog.operator.Ladder] operator
+        fock_cutoff (int): Dimension of the truncated Fock space of the modes
+
+    Returns:
+        matrix (scipy.sparse.csr_matrix): Read-only complex matrix, shared between all calls
+
+    Example:
+        factor_matrix(Annihilation(), 3) => [[0, 1, 0], [0, 0, sqrt(2)], [0, 0, 0]]
+    """
+    name = model.__class__.__name__
+    if name.startswith("Pauli"):
+        # Pauli matrices do not depend on the cutoff
+        fock_cutoff = None
+    return _factor_matrix(name, fock_cutoff)
+
+
+class OperatorMatrix(ConversionRule):
+    """
+    ConversionRule which lowers operators to sparse matrices, in the order of the subsystems given by the
+    tensor products.
+
+    Args:
+        model (Operator): [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level
+
+    Returns:
+        matrix (scipy.sparse.csr_matrix):
+
+    Assumptions:
+        None
+
+    Note:
+        - Coefficients are evaluated with the values of the [`MathVar`][oqd_core.interface.math.MathVar] bound
+            through the variables attribute, see [`EvaluateMathExpr`][oqd_core.compiler.math.rules.EvaluateMathExpr].
+        - Single-site matrices are taken from [`factor_matrix`][oqd_core.compiler.analog.matrix.factor_matrix].
+
+    Example:
+        X@Y => kron([[0, 1], [1, 0]], [[0, -1j], [1j, 0]])
+    """
+
+    def __init__(self, *, fock_cutoff, variables=None):
+        super().__init__()
+
+        self.fock_cutoff = fock_cutoff
+        self.variables = {} if variables is None else variables
+
+    def map_OperatorTerminal(self, model: OperatorTerminal, operands):
+        return factor_matrix(model, self.fock_cutoff)
+
+    def map_MathExpr(self, model: MathExpr, operands):
+        return model
+
+    def map_OperatorScalarMul(self, model: OperatorScalarMul, operands):
+        coefficient = Post(EvaluateMathExpr(variables=self.variables))(model.expr)
+        return complex(coefficient) * operands["op"]
+
+    def map_OperatorAdd(self, model: OperatorAdd, operands):
+        return (operands["op1"] + operands["op2"]).tocsr()
+
+    def map_OperatorSub(self, model: OperatorSub, operands):
+        return (operands["op1"] - operands["op2"]).tocsr()
+
+    def map_OperatorMul(self, model: OperatorMul, operands):
+        return (operands["op1"] @ operands["op2"]).tocsr()
+
+    def map_OperatorKron(self, model: OperatorKron, operands):
+        return sp.kron(operands["op1"], operands["op2"], format="csr")
+
+
+def _parity(values):
+    if hasattr(np, "bitwise_count"):
+        return (np.bitwise_count(values) & 1).astype(np.int8)
+    values = np.array(values, dtype=np.int64)
+    shift = 32
+    while shift:
+        values ^= values >> shift
+        shift //= 2
+    return (values & 1).astype(np.int8)
+
+
+class MatrixFreeOperator(LinearOperator):
+    """
+    Matrix-free `scipy.sparse.linalg.LinearOperator` of an operator in canonical form, e.g. for
+    `scipy.sparse.linalg.expm_multiply`. The state vectors are ordered as the matrices of
+    [`OperatorMatrix`][oqd_core.compiler.analog.matrix.OperatorMatrix], over the quantum registers followed by
+    the quantum modes.
+
+    Args:
+        model (Operator): [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level
+        fock_cutoff (int): Dimension of the truncated Fock space of the modes
+        variables (Optional[dict[str, float]]): Values of the [`MathVar`][oqd_core.interface.math.MathVar]
+            of the coefficients
+        cache_bytes (int): Maximum memory used to keep the phases of the Pauli strings between applications
+
+    Assumptions:
+        [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization]
+
+    Note:
+        - Pauli strings are applied as a permutation of the indices of the registers, given by the XOR with the bits
+            flipped by the string, followed by a phase. Terms flipping the same bits share a single permutation.
+        - Products of ladder operators are applied along the axis of their mode through the diagonals of their
+            banded matrices.
+    """
+
+    def __init__(self, model, fock_cutoff, *, variables=None, cache_bytes=2**28):
+        evaluate = Post(EvaluateMathExpr(variables=variables))
+        lower = Post(OperatorMatrix(fock_cutoff=fock_cutoff))
+
+        terms = []
+        while isinstance(model, OperatorAdd):
+            terms.append(model.op2)
+            model = model.op1
+        terms.append(model)
+
+        n_qreg = n_qmode = None
+        groups = {}
+        layout = []
+        for term in reversed(terms):
+            if not isinstance(term, OperatorScalarMul):
+                raise CanonicalFormError("Term of the operator has not been scaled")
+            coefficient = complex(evaluate(term.expr))
+
+            factors = []
+            op = term.op
+            while isinstance(op, OperatorKron):
+                factors.append(op.op2)
+                op = op.op1
+            factors.append(op)
+            factors.reverse()
+
+            paulis = 0
+            while paulis < len(factors) and isinstance(factors[paulis], Pauli):
+                paulis += 1
+            if n_qreg is None:
+                n_qreg, n_qmode = paulis, len(factors) - paulis
+            if (paulis, len(factors) - paulis) != (n_qreg, n_qmode):
+                raise CanonicalFormError("Terms act on different subsystems")
+
+            x = z = 0
+            unit = 1
+            for factor in factors[:n_qreg]:
+                x = (x << 1) | isinstance(factor, (PauliX, PauliY))
+                z = (z << 1) | isinstance(factor, (PauliZ, PauliY))
+                if isinstance(factor, PauliY):
+                    unit *= 1j
+
+            modes = tuple(
+                (axis, lower(factor))
+                for axis, factor in enumerate(factors[n_qreg:])
+                if not isinstance(factor, Identity)
+            )
+            key = (x, tuple((axis, m.toarray().tobytes()) for axis, m in modes))
+            group = groups.setdefault(key, (len(groups), x, modes, []))
+            # position of the term within its group, to substitute its coefficient
+            layout.append((group[0], len(group[3]), unit))
+            group[3].append((z, unit * coefficient))
+
+        self._init(
+            [group[1:] for group in groups.values()],
+            n_qreg,
+            n_qmode,
+            fock_cutoff,
+            cache_bytes=cache_bytes,
+        )
+        self._layout = layout
+
+    def _init(self, groups, n_qreg, n_qmode, fock_cutoff, *, cache_bytes, bands=None):
+        self.n_qreg = n_qreg
+        self.n_qmode = n_qmode
+        self.fock_cutoff = fock_cutoff
+        self.cache_bytes = cache_bytes
+        self._groups = groups
+        self._layout = None
+        # diagonals of the mode factors, as (offsets, data) of the DIA format
+        if bands is None:
+            bands = [[(axis, m.todia()) for axis, m in modes] for _, modes, _ in groups]
+        self._bands = bands
+        self._phases = {}
+        self._cached_bytes = 0
+
+        dim = 2**n_qreg * fock_cutoff**n_qmode
+        super().__init__(dtype=complex, shape=(dim, dim))
+
+    def with_coefficients(self, coefficients):
+        """
+        Returns the operator with the coefficients of its terms substituted, without lowering the terms again.
+
+        Args:
+            coefficients (ArrayLike): Coefficient of each term, in the order of
+                [`analog_operator_term_matrices`][oqd_core.compiler.analog.passes.matrix.analog_operator_term_matrices]
+
+        Returns:
+            operator (MatrixFreeOperator):
+        """
+        if self._layout is None:
+            raise ValueError(
+                "Coefficients of the terms are only known for lowered operators"
+            )
+        if len(coefficients) != len(self._layout):
+            raise ValueError(
+                f"Expected {len(self._layout)} coefficients, got {len(coefficients)}"
+            )
+
+        groups = [(x, modes, list(terms)) for x, modes, terms in self._groups]
+        for (i, slot, unit), coefficient in zip(self._layout, coefficients):
+            z, _ = groups[i][2][slot]
+            groups[i][2][slot] = (z, unit * complex(coefficient))
+
+        operator = MatrixFreeOperator.__new__(MatrixFreeOperator)
+        operator._init(
+            groups,
+            self.n_qreg,
+            self.n_qmode,
+            self.fock_cutoff,
+            cache_bytes=self.cache_bytes,
+            bands=self._bands,
+        )
+        operator._layout = self._layout
+        return operator
+
+    def split(self, n_parts):
+        """
+        Splits the operator into at most n_parts operators, summing to the operator, over disjoint groups of terms.
+
+        Args:
+            n_parts (int): Maximum number of operators, e.g. one per thread applying the operator
+
+        Returns:
+            operators (list[MatrixFreeOperator]):
+        """
+        operators = []
+        for indices in np.array_split(np.arange(len(self._groups)), n_parts):
+            if len(indices) == 0:
+                continue
+            operator = MatrixFreeOperator.__new__(MatrixFreeOperator)
+            operator._init(
+                [self._groups[i] for i in indices],
+                self.n_qreg,
+                self.n_qmode,
+                self.fock_cutoff,
+                cache_bytes=self.cache_bytes // n_parts,
+                bands=[self._bands[i] for i in indices],
+            )
+            operators.append(operator)
+        return operators
+
+    def trace(self):
+        """
+        Returns the trace of the operator, e.g. for the traceA argument of `scipy.sparse.linalg.expm_multiply`.
+        """
+        trace = 0
+        for (x, _, terms), bands in zip(self._groups, self._bands):
+            # Pauli strings flipping bits are traceless, as are those with a Z
+            if x:
+                continue
+            paulis = sum(coefficient for z, coefficient in terms if z == 0)
+            modes = np.prod([m.diagonal().sum() for _, m in bands])
+            trace += (
+                paulis
+                * modes
+                * 2**self.n_qreg
+                * self.fock_cutoff ** (self.n_qmode - len(bands))
+            )
+        return complex(trace)
+
+    def _indices(self):
+        if not hasattr(self, "_index"):
+            dtype = np.int32 if self.n_qreg < 31 else np.int64
+            self._index = np.arange(2**self.n_qreg, dtype=dtype)
+        return self._index
+
+    def _phase(self, i):
+        """
+        Returns the sum of the phases of the Pauli strings of a group, indexed by the register after the bit flips.
+        """
+        if i in self._phases:
+            return self._phases[i]
+
+        x, _, terms = self._groups[i]
+        if all(z == 0 for z, _ in terms):
+            return sum(coefficient for _, coefficient in terms)
+
+        flipped = self._indices() ^ x
+        phase = np.zeros(len(flipped), dtype=complex)
+        for z, coefficient in terms:
+            phase += coefficient * (1 - 2 * _parity(flipped & z))
+
+        if self._cached_bytes + phase.nbytes <= self.cache_bytes:
+            self._phases[i] = phase
+            self._cached_bytes += phase.nbytes
+        return phase
+
+    def _apply_bands(self, w, axis, bands):
+        n = self.fock_cutoff
+        w = w.reshape(2**self.n_qreg * n**axis, n, -1)
+        result = np.zeros_like(w)
+        for offset, data in zip(bands.offsets, bands.data):
+            if offset >= 0:
+                result[:, : n - offset] += data[offset:, None] * w[:, offset:]
+            else:
+                result[:, -offset:] += data[: n + offset, None] * w[:, : n + offset]
+        return result
+
+    def _matmat(self, X):
+        X = np.asarray(X, dtype=complex).reshape(self.shape[1], -1)
+        result = np.zeros((2**self.n_qreg, X.size // 2**self.n_qreg), dtype=complex)
+
+        # buffer of the permuted states, reused between the groups
+        buffer = np.empty_like(result)
+        for i, (x, _, _) in enumerate(self._groups):
+            w = X
+            for axis, bands in self._bands[i]:
+                w = self._apply_bands(w, axis, bands)
+            w = w.reshape(result.shape)
+
+            if x:
+                np.take(w, self._indices() ^ x, axis=0, out=buffer)
+            else:
+                np.copyto(buffer, w)
+
+            phase = self._phase(i)
+            buffer *= phase if np.isscalar(phase) else phase[:, None]
+            result += buffer
+
+        return result.reshape(X.shape)
+
+    def _matvec(self, x):
+        return self._matmat(np.reshape(x, (-1, 1))).reshape(-1)
+
+    def _adjoint(self):
+        groups = []
+        for x, modes, terms in self._groups:
+            # (X^x Z^z)^dagger = (-1)^(x.z) X^x Z^z
+            terms = [
+                (z, coefficient.conjugate() * (-1) ** int(_parity(np.int64(x & z))))
+                for z, coefficient in terms
+            ]
+            modes = tuple((axis, m.conj().T.tocsr()) for axis, m in modes)
+            groups.append((x, modes, terms))
+
+        adjoint = MatrixFreeOperator.__new__(MatrixFreeOperator)
+        adjoint._init(
+            groups,
+            self.n_qreg,
+            self.n_qmode,
+            self.fock_cutoff,
+            cache_bytes=self.cache_bytes,
+        )
+        return adjoint
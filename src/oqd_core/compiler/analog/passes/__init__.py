@@ -14,15 +14,33 @@
 
 from .analysis import analysis_canonical_hamiltonian_dim, analysis_term_index
 from .assign import assign_analog_circuit_dim, verify_analog_args_dim
-from .canonicalize import analog_operator_canonicalization
+from .canonicalize import (
+    CanonicalizationCache,
+    analog_circuit_canonicalization,
+    analog_operator_canonicalization,
+    canonicalization_cache,
+)
+from .matrix import (
+    analog_operator_coefficient_grid,
+    analog_operator_linear_operator,
+    analog_operator_matrix,
+    analog_operator_term_matrices,
+)
 from .xx_analysis import XXGateAnalyzer, analyze_xx_gates
 
 __all__ = [
     "assign_analog_circuit_dim",
     "verify_analog_args_dim",
     "analog_operator_canonicalization",
+    "analog_circuit_canonicalization",
+    "CanonicalizationCache",
+    "canonicalization_cache",
     "analysis_canonical_hamiltonian_dim",
     "analysis_term_index",
+    "analog_operator_matrix",
+    "analog_operator_term_matrices",
+    "analog_operator_coefficient_grid",
+    "analog_operator_linear_operator",
     "XXGateAnalyzer",
     "analyze_xx_gates",
 ]
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oqd_compiler_infrastructure import In
+import functools
 
 ########################################################################################
 from oqd_core.compiler.analog.analysis import TermIndex
+from oqd_core.compiler.walk import In
+from oqd_core.interface.analog import Operator, OperatorBinaryOp, OperatorScalarMul
 
 ########################################################################################
 
@@ -27,6 +29,46 @@ __all__ = [
 ########################################################################################
 
 
+class _StructuralKey:
+    """
+    Hashable key of an operator given by the types of its nodes in pre-order. Coefficients are not part
+    of the key as they do not change the TermIndex.
+    """
+
+    __slots__ = ("model", "key", "hash")
+
+    def __init__(self, model):
+        key = []
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            key.append(type(node))
+            if isinstance(node, OperatorScalarMul):
+                stack.append(node.op)
+            elif isinstance(node, OperatorBinaryOp):
+                stack.append(node.op2)
+                stack.append(node.op1)
+
+        self.model = model
+        self.key = tuple(key)
+        self.hash = hash(self.key)
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+@functools.lru_cache(maxsize=4096)
+def _term_index(key):
+    analysis = In(TermIndex())
+    analysis(model=key.model)
+    # the cache only holds on to the key
+    key.model = None
+    return tuple(tuple(term) for term in analysis.children[0].term_idx)
+
+
 def analysis_term_index(model):
     """
     This pass computes and returns the TermIndex of an operator
@@ -38,13 +80,25 @@ def analysis_term_index(model):
     Returns:
         dim (list[list[Union[int, tuple]]]):
 
+    Note:
+        Results are kept in a bounded LRU cache keyed by the structure of the operator, which is shared by all passes.
+        Use `analysis_term_index.cache_info()` for the hit/miss counters and `analysis_term_index.cache_clear()`
+        to clear the cache.
+
     Example:
         for model = X@Y, the output is [[1,2]]
         for model = X + Y the output is [[1], [2]]
     """
-    analysis = In(TermIndex())
-    analysis(model=model)
-    return analysis.children[0].term_idx
+    if not isinstance(model, Operator):
+        analysis = In(TermIndex())
+        analysis(model=model)
+        return analysis.children[0].term_idx
+
+    return [list(term) for term in _term_index(_StructuralKey(model))]
+
+
+analysis_term_index.cache_info = _term_index.cache_info
+analysis_term_index.cache_clear = _term_index.cache_clear
 
 
 def analysis_canonical_hamiltonian_dim(model):
@@ -59,13 +113,15 @@ def analysis_canonical_hamiltonian_dim(model):
     Returns:
         tupe(int,int)
 
+    Note:
+        The TermIndex is shared with [`analysis_term_index`][oqd_core.compiler.analog.passes.analysis.analysis_term_index]
+        and its cache.
+
     Example:
         for model = X@Y, the output is (2,0) where 2 is for number of quantum registers
         and 0 is for number of quantum modes
     """
-    analysis = In(TermIndex())
-    analysis(model=model)
-    term = analysis.children[0].term_idx[0]
+    term = analysis_term_index(model)[0]
 
     dim = (0, 0)
     for elem in term:
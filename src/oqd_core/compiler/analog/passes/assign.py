@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oqd_compiler_infrastructure import Post
 
 ########################################################################################
 from oqd_core.compiler.analog.rewrite.assign import AssignAnalogIRDim
@@ -20,6 +19,7 @@ from oqd_core.compiler.analog.verify.task import (
     VerifyAnalogArgsDim,
     VerifyAnalogCircuitDim,
 )
+from oqd_core.compiler.walk import Post
 
 ########################################################################################
 
@@ -12,96 +12,376 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oqd_compiler_infrastructure import Chain, FixedPoint, In, Post, Pre
+import functools
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from oqd_compiler_infrastructure import Chain, VisitableBaseModel
+from pydantic import TypeAdapter
 
 ########################################################################################
 from oqd_core.compiler.analog.rewrite.canonicalize import (
+    FusedCanonicalization,
     GatherMathExpr,
     GatherPauli,
-    NormalOrder,
+    LadderNormalOrder,
     OperatorDistribute,
     PauliAlgebra,
+    PauliStringCanonicalization,
     ProperOrder,
     PruneIdentity,
     ScaleTerms,
-    SortedOrder,
+    SortTerms,
 )
 from oqd_core.compiler.analog.verify import (
-    CanVerGatherMathExpr,
-    CanVerGatherPauli,
-    CanVerNormalOrder,
-    CanVerOperatorDistribute,
-    CanVerPauliAlgebra,
-    CanVerProperOrder,
-    CanVerPruneIdentity,
-    CanVerScaleTerm,
-    CanVerSortedOrder,
+    CanVerCanonicalForm,
     VerifyHilberSpaceDim,
 )
 from oqd_core.compiler.math.rules import (
+    CanonicalOrderMathExpr,
     DistributeMathExpr,
-    PartitionMathExpr,
-    ProperOrderMathExpr,
 )
+from oqd_core.compiler.tracking import (
+    FixedPointInfo,
+    TrackedFixedPoint,
+    fixed_point_statistics,
+)
+from oqd_core.compiler.walk import In, Post, Pre
+from oqd_core.interface.analog import Operator
+from oqd_core.interface.analog.operator import OperatorSubtypes
+from oqd_core.interface.base import TrustedBaseModel, trusted_construction
 
 ########################################################################################
 
 __all__ = [
     "analog_operator_canonicalization",
+    "analog_circuit_canonicalization",
+    "CanonicalizationCache",
+    "canonicalization_cache",
 ]
 
 ########################################################################################
 
 dist_chain = Chain(
-    FixedPoint(Post(OperatorDistribute())),
-    FixedPoint(Post(GatherMathExpr())),
-    FixedPoint(Post(OperatorDistribute())),
+    TrackedFixedPoint(Post(OperatorDistribute())),
+    TrackedFixedPoint(Post(GatherMathExpr())),
+    TrackedFixedPoint(Post(OperatorDistribute())),
 )
 
 pauli_chain = Chain(
-    FixedPoint(Post(PauliAlgebra())),
-    FixedPoint(Post(GatherMathExpr())),
-    FixedPoint(Post(PauliAlgebra())),
+    TrackedFixedPoint(Post(PauliAlgebra())),
+    TrackedFixedPoint(Post(GatherMathExpr())),
+    TrackedFixedPoint(Post(PauliAlgebra())),
 )
 
 normal_order_chain = Chain(
-    FixedPoint(Post(NormalOrder())),
-    FixedPoint(Post(OperatorDistribute())),
-    FixedPoint(Post(GatherMathExpr())),
-    FixedPoint(Post(ProperOrder())),
-    FixedPoint(Post(NormalOrder())),
+    TrackedFixedPoint(Pre(LadderNormalOrder())),
+    TrackedFixedPoint(Post(OperatorDistribute())),
+    TrackedFixedPoint(Post(GatherMathExpr())),
+    TrackedFixedPoint(Post(ProperOrder())),
 )
 
-scale_terms_chain = Chain(
-    FixedPoint(Pre(ScaleTerms())),
-    FixedPoint(Post(GatherMathExpr())),
-)
+
+def _scale_terms_chain():
+    return Chain(
+        TrackedFixedPoint(Pre(ScaleTerms())),
+        TrackedFixedPoint(Post(GatherMathExpr())),
+    )
+
 
 math_chain = Chain(
-    FixedPoint(Post(DistributeMathExpr())),
-    FixedPoint(Post(ProperOrderMathExpr())),
-    FixedPoint(Post(PartitionMathExpr())),
+    TrackedFixedPoint(Post(DistributeMathExpr())),
+    Pre(CanonicalOrderMathExpr()),
 )
 
-verify_canonicalization = Chain(
-    Post(CanVerOperatorDistribute()),
-    Post(CanVerGatherMathExpr()),
-    Post(CanVerProperOrder()),
-    Post(CanVerPauliAlgebra()),
-    Post(CanVerGatherPauli()),
-    Post(CanVerNormalOrder()),
-    Post(CanVerPruneIdentity()),
-    Post(CanVerSortedOrder()),
-    Pre(CanVerScaleTerm()),
-)
+verify_canonicalization = CanVerCanonicalForm()
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CanonicalizationCache:
+    """
+    Bounded LRU cache of canonicalized [`Operator`][oqd_core.interface.analog.operator.Operator] keyed by the
+    structure of the input operator. Persisted files are named by the SHA-256 of the key.
+
+    Args:
+        maxsize (int): Maximum number of canonicalized operators held in memory
+        maxnodes (int): Maximum total number of nodes of the keys and canonicalized operators held in memory, which
+            bounds the memory of the cache for large operators
+        path (Optional[Union[str, Path]]): Directory in which canonicalized operators are persisted as JSON files,
+            such that they are reused across processes
+
+    Note:
+        - Operators are copied out of the cache, such that mutating a result does not alter the cache.
+        - The persisted files are not bounded by maxsize or maxnodes, the key includes the version of oqd-core.
+
+    Example:
+        >>> cache = CanonicalizationCache(maxsize=256, path=".oqd_cache")
+        >>> analog_operator_canonicalization(circuit, cache=cache)
+        >>> cache.cache_info()
+    """
+
+    _adapter = TypeAdapter(OperatorSubtypes)
+    # names of the fields of each node type, in reversed order
+    _fields = {}
+
+    def __init__(self, *, maxsize=1024, maxnodes=2**18, path=None):
+        self.maxsize = maxsize
+        self.maxnodes = maxnodes
+        self.path = None if path is None else Path(path)
+        self._cache = OrderedDict()
+        # number of nodes of each entry, and in total
+        self._nodes = {}
+        self._n_nodes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        try:
+            self._version = version("oqd-core")
+        except PackageNotFoundError:
+            self._version = "unknown"
 
+    @staticmethod
+    def key(model: Operator):
+        """
+        Returns the structural key of an operator, given by the types of its nodes and the types and values of its
+        terminals in pre-order, such that e.g. MathNum(value=1) and MathNum(value=1.0) have different keys.
+        """
+        key = []
+        stack = [model]
+        fields = CanonicalizationCache._fields
+        while stack:
+            node = stack.pop()
+            kind = type(node)
+            names = fields.get(kind)
+            if names is None:
+                if not isinstance(node, TrustedBaseModel):
+                    key.append((kind, node))
+                    continue
+                names = fields[kind] = tuple(reversed(node._trusted_fields))
 
-def analog_operator_canonicalization(model):
+            key.append(kind)
+            values = node.__dict__
+            for name in names:
+                stack.append(values[name])
+        return tuple(key)
+
+    def __call__(self, model: Operator, canonicalize, *, namespace=None):
+        """
+        Returns the canonicalized operator from the cache, or canonicalizes it with the canonicalize function.
+        Operators canonicalized differently, e.g. by different engines, are separated by their namespace.
+        """
+        key = self.key(model)
+        if namespace is not None:
+            key = (namespace, *key)
+
+        canonical = self._get(key)
+        if canonical is None:
+            canonical = canonicalize(model)
+            self._put(key, canonical)
+        return _copy(canonical)
+
+    def _get(self, key):
+        """
+        Returns the canonicalized operator of a key from memory or from disk, or None on a miss.
+        """
+        with self._lock:
+            if key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        canonical = self._load(key)
+        if canonical is not None:
+            with self._lock:
+                self._hits += 1
+            self._insert(key, canonical)
+        return canonical
+
+    def _put(self, key, canonical):
+        """
+        Stores the canonicalized operator of a key that missed the cache.
+        """
+        self._dump(key, canonical)
+        with self._lock:
+            self._misses += 1
+        self._insert(key, canonical)
+
+    def _insert(self, key, canonical):
+        nodes = len(key) + len(self.key(canonical))
+        with self._lock:
+            self._cache[key] = canonical
+            self._cache.move_to_end(key)
+            self._n_nodes += nodes - self._nodes.get(key, 0)
+            self._nodes[key] = nodes
+            while self._cache and (
+                len(self._cache) > self.maxsize or self._n_nodes > self.maxnodes
+            ):
+                evicted, _ = self._cache.popitem(last=False)
+                self._n_nodes -= self._nodes.pop(evicted)
+
+    def _file(self, key):
+        data = self._version + repr(key)
+        return self.path / f"{hashlib.sha256(data.encode()).hexdigest()}.json"
+
+    def _load(self, key):
+        if self.path is None:
+            return None
+        try:
+            data = self._file(key).read_text()
+        except FileNotFoundError:
+            return None
+        return self._adapter.validate_json(data)
+
+    def _dump(self, key, model):
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        # written to a temporary file first, such that concurrent processes never read partial files
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(model.model_dump_json())
+        os.replace(tmp, self._file(key))
+
+    def cache_info(self):
+        """
+        Returns the hit/miss counters and the size of the cache in memory.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        """
+        Clears the cache in memory and its counters, persisted files are kept.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._nodes.clear()
+            self._n_nodes = 0
+            self._hits = 0
+            self._misses = 0
+
+
+canonicalization_cache = CanonicalizationCache()
+"""
+Shared [`CanonicalizationCache`][oqd_core.compiler.analog.passes.canonicalize.CanonicalizationCache] of the process,
+which callers of [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization]
+pass explicitly to reuse canonicalized operators across calls
+"""
+
+
+def _map_operators(model, func):
+    """
+    Applies func to the outermost operators of a model, without descending into the operators.
+    """
+    if isinstance(model, Operator):
+        return func(model)
+    if isinstance(model, (list, tuple)):
+        return model.__class__(_map_operators(e, func) for e in model)
+    if isinstance(model, dict):
+        return {k: _map_operators(v, func) for k, v in model.items()}
+    if isinstance(model, VisitableBaseModel):
+        return model.model_copy(
+            update={
+                key: _map_operators(getattr(model, key), func)
+                for key in model.__class__.model_fields
+                if key != "class_"
+            }
+        )
+    return model
+
+
+def _collect_statistics(rule, statistics):
+    # the statistics are reset on every call, as the stages are shared between calls
+    collected = fixed_point_statistics(rule, reset=True)
+    if statistics is None:
+        return
+
+    for stage, info in collected.items():
+        previous = statistics.get(stage, FixedPointInfo(0, 0))
+        statistics[stage] = FixedPointInfo(
+            previous.calls + info.calls, previous.iterations + info.iterations
+        )
+
+
+def _verifier(verification):
+    if verification == "full":
+        return verify_canonicalization
+    return CanVerCanonicalForm(level=verification)
+
+
+def _namespace(engine, verification):
+    # results of other engines or verification levels are cached separately from the default ones
+    if engine == "chain" and verification == "full":
+        return None
+    return (engine, verification)
+
+
+def _operator_canonicalization(
+    model: Operator, statistics=None, engine="chain", verify=verify_canonicalization
+):
+    with trusted_construction():
+        if engine == "fused":
+            canonical = FusedCanonicalization(math_pass=math_chain).canonicalize(model)
+        else:
+            canonical = PauliStringCanonicalization(math_pass=math_chain).canonicalize(
+                model
+            )
+        if canonical is not None:
+            _collect_statistics(math_chain, statistics)
+            return verify(canonical)
+
+        chain = Chain(
+            TrackedFixedPoint(dist_chain, name="distribute"),
+            TrackedFixedPoint(Post(ProperOrder()), name="proper_order"),
+            TrackedFixedPoint(pauli_chain, name="pauli_algebra"),
+            TrackedFixedPoint(Post(GatherPauli()), name="gather_pauli"),
+            In(VerifyHilberSpaceDim(), reverse=True),
+            TrackedFixedPoint(normal_order_chain, name="normal_order"),
+            TrackedFixedPoint(Post(PruneIdentity()), name="prune_identity"),
+            # ScaleTerms keeps the state of its walk, each operator is scaled by a new instance
+            TrackedFixedPoint(_scale_terms_chain(), name="scale_terms"),
+            Pre(SortTerms()),
+            math_chain,
+            verify,
+        )
+        canonical = chain(model=model)
+        _collect_statistics(chain, statistics)
+        return canonical
+
+
+def analog_operator_canonicalization(
+    model,
+    *,
+    cache=None,
+    statistics=None,
+    engine="chain",
+    verification="full",
+):
     """
     This pass runs canonicalization chain for Operators with a verifies for canonicalization.
 
     Args:
         model (VisitableBaseModel):
+        cache (Optional[CanonicalizationCache]): Cache of canonicalized operators, e.g.
+            [`canonicalization_cache`][oqd_core.compiler.analog.passes.canonicalize.canonicalization_cache], defaults to
+            None which disables caching
+        statistics (Optional[Dict[str, FixedPointInfo]]): Dictionary in which the number of calls and iterations of each
+            fixed point stage are accumulated, see [`fixed_point_statistics`][oqd_core.compiler.tracking.fixed_point_statistics].
+            Operators found in the cache are not canonicalized again and are not counted.
+        engine (str): Canonicalization engine, either "chain" for the canonicalization chain or "fused" for
+            [`FusedCanonicalization`][oqd_core.compiler.analog.rewrite.canonicalize.FusedCanonicalization],
+            which falls back to the canonicalization chain for operators it does not support
+        verification (str): Verification level of the canonical form, either "full", "sampled" or "off", see
+            [`CanVerCanonicalForm`][oqd_core.compiler.analog.verify.canonicalize.CanVerCanonicalForm]
 
     Returns:
         model (VisitableBaseModel):  [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level are in canonical form
@@ -109,6 +389,21 @@ def analog_operator_canonicalization(model):
     Assumptions:
         None
 
+    Note:
+        - Each outermost [`Operator`][oqd_core.interface.analog.operator.Operator] of the model, e.g. the hamiltonian of each
+            [`AnalogGate`][oqd_core.interface.analog.operations.AnalogGate], is canonicalized independently and, with a cache, looked up
+            in the [`CanonicalizationCache`][oqd_core.compiler.analog.passes.canonicalize.CanonicalizationCache], such
+            that repeated operators are canonicalized once.
+        - Nodes rebuilt from already valid children are constructed without validation, see
+            [`trusted_construction`][oqd_core.interface.base.trusted_construction].
+        - Operators composed only of Pauli operators are canonicalized through a sparse dictionary of Pauli strings, see
+            [`PauliStringCanonicalization`][oqd_core.compiler.analog.rewrite.canonicalize.PauliStringCanonicalization].
+            All other operators go through the canonicalization chain.
+        - The fixed point stages of the chain stop once none of their rules rewrites the operator, see
+            [`TrackedFixedPoint`][oqd_core.compiler.tracking.TrackedFixedPoint]. Operators found in the cache do not
+            contribute to the statistics and are not verified again, operators are cached separately for each engine and
+            verification level.
+
     Example:
         - for model = X@(Y + Z), output is 1*(X@Y) + 1 * (X@Z)
         - for model = [`AnalogGate`][oqd_core.interface.analog.operations.AnalogGate](hamiltonian = (A * J)@X), output is
@@ -118,16 +413,137 @@ def analog_operator_canonicalization(model):
     Acknowledgement:
         This code was inspired by [Liang.jl](https://github.com/Roger-luo/Liang.jl/blob/main/src/canonicalize/entry.jl#L8).
     """
-    return Chain(
-        FixedPoint(dist_chain),
-        FixedPoint(Post(ProperOrder())),
-        FixedPoint(pauli_chain),
-        FixedPoint(Post(GatherPauli())),
-        In(VerifyHilberSpaceDim(), reverse=True),
-        FixedPoint(normal_order_chain),
-        FixedPoint(Post(PruneIdentity())),
-        FixedPoint(scale_terms_chain),
-        FixedPoint(Post(SortedOrder())),
-        math_chain,
-        verify_canonicalization,
-    )(model=model)
+    if engine not in ("chain", "fused"):
+        raise ValueError(f"Unknown canonicalization engine {engine!r}")
+    verify = _verifier(verification)
+
+    canonicalize = functools.partial(
+        _operator_canonicalization,
+        statistics=statistics,
+        engine=engine,
+        verify=verify,
+    )
+    if cache is not None:
+        canonicalize = functools.partial(
+            cache,
+            canonicalize=canonicalize,
+            namespace=_namespace(engine, verification),
+        )
+
+    return _map_operators(model, canonicalize)
+
+
+def _decode(key):
+    """
+    Rebuilds an operator from its structural key, see
+    [`CanonicalizationCache.key`][oqd_core.compiler.analog.passes.canonicalize.CanonicalizationCache.key].
+    """
+    values = []
+    with trusted_construction():
+        for item in reversed(key):
+            if isinstance(item, tuple):
+                item = item[1]
+            else:
+                item = item(**{name: values.pop() for name in item._trusted_fields})
+            values.append(item)
+    return values[0]
+
+
+def _copy(model):
+    # rebuilt from the structural key, deep copies of long sums would exceed the recursion limit
+    return _decode(CanonicalizationCache.key(model))
+
+
+def _canonicalize_encoded(key, engine, verification):
+    # runs in the worker processes, operators are exchanged as structural keys
+    canonical = _operator_canonicalization(
+        _decode(key), engine=engine, verify=_verifier(verification)
+    )
+    return CanonicalizationCache.key(canonical)
+
+
+def analog_circuit_canonicalization(
+    model,
+    *,
+    max_workers=None,
+    cache=None,
+    engine="chain",
+    verification="full",
+):
+    """
+    This pass canonicalizes the distinct Operators of a model in parallel across a pool of processes, equivalent to
+    [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization].
+
+    Args:
+        model (VisitableBaseModel): e.g. an [`AnalogCircuit`][oqd_core.interface.analog.operations.AnalogCircuit]
+        max_workers (Optional[int]): Maximum number of worker processes, defaults to the number of processors.
+            With a single worker the operators are canonicalized in the calling process.
+        cache (Optional[CanonicalizationCache]): Cache of canonicalized operators, defaults to None which disables
+            caching
+        engine (str): Canonicalization engine, either "chain" or "fused"
+        verification (str): Verification level of the canonical form, either "full", "sampled" or "off"
+
+    Returns:
+        model (VisitableBaseModel):  [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level are in canonical form
+
+    Assumptions:
+        None
+
+    Note:
+        - Each outermost [`Operator`][oqd_core.interface.analog.operator.Operator] of the model, e.g. the hamiltonian of each
+            [`AnalogGate`][oqd_core.interface.analog.operations.AnalogGate] or the operator of each
+            [`Expectation`][oqd_core.backend.metric.Expectation], is canonicalized once per distinct structure.
+            Operators found in the cache are not sent to the workers.
+        - Operators are sent to and received from the workers as their structural keys, i.e. flat tuples of node types and
+            terminal values, instead of nested models.
+        - The operators are reassembled in the order of the model, such that the result does not depend on the number of
+            workers or on the order in which the workers finish.
+    """
+    if engine not in ("chain", "fused"):
+        raise ValueError(f"Unknown canonicalization engine {engine!r}")
+    _verifier(verification)
+    namespace = _namespace(engine, verification)
+
+    keys = {}
+    pending = {}
+
+    def collect(op):
+        key = CanonicalizationCache.key(op)
+        keys[id(op)] = key
+        pending[key] = None
+        return op
+
+    _map_operators(model, collect)
+
+    canonical = {}
+    if cache is not None:
+        for key in pending:
+            found = cache._get(key if namespace is None else (namespace, *key))
+            if found is not None:
+                canonical[key] = found
+    pending = [key for key in pending if key not in canonical]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(pending))
+
+    if max_workers <= 1:
+        results = [_canonicalize_encoded(key, engine, verification) for key in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    _canonicalize_encoded,
+                    pending,
+                    [engine] * len(pending),
+                    [verification] * len(pending),
+                    chunksize=max(1, len(pending) // (4 * max_workers)),
+                )
+            )
+
+    for key, result in zip(pending, results):
+        canonical[key] = _decode(result)
+        if cache is not None:
+            cache._put(key if namespace is None else (namespace, *key), canonical[key])
+
+    return _map_operators(model, lambda op: _copy(canonical[keys[id(op)]]))
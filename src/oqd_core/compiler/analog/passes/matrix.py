@@ -0,0 +1,209 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import scipy.sparse as sp
+
+########################################################################################
+from oqd_core.compiler.analog.matrix import MatrixFreeOperator, OperatorMatrix
+from oqd_core.compiler.analog.passes.analysis import analysis_canonical_hamiltonian_dim
+from oqd_core.compiler.math.passes import compile_math_expr
+from oqd_core.compiler.math.rules import EvaluateMathExpr
+from oqd_core.compiler.walk import Post
+from oqd_core.interface.analog import Operator, OperatorAdd, OperatorScalarMul
+from oqd_core.interface.math import MathNum
+
+########################################################################################
+
+__all__ = [
+    "analog_operator_term_matrices",
+    "analog_operator_coefficient_grid",
+    "analog_operator_matrix",
+    "analog_operator_linear_operator",
+]
+
+########################################################################################
+
+
+def analog_operator_term_matrices(model: Operator, fock_cutoff: int):
+    """
+    This pass lowers each term of an operator to a sparse matrix, keeping the coefficients symbolic.
+
+    Args:
+        model (Operator): [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level
+        fock_cutoff (int): Dimension of the truncated Fock space of the modes, e.g. the fock_cutoff of
+            [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog]
+
+    Returns:
+        terms (list[tuple[MathExpr, scipy.sparse.csr_matrix]]): Coefficient and matrix of each term of the sum
+
+    Assumptions:
+        None, although the terms are only separated from their coefficients for operators in canonical form, see
+        [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization]
+
+    Example:
+        for model = 2*X + t*Z, the output is [(2, [[0, 1], [1, 0]]), (t, [[1, 0], [0, -1]])]
+    """
+    terms = []
+    while isinstance(model, OperatorAdd):
+        terms.append(model.op2)
+        model = model.op1
+    terms.append(model)
+
+    rule = Post(OperatorMatrix(fock_cutoff=fock_cutoff))
+    return [
+        (term.expr, rule(term.op))
+        if isinstance(term, OperatorScalarMul)
+        else (MathNum(value=1), rule(term))
+        for term in reversed(terms)
+    ]
+
+
+def analog_operator_coefficient_grid(
+    model: Operator, duration: float, dt: float, *, variables=None
+):
+    """
+    This pass samples the coefficients of the terms of an operator on a time grid, with each coefficient compiled
+    once into a vectorized function of the time t.
+
+    Args:
+        model (Operator): [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level
+        duration (float): Duration of the evolution, e.g. the duration of an
+            [`Evolve`][oqd_core.interface.analog.operation.Evolve]
+        dt (float): Maximum width of the time steps, e.g. the dt of [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog]
+        variables (Optional[dict[str, float]]): Values of the [`MathVar`][oqd_core.interface.math.MathVar]
+            of the coefficients other than t
+
+    Returns:
+        times (np.ndarray): Midpoints of the n_steps equal time steps covering the duration
+        coefficients (np.ndarray): Complex array of shape (n_terms, n_steps), with the coefficient of each term of
+            [`analog_operator_term_matrices`][oqd_core.compiler.analog.passes.matrix.analog_operator_term_matrices]
+            at each time
+
+    Assumptions:
+        [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization]
+
+    Note:
+        The coefficients are held constant over each step and sampled at its midpoint, such that the evolution over
+        a step is exp(-1j * (t1 - t0) * sum(coefficients[:, step] * matrices)).
+
+    Example:
+        for model = 1*X + sin(t)*Z, duration = 1 and dt = 0.5, the output is
+        ([0.25, 0.75], [[1, 1], [sin(0.25), sin(0.75)]])
+    """
+    terms = []
+    while isinstance(model, OperatorAdd):
+        terms.append(model.op2)
+        model = model.op1
+    terms.append(model)
+    exprs = [
+        term.expr if isinstance(term, OperatorScalarMul) else MathNum(value=1)
+        for term in reversed(terms)
+    ]
+
+    n_steps = max(1, int(np.ceil(duration / dt - 1e-9)))
+    times = (np.arange(n_steps) + 0.5) * (duration / n_steps)
+
+    variables = {} if variables is None else dict(variables)
+    variables.pop("t", None)
+    names = ("t", *variables.keys())
+    # a single function evaluates all of the coefficients, sharing their common subexpressions
+    function = compile_math_expr(exprs, variables=names)
+
+    coefficients = np.empty((len(exprs), n_steps), dtype=complex)
+    for n, value in enumerate(function(times, *variables.values())):
+        coefficients[n] = value
+    return times, coefficients
+
+
+def analog_operator_matrix(
+    model: Operator, fock_cutoff: int, *, variables=None, qobj=False
+):
+    """
+    This pass lowers an operator to a sparse matrix.
+
+    Args:
+        model (Operator): [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level
+        fock_cutoff (int): Dimension of the truncated Fock space of the modes, e.g. the fock_cutoff of
+            [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog]
+        variables (Optional[dict[str, float]]): Values of the [`MathVar`][oqd_core.interface.math.MathVar]
+            of the coefficients, e.g. the time t
+        qobj (bool): Whether the matrix is returned as a `qutip.Qobj`
+
+    Returns:
+        matrix (Union[scipy.sparse.csr_matrix, qutip.Qobj]): Complex matrix over the quantum registers followed by
+            the quantum modes
+
+    Assumptions:
+        [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization]
+        when qobj is True, for the dimensions of the subsystems
+
+    Note:
+        The terms are summed in a single sparse assembly, instead of one sparse addition per term.
+
+    Example:
+        for model = 1*(X@A) and fock_cutoff = 3, the output is kron([[0, 1], [1, 0]], [[0, 1, 0], [0, 0, sqrt(2)], [0, 0, 0]])
+    """
+    evaluate = Post(EvaluateMathExpr(variables=variables))
+
+    rows, cols, data = [], [], []
+    for expr, matrix in analog_operator_term_matrices(model, fock_cutoff):
+        matrix = matrix.tocoo()
+        rows.append(matrix.row)
+        cols.append(matrix.col)
+        data.append(complex(evaluate(expr)) * matrix.data)
+
+    matrix = sp.coo_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=matrix.shape,
+    ).tocsr()
+    # duplicate entries are summed by the conversion, cancelled entries are removed
+    matrix.eliminate_zeros()
+
+    if not qobj:
+        return matrix
+
+    # qutip is slow to import and only needed for the conversion
+    import qutip
+
+    n_qreg, n_qmode = analysis_canonical_hamiltonian_dim(model)
+    dims = [2] * n_qreg + [fock_cutoff] * n_qmode
+    return qutip.Qobj(matrix, dims=[dims, dims])
+
+
+def analog_operator_linear_operator(
+    model: Operator, fock_cutoff: int, *, variables=None
+):
+    """
+    This pass lowers an operator to a matrix-free linear operator, applied to state vectors without assembling
+    its matrix.
+
+    Args:
+        model (Operator): [`Operator`][oqd_core.interface.analog.operator.Operator] of Analog level
+        fock_cutoff (int): Dimension of the truncated Fock space of the modes, e.g. the fock_cutoff of
+            [`TaskArgsAnalog`][oqd_core.backend.task.TaskArgsAnalog]
+        variables (Optional[dict[str, float]]): Values of the [`MathVar`][oqd_core.interface.math.MathVar]
+            of the coefficients, e.g. the time t
+
+    Returns:
+        operator (MatrixFreeOperator): `scipy.sparse.linalg.LinearOperator` equal to the matrix of
+            [`analog_operator_matrix`][oqd_core.compiler.analog.passes.matrix.analog_operator_matrix]
+
+    Assumptions:
+        [`analog_operator_canonicalization`][oqd_core.compiler.analog.passes.canonicalize.analog_operator_canonicalization]
+
+    Example:
+        expm_multiply(-1j * t * analog_operator_linear_operator(model, fock_cutoff), psi)
+    """
+    return MatrixFreeOperator(model, fock_cutoff, variables=variables)
@@ -14,15 +14,16 @@
 
 from typing import List, Tuple, Dict, Optional, Set, Union
 import numpy as np
-from oqd_compiler_infrastructure import RewriteRule, In, Post
+from oqd_compiler_infrastructure import RewriteRule
 
 from oqd_core.interface.analog import (
     AnalogCircuit, AnalogGate, Evolve,
-    PauliX, PauliY, PauliZ, PauliI,
+    PauliX,
     OperatorKron, OperatorScalarMul, OperatorAdd, OperatorSub,
-    Ladder, Annihilation, Creation
+    Annihilation, Creation
 )
 from oqd_core.interface.math import MathNum, MathVar, MathAdd, MathMul, MathExpr
+from oqd_core.compiler.walk import In
 
 __all__ = [
     "XXGateAnalyzer",
@@ -193,26 +194,23 @@ class XXGateAnalyzer(RewriteRule):
         Returns:
             list: Positions where X operators appear
         """
-        # Base cases
-        if isinstance(op, PauliX):
-            return [base_position]
-        if isinstance(op, (PauliI, PauliY, PauliZ, Ladder)):
-            return []
-            
-        # Recursive case for OperatorKron
-        if isinstance(op, OperatorKron):
-            # Find the size of the right subtree
-            right_size = self._count_qubits(op.op2)
-            
-            # Recursively find X positions in left and right branches
-            left_positions = self._extract_x_positions(op.op1, base_position)
-            right_positions = self._extract_x_positions(op.op2, base_position + 1)
-            
-            # Combine the results
-            return left_positions + right_positions
-            
-        # Default for other operator types
-        return []
+        positions = []
+        # Explicit stack, such that deep tensor products do not reach the recursion limit
+        stack = [(op, base_position)]
+        while stack:
+            op, base_position = stack.pop()
+
+            if isinstance(op, PauliX):
+                positions.append(base_position)
+
+            # Left branch is processed before the right branch
+            elif isinstance(op, OperatorKron):
+                stack.append((op.op2, base_position + 1))
+                stack.append((op.op1, base_position))
+
+            # Other operator types contain no X operators
+
+        return positions
         
     def _count_qubits(self, op):
         """
@@ -224,16 +222,19 @@ class XXGateAnalyzer(RewriteRule):
         Returns:
             int: Number of qubits
         """
-        # Base cases
-        if isinstance(op, (PauliX, PauliY, PauliZ, PauliI, Ladder)):
-            return 1
-            
-        # Recursive case for OperatorKron
-        if isinstance(op, OperatorKron):
-            return self._count_qubits(op.op1) + self._count_qubits(op.op2)
-            
-        # Default for other operator types
-        return 1
+        count = 0
+        stack = [op]
+        while stack:
+            op = stack.pop()
+
+            # Tensor products are split, every other operator counts as one qubit
+            if isinstance(op, OperatorKron):
+                stack.append(op.op2)
+                stack.append(op.op1)
+            else:
+                count += 1
+
+        return count
         
     def _add_xx_interaction(self, qubit_pair, coefficient):
         """
@@ -266,7 +267,7 @@ class XXGateAnalyzer(RewriteRule):
 
     def _is_time_dependent(self, expr):
         """
-        Recursively check if a math expression contains time dependence.
+        Check if a math expression contains time dependence.
         
         Args:
             expr: The math expression to check
@@ -274,17 +275,22 @@ class XXGateAnalyzer(RewriteRule):
         Returns:
             bool: True if time-dependent, False otherwise
         """
-        # Direct check for time variable
-        if isinstance(expr, MathVar) and expr.name == 't':
-            return True
+        stack = [expr]
+        while stack:
+            expr = stack.pop()
 
-        # Check binary operations
-        if hasattr(expr, 'expr1') and hasattr(expr, 'expr2'):
-            return self._is_time_dependent(expr.expr1) or self._is_time_dependent(expr.expr2)
+            # Direct check for time variable
+            if isinstance(expr, MathVar) and expr.name == 't':
+                return True
 
-        # Check unary operations
-        if hasattr(expr, 'expr'):
-            return self._is_time_dependent(expr.expr)
+            # Check binary operations
+            if hasattr(expr, 'expr1') and hasattr(expr, 'expr2'):
+                stack.append(expr.expr2)
+                stack.append(expr.expr1)
+
+            # Check unary operations
+            elif hasattr(expr, 'expr'):
+                stack.append(expr.expr)
 
         # Default: not time-dependent
         return False
@@ -299,22 +305,31 @@ class XXGateAnalyzer(RewriteRule):
         Returns:
             float: The extracted coefficient
         """
-        if isinstance(expr, MathNum):
-            return expr.value
-        elif isinstance(expr, MathMul):
-            # For multiplication, try to extract coefficients from both sides
-            coef1 = self._extract_coefficient(expr.expr1)
-            coef2 = self._extract_coefficient(expr.expr2)
-            return coef1 * coef2
-        elif isinstance(expr, MathAdd):
-            # For addition, this is more complex and would require full evaluation
-            # For simplicity, we return a default value
-            return 1.0
-            
-        # For other expression types, return a default
-        if self.verbose:
-            print(f"  Could not extract coefficient from {expr.__class__.__name__}")
-        return 1.0
+        coefficient = None
+        stack = [expr]
+        while stack:
+            expr = stack.pop()
+
+            if isinstance(expr, MathNum):
+                value = expr.value
+            elif isinstance(expr, MathMul):
+                # For multiplication, extract coefficients from both sides
+                stack.append(expr.expr2)
+                stack.append(expr.expr1)
+                continue
+            elif isinstance(expr, MathAdd):
+                # For addition, this is more complex and would require full evaluation
+                # For simplicity, we use a default value
+                value = 1.0
+            else:
+                # For other expression types, use a default
+                if self.verbose:
+                    print(f"  Could not extract coefficient from {expr.__class__.__name__}")
+                value = 1.0
+
+            coefficient = value if coefficient is None else coefficient * value
+
+        return coefficient
 
     def build_jij_matrix(self):
         """
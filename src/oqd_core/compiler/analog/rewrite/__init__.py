@@ -14,15 +14,19 @@
 
 from .assign import AssignAnalogIRDim
 from .canonicalize import (
+    FusedCanonicalization,
     GatherMathExpr,
     GatherPauli,
+    LadderNormalOrder,
     NormalOrder,
     OperatorDistribute,
     PauliAlgebra,
+    PauliStringCanonicalization,
     ProperOrder,
     PruneIdentity,
     ScaleTerms,
     SortedOrder,
+    SortTerms,
 )
 
 __all__ = [
@@ -33,7 +37,11 @@ __all__ = [
     "PruneIdentity",
     "PauliAlgebra",
     "NormalOrder",
+    "LadderNormalOrder",
     "ProperOrder",
     "ScaleTerms",
     "SortedOrder",
+    "SortTerms",
+    "PauliStringCanonicalization",
+    "FusedCanonicalization",
 ]
@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import math
+import operator
 from typing import Union
 
-from oqd_compiler_infrastructure import RewriteRule
-
 ########################################################################################
 from oqd_core.compiler.analog.passes.analysis import analysis_term_index
+from oqd_core.compiler.tracking import TrackedRewriteRule
 from oqd_core.interface.analog import (
     Annihilation,
     Creation,
@@ -35,7 +37,7 @@ from oqd_core.interface.analog import (
     PauliY,
     PauliZ,
 )
-from oqd_core.interface.math import MathAdd, MathImag, MathNum
+from oqd_core.interface.math import MathAdd, MathImag, MathMul, MathNum, MathSub
 
 ########################################################################################
 
@@ -46,15 +48,19 @@ __all__ = [
     "PruneIdentity",
     "PauliAlgebra",
     "NormalOrder",
+    "LadderNormalOrder",
     "ProperOrder",
     "ScaleTerms",
     "SortedOrder",
+    "SortTerms",
+    "PauliStringCanonicalization",
+    "FusedCanonicalization",
 ]
 
 ########################################################################################
 
 
-class OperatorDistribute(RewriteRule):
+class OperatorDistribute(TrackedRewriteRule):
     """
     RewriteRule which distributes operators of hamiltonians
 
@@ -119,7 +125,7 @@ class OperatorDistribute(RewriteRule):
         )
 
 
-class GatherMathExpr(RewriteRule):
+class GatherMathExpr(TrackedRewriteRule):
     """
     Gathers the math expressions of  [`Operator`][oqd_core.interface.analog.operator.Operator] so that we have math_expr * ( [`Operator`][oqd_core.interface.analog.operator.Operator] without scalar multiplication)
 
@@ -166,7 +172,7 @@ class GatherMathExpr(RewriteRule):
         return None
 
 
-class GatherPauli(RewriteRule):
+class GatherPauli(TrackedRewriteRule):
     """
     Gathers ladders and paulis so that we have paulis and then ladders
 
@@ -209,7 +215,7 @@ class GatherPauli(RewriteRule):
         return None
 
 
-class PruneIdentity(RewriteRule):
+class PruneIdentity(TrackedRewriteRule):
     """
     Removes unnecessary ladder Identities from operators
 
@@ -238,7 +244,7 @@ class PruneIdentity(RewriteRule):
         return None
 
 
-class PauliAlgebra(RewriteRule):
+class PauliAlgebra(TrackedRewriteRule):
     """
     RewriteRule for Pauli algebra operations
 
@@ -278,7 +284,7 @@ class PauliAlgebra(RewriteRule):
         return None
 
 
-class NormalOrder(RewriteRule):
+class NormalOrder(TrackedRewriteRule):
     """
     Arranges Ladder oeprators in normal order form
 
@@ -316,7 +322,119 @@ class NormalOrder(RewriteRule):
         return model
 
 
-class ProperOrder(RewriteRule):
+class LadderNormalOrder(TrackedRewriteRule):
+    """
+    Arranges products of Ladder operators in normal order form in a single step. Each product is
+    represented by the exponents of its runs of Creation and Annihilation operators, which are commuted
+    with the closed form of A^n * C^c, such that like terms are merged during the expansion.
+
+    Args:
+        model (VisitableBaseModel):
+
+    Returns:
+        model (VisitableBaseModel):
+
+    Assumptions:
+        [`GatherMathExpr`][oqd_core.compiler.analog.rewrite.canonicalize.GatherMathExpr],
+        [`OperatorDistribute`][oqd_core.compiler.analog.rewrite.canonicalize.OperatorDistribute],
+        [`ProperOrder`][oqd_core.compiler.analog.rewrite.canonicalize.ProperOrder],
+        [`GatherPauli`][oqd_core.compiler.analog.rewrite.canonicalize.GatherPauli]
+
+    Note:
+        - Use with a Pre walk, such that whole products of Ladder operators are normal ordered at once
+        - A^n * C^c = sum_k binom(n, k) * c!/(c-k)! * C^(c-k) * A^(n-k)
+
+    Example:
+        A*C => J + C*A
+        A*A*A*C*C*C => 6*J + 18*(C*A) + 9*(C*C*A*A) + C*C*C*A*A*A
+    """
+
+    def map_OperatorMul(self, model: OperatorMul):
+        word = self.word(model)
+        if word is None or self.is_normal_ordered(word):
+            return None
+
+        return self.emit(self.expand(word))
+
+    @staticmethod
+    def word(model: OperatorMul):
+        """
+        Flattens a product of Ladder operators, returns None if the product contains other operators.
+        """
+        word = []
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Ladder):
+                word.append(node)
+            elif isinstance(node, OperatorMul):
+                stack.append(node.op2)
+                stack.append(node.op1)
+            else:
+                return None
+        return word
+
+    @staticmethod
+    def is_normal_ordered(word):
+        annihilation = False
+        for ladder in word:
+            if isinstance(ladder, Annihilation):
+                annihilation = True
+            elif isinstance(ladder, Creation) and annihilation:
+                return False
+        return True
+
+    @staticmethod
+    def expand(word):
+        """
+        Expands a product of Ladder operators into a dictionary from exponents (m, n) of the normal
+        ordered products C^m * A^n to their integer coefficients.
+        """
+        runs = []
+        for ladder in word:
+            if isinstance(ladder, Identity):
+                continue
+            creation = isinstance(ladder, Creation)
+            if runs and runs[-1][0] == creation:
+                runs[-1][1] += 1
+            else:
+                runs.append([creation, 1])
+
+        terms = {(0, 0): 1}
+        for creation, c in runs:
+            if not creation:
+                terms = {
+                    (m, n + c): coefficient for (m, n), coefficient in terms.items()
+                }
+                continue
+
+            expanded = {}
+            for (m, n), coefficient in terms.items():
+                # A^n * C^c contracts k pairs in binom(n, k) * c!/(c-k)! ways
+                for k in range(min(n, c) + 1):
+                    key = (m + c - k, n - k)
+                    contractions = math.comb(n, k) * math.perm(c, k)
+                    expanded[key] = expanded.get(key, 0) + coefficient * contractions
+            terms = expanded
+        return terms
+
+    @staticmethod
+    def emit(terms):
+        op = None
+        for (m, n), coefficient in sorted(
+            terms.items(), key=lambda item: (sum(item[0]), item[0][0])
+        ):
+            ladders = [Creation()] * m + [Annihilation()] * n
+            term = ladders[0] if ladders else Identity()
+            for ladder in ladders[1:]:
+                term = OperatorMul(op1=term, op2=ladder)
+            if coefficient != 1:
+                term = OperatorScalarMul(op=term, expr=MathNum(value=coefficient))
+            op = term if op is None else OperatorAdd(op1=op, op2=term)
+        return op
+
+
+class ProperOrder(TrackedRewriteRule):
     """
     Converts expressions to proper order bracketing. Please see example for clarification.
 
@@ -349,10 +467,10 @@ class ProperOrder(RewriteRule):
                 op1=model.__class__(op1=model.op1, op2=model.op2.op1),
                 op2=model.op2.op2,
             )
-        return model.__class__(op1=model.op1, op2=model.op2)
+        return None
 
 
-class ScaleTerms(RewriteRule):
+class ScaleTerms(TrackedRewriteRule):
     """
     Scales operators to ensure consistency
 
@@ -402,10 +520,12 @@ class ScaleTerms(RewriteRule):
             op1 = OperatorScalarMul(expr=MathNum(value=1), op=model.op1)
         if not isinstance(model.op2, Union[OperatorScalarMul, OperatorAdd]):
             op2 = OperatorScalarMul(expr=MathNum(value=1), op=model.op2)
+        if op1 is model.op1 and op2 is model.op2:
+            return None
         return OperatorAdd(op1=op1, op2=op2)
 
 
-class SortedOrder(RewriteRule):
+class SortedOrder(TrackedRewriteRule):
     """
     Sorts operators based on TermIndex and collects duplicate terms.
     Please see example for clarification
@@ -466,9 +586,6 @@ class SortedOrder(RewriteRule):
                     op2=model.op1.op2,
                 )
 
-            elif term1 < term2:
-                return OperatorAdd(op1=model.op1, op2=model.op2)
-
         else:
             term1 = analysis_term_index(model.op1)
             term2 = analysis_term_index(model.op2)
@@ -497,5 +614,721 @@ class SortedOrder(RewriteRule):
                     op2=model.op1,
                 )
 
-            elif term1 < term2:
-                return OperatorAdd(op1=model.op1, op2=model.op2)
+        return None
+
+
+class SortTerms(TrackedRewriteRule):
+    """
+    Sorts the terms of an operator based on TermIndex and collects duplicate terms in a single step.
+    The top-level sum is flattened, the TermIndex of each term is computed once and the sorted terms
+    are rebuilt into a left-associated sum.
+
+    Args:
+        model (VisitableBaseModel):
+
+    Returns:
+        model (VisitableBaseModel)
+
+    Assumptions:
+        [`GatherMathExpr`][oqd_core.compiler.analog.rewrite.canonicalize.GatherMathExpr],
+        [`OperatorDistribute`][oqd_core.compiler.analog.rewrite.canonicalize.OperatorDistribute],
+        [`ProperOrder`][oqd_core.compiler.analog.rewrite.canonicalize.ProperOrder],
+        [`GatherPauli`][oqd_core.compiler.analog.rewrite.canonicalize.GatherPauli],
+        [`NormalOrder`][oqd_core.compiler.analog.rewrite.canonicalize.NormalOrder],
+        [`PruneIdentity`][oqd_core.compiler.analog.rewrite.canonicalize.PruneIdentity]
+
+    Note:
+        - Use with a Pre walk, only the root operator of each [`AnalogGate`][oqd_core.interface.analog.operations.AnalogGate]
+            and [`Expectation`][oqd_core.backend.metric.Expectation] is sorted
+        - Equivalent to a fixed point of [`SortedOrder`][oqd_core.compiler.analog.rewrite.canonicalize.SortedOrder]
+
+    Example:
+        (X@Y) + (X@I) => (X@I) + (X@Y)
+        Z + X + 2*Z => X + (1 + 2)*Z
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.op_root = False
+
+    def map_AnalogGate(self, model):
+        self.op_root = False
+
+    def map_Expectation(self, model):
+        self.op_root = False
+
+    def map_Operator(self, model: Operator):
+        if self.op_root:
+            return
+        self.op_root = True
+
+        if not isinstance(model, OperatorAdd):
+            return
+
+        terms = []
+        left_associated = True
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, OperatorAdd):
+                left_associated = left_associated and not isinstance(
+                    node.op2, OperatorAdd
+                )
+                stack.append(node.op2)
+                stack.append(node.op1)
+            else:
+                terms.append(node)
+
+        # the sort is stable, such that duplicate terms are collected in their original order
+        indexed = sorted(
+            ((analysis_term_index(term), term) for term in terms),
+            key=lambda item: item[0],
+        )
+
+        merged = []
+        previous = None
+        for index, term in indexed:
+            if index != previous:
+                merged.append(term)
+                previous = index
+                continue
+
+            expr1 = (
+                merged[-1].expr
+                if isinstance(merged[-1], OperatorScalarMul)
+                else MathNum(value=1)
+            )
+            expr2 = (
+                term.expr if isinstance(term, OperatorScalarMul) else MathNum(value=1)
+            )
+            op = term.op if isinstance(term, OperatorScalarMul) else term
+            merged[-1] = OperatorScalarMul(
+                op=op, expr=MathAdd(expr1=expr1, expr2=expr2)
+            )
+
+        if (
+            left_associated
+            and len(merged) == len(terms)
+            and all(map(operator.is_, merged, terms))
+        ):
+            return None
+
+        op = merged[0]
+        for term in merged[1:]:
+            op = OperatorAdd(op1=op, op2=term)
+        return op
+
+
+class PauliStringCanonicalization(TrackedRewriteRule):
+    """
+    Canonicalizes Pauli-only operators by lowering them to a sparse dictionary of Pauli strings.
+    Each Pauli string is packed into a pair of X and Z bitmasks, such that products of Pauli strings
+    and their phases are computed with bit operations.
+
+    Args:
+        model (VisitableBaseModel):
+
+    Returns:
+        model (VisitableBaseModel):
+
+    Assumptions:
+        None
+
+    Note:
+        - Only the root operator of each [`AnalogGate`][oqd_core.interface.analog.operations.AnalogGate]
+            and [`Expectation`][oqd_core.backend.metric.Expectation] is canonicalized; operators that contain
+            ladder operators or that have inconsistent Hilbert space dimensions are left unchanged and
+            recorded in the fallback attribute.
+        - Numerical coefficients are folded, symbolic coefficients are processed by the optional math_pass.
+        - Use with a Pre walk.
+
+    Example:
+        X@(Y + Z) + 2*(X@Y) => (3)*(X@Y) + (1)*(X@Z)
+        (X + Y)*(Y + Z) => (1)*I + (1j)*X + (1j * -1)*Y + (1j)*Z
+    """
+
+    # pair of X and Z bits of each Pauli operator, ordered by TermIndex
+    pauli_bits = {PauliI: (0, 0), PauliX: (1, 0), PauliY: (1, 1), PauliZ: (0, 1)}
+    term_index = {bits: i for i, bits in enumerate(pauli_bits.values())}
+
+    _unit = {None: ((1, 0), None)}
+
+    def __init__(self, *, math_pass=None):
+        super().__init__()
+        self.math_pass = math_pass
+        self.op_root = False
+        self.fallback = False
+
+    def map_AnalogGate(self, model):
+        self.op_root = False
+
+    def map_Expectation(self, model):
+        self.op_root = False
+
+    def map_Operator(self, model: Operator):
+        if self.op_root:
+            return
+        self.op_root = True
+
+        canonical = self.canonicalize(model)
+        if canonical is None:
+            self.fallback = True
+        return canonical
+
+    def canonicalize(self, model: Operator):
+        """
+        Canonicalizes an operator, returns None if the operator is not Pauli-only.
+        """
+        lowered = self.lower(model)
+        if lowered is None:
+            return None
+        return self.emit(*lowered)
+
+    @classmethod
+    def lower(cls, model: Operator):
+        """
+        Lowers an operator to its number of qubits and a dictionary from pairs of X and Z bitmasks
+        to coefficients, or returns None if the operator is not Pauli-only.
+
+        A coefficient is a dictionary from a key to a pair of a complex number, stored as a tuple
+        (real, imag), and a symbolic factor, which is None for purely numerical contributions.
+        """
+        # a node is either visited, visited as a factor of a Kron product or combined
+        results = []
+        stack = [(model, "visit")]
+        while stack:
+            node, state = stack.pop()
+            kind = type(node)
+
+            bits = cls.pauli_bits.get(kind)
+            if bits is not None:
+                results.append((1, {bits: {None: ((1, 0), None)}}))
+                continue
+
+            if kind not in (
+                OperatorKron,
+                OperatorAdd,
+                OperatorScalarMul,
+                OperatorSub,
+                OperatorMul,
+            ):
+                return None
+
+            if state != "combine":
+                if kind is OperatorKron and state == "visit":
+                    string = cls._pauli_string(node)
+                    if string is not None:
+                        results.append(string)
+                        continue
+
+                stack.append((node, "combine"))
+                if kind is OperatorScalarMul:
+                    stack.append((node.op, "visit"))
+                else:
+                    # the factors of a Kron product that is not a Pauli string are not scanned again
+                    state = "factor" if kind is OperatorKron else "visit"
+                    stack.append((node.op2, state))
+                    stack.append((node.op1, state))
+                continue
+
+            if kind is OperatorScalarMul:
+                n, terms = results.pop()
+                factor = cls._coefficient(node.expr)
+                for bits, coefficient in terms.items():
+                    terms[bits] = cls._mul(coefficient, factor)
+                results.append((n, terms))
+                continue
+
+            n2, terms2 = results.pop()
+            n1, terms1 = results.pop()
+
+            if kind is OperatorKron:
+                results.append((n1 + n2, cls._kron(terms1, terms2, n2)))
+                continue
+
+            if n1 != n2:
+                return None
+
+            if kind is OperatorMul:
+                results.append((n1, cls._product(terms1, terms2)))
+                continue
+
+            if kind is OperatorSub:
+                factor = {None: ((-1, 0), None)}
+                for bits, coefficient in terms2.items():
+                    terms2[bits] = cls._mul(coefficient, factor)
+
+            if len(terms1) < len(terms2):
+                terms1, terms2 = terms2, terms1
+            for bits, coefficient in terms2.items():
+                if bits in terms1:
+                    cls._accumulate(terms1[bits], coefficient)
+                else:
+                    terms1[bits] = coefficient
+            results.append((n1, terms1))
+
+        return results[0]
+
+    def emit(self, n, terms):
+        """
+        Emits the canonical operator of a dictionary of Pauli strings on n qubits.
+        """
+        paulis = [kind() for kind in self.pauli_bits]
+
+        ordered = []
+        for (x, z), coefficient in terms.items():
+            index = tuple(
+                self.term_index[((x >> k) & 1, (z >> k) & 1)]
+                for k in range(n - 1, -1, -1)
+            )
+            ordered.append((index, coefficient))
+        ordered.sort(key=lambda item: item[0])
+        return self._emit_terms(ordered, paulis.__getitem__)
+
+    def _emit_terms(self, ordered, factor):
+        """
+        Emits the sum of the ordered pairs of TermIndex and coefficient, where factor returns the
+        operator of an entry of the TermIndex.
+        """
+        op = None
+        # Kron products of the leading factors are shared between consecutive terms
+        previous = ()
+        prefixes = []
+        for index, coefficient in ordered:
+            shared = 0
+            while shared < len(previous) and index[shared] == previous[shared]:
+                shared += 1
+            del prefixes[shared:]
+            for i in index[len(prefixes) :]:
+                prefixes.append(
+                    OperatorKron(op1=prefixes[-1], op2=factor(i))
+                    if prefixes
+                    else factor(i)
+                )
+            previous = index
+
+            term = OperatorScalarMul(
+                op=prefixes[-1], expr=self._emit_coefficient(coefficient)
+            )
+            op = term if op is None else OperatorAdd(op1=op, op2=term)
+        return op
+
+    def _emit_coefficient(self, coefficient):
+        exprs = []
+        symbolic = False
+        for (real, imag), expr in coefficient.values():
+            if real == 0 and imag == 0:
+                continue
+            if imag == 0:
+                value = MathNum(value=real)
+            elif real == 0:
+                value = (
+                    MathImag()
+                    if imag == 1
+                    else MathMul(expr1=MathImag(), expr2=MathNum(value=imag))
+                )
+            else:
+                value = MathAdd(
+                    expr1=MathNum(value=real),
+                    expr2=MathMul(expr1=MathImag(), expr2=MathNum(value=imag)),
+                )
+            if expr is not None:
+                symbolic = True
+                value = (
+                    expr if (real, imag) == (1, 0) else MathMul(expr1=value, expr2=expr)
+                )
+            exprs.append(value)
+
+        if not exprs:
+            return MathNum(value=0)
+
+        expr = exprs[0]
+        for value in exprs[1:]:
+            expr = MathAdd(expr1=expr, expr2=value)
+
+        if symbolic and self.math_pass is not None:
+            expr = self.math_pass(expr)
+        return expr
+
+    @classmethod
+    def _numeric(cls, expr):
+        if isinstance(expr, MathNum):
+            return (expr.value, 0)
+        if isinstance(expr, MathImag):
+            return (0, 1)
+        if isinstance(expr, (MathAdd, MathSub, MathMul)):
+            c1 = cls._numeric(expr.expr1)
+            c2 = cls._numeric(expr.expr2)
+            if c1 is None or c2 is None:
+                return None
+            if isinstance(expr, MathAdd):
+                return (c1[0] + c2[0], c1[1] + c2[1])
+            if isinstance(expr, MathSub):
+                return (c1[0] - c2[0], c1[1] - c2[1])
+            return cls._complex_mul(c1, c2)
+        return None
+
+    @classmethod
+    def _coefficient(cls, expr):
+        c = cls._numeric(expr)
+        if c is None:
+            return {id(expr): ((1, 0), expr)}
+        return {None: (c, None)}
+
+    @staticmethod
+    def _complex_mul(c1, c2):
+        return (c1[0] * c2[0] - c1[1] * c2[1], c1[0] * c2[1] + c1[1] * c2[0])
+
+    @staticmethod
+    def _phase(c, k):
+        # multiplies by i^k
+        real, imag = c
+        return [(real, imag), (-imag, real), (-real, -imag), (imag, -real)][k % 4]
+
+    @staticmethod
+    def _accumulate(coefficient1, coefficient2):
+        for key, (c2, expr) in coefficient2.items():
+            if key in coefficient1:
+                c1 = coefficient1[key][0]
+                coefficient1[key] = ((c1[0] + c2[0], c1[1] + c2[1]), expr)
+            else:
+                coefficient1[key] = (c2, expr)
+
+    @classmethod
+    def _mul(cls, coefficient1, coefficient2, k=0):
+        coefficient = {}
+        for key1, (c1, expr1) in coefficient1.items():
+            for key2, (c2, expr2) in coefficient2.items():
+                c = cls._phase(cls._complex_mul(c1, c2), k)
+                if expr2 is None:
+                    cls._accumulate(coefficient, {key1: (c, expr1)})
+                elif expr1 is None:
+                    cls._accumulate(coefficient, {key2: (c, expr2)})
+                else:
+                    expr = MathMul(expr1=expr1, expr2=expr2)
+                    coefficient[id(expr)] = (c, expr)
+        return coefficient
+
+    @classmethod
+    def _pauli_string(cls, model):
+        x = z = n = 0
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            bits = cls.pauli_bits.get(type(node))
+            if bits is None:
+                if type(node) is not OperatorKron:
+                    return None
+                stack.append(node.op2)
+                stack.append(node.op1)
+                continue
+            x = (x << 1) | bits[0]
+            z = (z << 1) | bits[1]
+            n += 1
+        return n, {(x, z): {None: ((1, 0), None)}}
+
+    @classmethod
+    def _kron(cls, terms1, terms2, n2):
+        if len(terms1) == 1 and len(terms2) == 1:
+            ((x1, z1), coefficient1), ((x2, z2), coefficient2) = (
+                *terms1.items(),
+                *terms2.items(),
+            )
+            if coefficient2 == cls._unit:
+                coefficient = coefficient1
+            elif coefficient1 == cls._unit:
+                coefficient = coefficient2
+            else:
+                coefficient = cls._mul(coefficient1, coefficient2)
+            return {((x1 << n2) | x2, (z1 << n2) | z2): coefficient}
+
+        terms = {}
+        for (x1, z1), coefficient1 in terms1.items():
+            for (x2, z2), coefficient2 in terms2.items():
+                bits = ((x1 << n2) | x2, (z1 << n2) | z2)
+                coefficient = cls._mul(coefficient1, coefficient2)
+                if bits in terms:
+                    cls._accumulate(terms[bits], coefficient)
+                else:
+                    terms[bits] = coefficient
+        return terms
+
+    @classmethod
+    def _product(cls, terms1, terms2):
+        terms = {}
+        for (x1, z1), coefficient1 in terms1.items():
+            for (x2, z2), coefficient2 in terms2.items():
+                k = cls._pauli_phase(x1, z1, x2, z2)
+                bits = (x1 ^ x2, z1 ^ z2)
+                coefficient = cls._mul(coefficient1, coefficient2, k)
+                if bits in terms:
+                    cls._accumulate(terms[bits], coefficient)
+                else:
+                    terms[bits] = coefficient
+        return terms
+
+    @staticmethod
+    def _pauli_phase(x1, z1, x2, z2):
+        """
+        Returns the power k of the phase i^k of the product of two Pauli strings.
+        """
+        # qubits acted on by X, Y and Z in the left Pauli string
+        qx, qy, qz = x1 & ~z1, x1 & z1, z1 & ~x1
+        # XY = iZ, YZ = iX, ZX = iY and the reversed products have the opposite phase
+        return (
+            (qx & x2 & z2).bit_count()
+            - (qx & z2 & ~x2).bit_count()
+            + (qy & z2 & ~x2).bit_count()
+            - (qy & x2 & ~z2).bit_count()
+            + (qz & x2 & ~z2).bit_count()
+            - (qz & x2 & z2).bit_count()
+        )
+
+
+class FusedCanonicalization(PauliStringCanonicalization):
+    """
+    Canonicalizes operators in a single traversal by lowering them to a sparse dictionary of terms,
+    which fuses the rules of the canonicalization chain. Each term is packed into the X and Z bitmasks
+    of its Pauli operators and the exponents (m, n) of the normal ordered product C^m * A^n of each
+    of its Ladder operators.
+
+    Args:
+        model (VisitableBaseModel):
+
+    Returns:
+        model (VisitableBaseModel):
+
+    Assumptions:
+        None
+
+    Note:
+        - Generalizes [`PauliStringCanonicalization`][oqd_core.compiler.analog.rewrite.canonicalize.PauliStringCanonicalization]
+            to Ladder operators, products of Ladder operators are normal ordered with the closed form of
+            [`LadderNormalOrder`][oqd_core.compiler.analog.rewrite.canonicalize.LadderNormalOrder].
+        - The Pauli operators of each term are gathered before its Ladder operators and the terms are sorted by TermIndex,
+            such that the output is accepted by the verification rules of the canonicalization chain.
+        - Operators whose terms act on inconsistent Hilbert spaces are left unchanged and recorded in the fallback attribute.
+        - Use with a Pre walk.
+
+    Example:
+        X@(A*C) => (1)*(X@J) + (1)*(X@(C*A))
+        (A + C)*(A + C) => (1)*J + (1)*(A*A) + (2)*(C*A) + (1)*(C*C)
+    """
+
+    ladder_word = {Identity: (0, 0), Creation: (1, 0), Annihilation: (0, 1)}
+
+    @classmethod
+    def lower(cls, model: Operator):
+        """
+        Lowers an operator to its signature and a dictionary from terms to coefficients, or returns None if the
+        terms act on inconsistent Hilbert spaces.
+
+        The signature marks the subsystems acted on by Ladder operators. A term is given by the X and Z
+        bitmasks of its Pauli operators and the tuple of the exponents (m, n) of its Ladder operators.
+        """
+        # a node is either visited, visited as a factor of a Kron product or combined
+        results = []
+        stack = [(model, "visit")]
+        while stack:
+            node, state = stack.pop()
+            kind = type(node)
+
+            if kind in cls.pauli_bits or kind in cls.ladder_word:
+                results.append(cls._scan(node))
+                continue
+
+            if kind not in (
+                OperatorKron,
+                OperatorAdd,
+                OperatorScalarMul,
+                OperatorSub,
+                OperatorMul,
+            ):
+                return None
+
+            if state != "combine":
+                if kind is OperatorKron and state == "visit":
+                    term = cls._scan(node)
+                    if term is not None:
+                        results.append(term)
+                        continue
+
+                stack.append((node, "combine"))
+                if kind is OperatorScalarMul:
+                    stack.append((node.op, "visit"))
+                else:
+                    # the factors of a Kron product that is not a single term are not scanned again
+                    state = "factor" if kind is OperatorKron else "visit"
+                    stack.append((node.op2, state))
+                    stack.append((node.op1, state))
+                continue
+
+            if kind is OperatorScalarMul:
+                signature, terms = results.pop()
+                factor = cls._coefficient(node.expr)
+                for key, coefficient in terms.items():
+                    terms[key] = cls._mul(coefficient, factor)
+                results.append((signature, terms))
+                continue
+
+            signature2, terms2 = results.pop()
+            signature1, terms1 = results.pop()
+
+            if kind is OperatorKron:
+                results.append(
+                    (
+                        signature1 + signature2,
+                        cls._kron(terms1, terms2, signature2.count(False)),
+                    )
+                )
+                continue
+
+            if signature1 != signature2:
+                return None
+
+            if kind is OperatorMul:
+                results.append((signature1, cls._product(terms1, terms2)))
+                continue
+
+            if kind is OperatorSub:
+                factor = {None: ((-1, 0), None)}
+                for key, coefficient in terms2.items():
+                    terms2[key] = cls._mul(coefficient, factor)
+
+            if len(terms1) < len(terms2):
+                terms1, terms2 = terms2, terms1
+            for key, coefficient in terms2.items():
+                if key in terms1:
+                    cls._accumulate(terms1[key], coefficient)
+                else:
+                    terms1[key] = coefficient
+            results.append((signature1, terms1))
+
+        return results[0]
+
+    def emit(self, signature, terms):
+        """
+        Emits the canonical operator of a dictionary of terms with a signature.
+        """
+        n = signature.count(False)
+        paulis = [kind() for kind in self.pauli_bits]
+        ladders = {}
+
+        def factor(i):
+            if isinstance(i, int):
+                return paulis[i]
+            if i not in ladders:
+                ladders[i] = self._ladder(i[1], i[0] - i[1])
+            return ladders[i]
+
+        ordered = []
+        for (x, z, words), coefficient in terms.items():
+            index = tuple(
+                self.term_index[((x >> k) & 1, (z >> k) & 1)]
+                for k in range(n - 1, -1, -1)
+            ) + tuple((m + n, m) for m, n in words)
+            ordered.append((index, coefficient))
+        ordered.sort(key=lambda item: item[0])
+        return self._emit_terms(ordered, factor)
+
+    @staticmethod
+    def _ladder(m, n):
+        if m == n == 0:
+            return Identity()
+        word = [Creation()] * m + [Annihilation()] * n
+        op = word[0]
+        for ladder in word[1:]:
+            op = OperatorMul(op1=op, op2=ladder)
+        return op
+
+    @classmethod
+    def _scan(cls, model):
+        """
+        Scans a Kron product of terminal operators, returns None if the product contains other operators.
+        """
+        x = z = 0
+        signature = []
+        words = []
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            kind = type(node)
+            bits = cls.pauli_bits.get(kind)
+            if bits is not None:
+                x = (x << 1) | bits[0]
+                z = (z << 1) | bits[1]
+                signature.append(False)
+                continue
+            word = cls.ladder_word.get(kind)
+            if word is not None:
+                words.append(word)
+                signature.append(True)
+                continue
+            if kind is not OperatorKron:
+                return None
+            stack.append(node.op2)
+            stack.append(node.op1)
+        return tuple(signature), {(x, z, tuple(words)): {None: ((1, 0), None)}}
+
+    @classmethod
+    def _kron(cls, terms1, terms2, n2):
+        if len(terms1) == 1 and len(terms2) == 1:
+            ((x1, z1, words1), coefficient1), ((x2, z2, words2), coefficient2) = (
+                *terms1.items(),
+                *terms2.items(),
+            )
+            if coefficient2 == cls._unit:
+                coefficient = coefficient1
+            elif coefficient1 == cls._unit:
+                coefficient = coefficient2
+            else:
+                coefficient = cls._mul(coefficient1, coefficient2)
+            return {((x1 << n2) | x2, (z1 << n2) | z2, words1 + words2): coefficient}
+
+        terms = {}
+        for (x1, z1, words1), coefficient1 in terms1.items():
+            for (x2, z2, words2), coefficient2 in terms2.items():
+                key = ((x1 << n2) | x2, (z1 << n2) | z2, words1 + words2)
+                coefficient = cls._mul(coefficient1, coefficient2)
+                if key in terms:
+                    cls._accumulate(terms[key], coefficient)
+                else:
+                    terms[key] = coefficient
+        return terms
+
+    @classmethod
+    def _product(cls, terms1, terms2):
+        terms = {}
+        for (x1, z1, words1), coefficient1 in terms1.items():
+            for (x2, z2, words2), coefficient2 in terms2.items():
+                coefficient = cls._mul(
+                    coefficient1, coefficient2, cls._pauli_phase(x1, z1, x2, z2)
+                )
+
+                # the product of each pair of Ladder operators is expanded in normal order
+                expanded = [((), 1)]
+                for word1, word2 in zip(words1, words2):
+                    expanded = [
+                        (words + (word,), weight * contractions)
+                        for words, weight in expanded
+                        for word, contractions in cls._ladder_product(word1, word2)
+                    ]
+
+                for words, weight in expanded:
+                    key = (x1 ^ x2, z1 ^ z2, words)
+                    value = cls._mul(coefficient, {None: ((weight, 0), None)})
+                    if key in terms:
+                        cls._accumulate(terms[key], value)
+                    else:
+                        terms[key] = value
+        return terms
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _ladder_product(word1, word2):
+        # C^m1 A^n1 * C^m2 A^n2 contracts k pairs in binom(n1, k) * m2!/(m2-k)! ways
+        (m1, n1), (m2, n2) = word1, word2
+        return tuple(
+            ((m1 + m2 - k, n1 + n2 - k), math.comb(n1, k) * math.perm(m2, k))
+            for k in range(min(n1, m2) + 1)
+        )
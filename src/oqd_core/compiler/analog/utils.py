@@ -13,9 +13,10 @@
 # limitations under the License.
 
 
-from oqd_compiler_infrastructure import ConversionRule, Post
+from oqd_compiler_infrastructure import ConversionRule
 
 from oqd_core.compiler.math.rules import PrintMathExpr
+from oqd_core.compiler.walk import Post
 
 ########################################################################################
 from oqd_core.interface.analog import (
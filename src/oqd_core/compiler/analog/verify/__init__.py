@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from .canonicalize import (
+    CanVerCanonicalForm,
     CanVerGatherMathExpr,
     CanVerGatherPauli,
     CanVerNormalOrder,
@@ -39,6 +40,7 @@ __all__ = [
     "CanVerNormalOrder",
     "CanVerSortedOrder",
     "CanVerScaleTerm",
+    "CanVerCanonicalForm",
     "VerifyAnalogCircuitDim",
     "VerifyAnalogArgsDim",
     "VerifyHilberSpaceDim",
@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import random
 from typing import Union
 
-from oqd_compiler_infrastructure import RewriteRule
+from oqd_compiler_infrastructure import PassBase, RewriteRule, VisitableBaseModel
 
 from oqd_core.compiler.analog.error import CanonicalFormError
 from oqd_core.compiler.analog.passes.analysis import analysis_term_index
@@ -33,6 +34,7 @@ from oqd_core.interface.analog import (
     OperatorTerminal,
     Pauli,
 )
+from oqd_core.interface.math import MathExpr
 
 ########################################################################################
 
@@ -46,6 +48,7 @@ __all__ = [
     "CanVerNormalOrder",
     "CanVerSortedOrder",
     "CanVerScaleTerm",
+    "CanVerCanonicalForm",
 ]
 
 ########################################################################################
@@ -414,3 +417,166 @@ class CanVerScaleTerm(RewriteRule):
             raise CanonicalFormError(
                 "some operators between addition are not scaled properly"
             )
+
+
+class CanVerCanonicalForm(PassBase):
+    """
+    Checks all the invariants of the canonical form in a single traversal, equivalent to applying
+    [`CanVerOperatorDistribute`][oqd_core.compiler.analog.verify.canonicalize.CanVerOperatorDistribute],
+    [`CanVerGatherMathExpr`][oqd_core.compiler.analog.verify.canonicalize.CanVerGatherMathExpr],
+    [`CanVerProperOrder`][oqd_core.compiler.analog.verify.canonicalize.CanVerProperOrder],
+    [`CanVerPauliAlgebra`][oqd_core.compiler.analog.verify.canonicalize.CanVerPauliAlgebra],
+    [`CanVerGatherPauli`][oqd_core.compiler.analog.verify.canonicalize.CanVerGatherPauli],
+    [`CanVerNormalOrder`][oqd_core.compiler.analog.verify.canonicalize.CanVerNormalOrder],
+    [`CanVerPruneIdentity`][oqd_core.compiler.analog.verify.canonicalize.CanVerPruneIdentity] and
+    [`CanVerSortedOrder`][oqd_core.compiler.analog.verify.canonicalize.CanVerSortedOrder] in post order, followed by
+    [`CanVerScaleTerm`][oqd_core.compiler.analog.verify.canonicalize.CanVerScaleTerm] in pre order.
+
+    Args:
+        level (str): Verification level, "full" verifies every node, "sampled" verifies the structure of every sum
+            but only a sample of its terms, "off" skips the verification
+        samples (int): Number of terms verified per sum for the "sampled" level
+        seed (int): Seed of the sampling of the terms, such that the verification is deterministic
+
+    Returns:
+        model (VisitableBaseMode): unchanged
+
+    Assumptions:
+        None
+
+    Note:
+        - The tree is traversed without being rebuilt and math expressions are not descended into.
+        - The first violation of each rule is recorded and the violation of the earliest rule in the order above is
+            raised, such that the raised error is the one raised by applying the rules one after the other.
+    """
+
+    rules = (
+        CanVerOperatorDistribute,
+        CanVerGatherMathExpr,
+        CanVerProperOrder,
+        CanVerPauliAlgebra,
+        CanVerGatherPauli,
+        CanVerNormalOrder,
+        CanVerPruneIdentity,
+        CanVerSortedOrder,
+        CanVerScaleTerm,
+    )
+
+    def __init__(self, *, level="full", samples=64, seed=0):
+        super().__init__()
+
+        if level not in ("full", "sampled", "off"):
+            raise ValueError(f"Unknown verification level {level!r}")
+
+        self.level = level
+        self.samples = samples
+        self.seed = seed
+
+        self._rules = [rule() for rule in self.rules]
+        self._sorted_order = self.rules.index(CanVerSortedOrder)
+        # checks of each node type, as lists of (index of the rule, map function) applied in pre and post order
+        self._checks = {}
+
+    @property
+    def children(self):
+        return list(self._rules)
+
+    def _checks_of(self, kind):
+        checks = self._checks.get(kind)
+        if checks is None:
+            pre, post = [], []
+            for i, rule in enumerate(self._rules):
+                for cls in kind.__mro__:
+                    map_func = getattr(rule, f"map_{cls.__name__}", None)
+                    if map_func:
+                        (pre if isinstance(rule, CanVerScaleTerm) else post).append(
+                            (i, map_func)
+                        )
+                        break
+            checks = self._checks[kind] = (pre, post)
+        return checks
+
+    def _check(self, checks, model, skip=None):
+        for i, map_func in checks:
+            if i >= self._limit:
+                return
+            if i == skip:
+                continue
+            try:
+                map_func(model)
+            except Exception as e:
+                self._violations[i] = e
+                self._limit = i
+                if i == 0:
+                    raise
+                return
+
+    def map(self, model):
+        if self.level == "off":
+            return model
+
+        self._violations = {}
+        self._limit = len(self._rules)
+        self._random = random.Random(self.seed)
+        for rule in self._rules:
+            if isinstance(rule, CanVerScaleTerm):
+                rule._single_term_scaling_needed = False
+
+        # a node is either expanded into its children or checked after all of its children
+        stack = [(model, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                self._check(self._checks_of(type(node))[1], node)
+                continue
+
+            if isinstance(node, (list, tuple)):
+                stack.extend((value, False) for value in reversed(node))
+                continue
+            if isinstance(node, dict):
+                stack.extend((value, False) for value in reversed(list(node.values())))
+                continue
+            if not isinstance(node, VisitableBaseModel) or isinstance(node, MathExpr):
+                continue
+
+            self._check(self._checks_of(type(node))[0], node)
+            if self.level == "sampled" and isinstance(node, OperatorAdd):
+                self._sample(node, stack)
+                continue
+
+            stack.append((node, True))
+            stack.extend(
+                (getattr(node, key), False)
+                for key in reversed(node.__class__.model_fields)
+                if key != "class_"
+            )
+
+        if self._violations:
+            raise self._violations[min(self._violations)]
+        return model
+
+    def _sample(self, model: OperatorAdd, stack):
+        """
+        Checks every addition of a sum and pushes a sample of its terms to the stack.
+        """
+        adds = [model]
+        while isinstance(adds[-1].op1, OperatorAdd):
+            adds.append(adds[-1].op1)
+            self._check(self._checks_of(OperatorAdd)[0], adds[-1])
+        adds.reverse()
+
+        terms = [adds[0].op1] + [add.op2 for add in adds]
+        if len(terms) > self.samples:
+            selected = sorted(self._random.sample(range(len(terms)), self.samples))
+        else:
+            selected = range(len(terms))
+
+        post = self._checks_of(OperatorAdd)[1]
+        sorted_order = [check for check in post if check[0] == self._sorted_order]
+        for add in adds:
+            self._check(post, add, skip=self._sorted_order)
+        for i in selected:
+            if i > 0:
+                self._check(sorted_order, adds[i - 1])
+
+        stack.extend((terms[i], False) for i in reversed(selected))
@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oqd_compiler_infrastructure import Chain, Pre, RewriteRule
+from oqd_compiler_infrastructure import Chain, RewriteRule
 
 ########################################################################################
+from oqd_core.compiler.walk import Pre
 from oqd_core.interface.atomic import Level, Transition
 
 ########################################################################################
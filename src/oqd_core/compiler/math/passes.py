@@ -12,21 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oqd_compiler_infrastructure import Post
+import numpy as np
 
 ########################################################################################
 from oqd_core.compiler.math.rules import (
+    CompileMathExpr,
+    DifferentiateMathExpr,
+    EliminateCommonMathExpr,
     EvaluateMathExpr,
+    FoldMathExpr,
+    InternMathExpr,
     PrintMathExpr,
     SimplifyMathExpr,
 )
+from oqd_core.compiler.walk import Post
+from oqd_core.interface.math import MathExpr
 
 ########################################################################################
 
 __all__ = [
     "evaluate_math_expr",
     "simplify_math_expr",
+    "fold_math_expr",
     "print_math_expr",
+    "compile_math_expr",
+    "differentiate_math_expr",
+    "sweep_math_expr",
+    "intern_math_expr",
+    "eliminate_common_math_expr",
+    "walk_math_dag",
 ]
 
 ########################################################################################
@@ -42,7 +56,199 @@ simplify_math_expr = Post(SimplifyMathExpr())
 Pass for simplifying math expression
 """
 
+
+def fold_math_expr(model):
+    """
+    This pass folds the math expressions inside a model in a single walk, collecting like terms, merging
+    powers and folding real and complex constants.
+
+    Args:
+        model (VisitableBaseModel): [`MathExpr`][oqd_core.interface.math.MathExpr] or model containing
+            [`MathExpr`][oqd_core.interface.math.MathExpr]
+
+    Returns:
+        model (VisitableBaseModel): model whose [`MathExpr`][oqd_core.interface.math.MathExpr] are folded
+            into a sum of products
+
+    Example:
+        for model = MathStr(string="1j * 1 * -1 * 2 + t * t"), the output is MathStr(string="1j * -2.0 + t**2")
+    """
+    rule = FoldMathExpr()
+    return rule.materialize(Post(rule)(model))
+
+
 print_math_expr = Post(PrintMathExpr())
 """
 Pass for printing math expression
 """
+
+
+def compile_math_expr(model, variables=("t",)):
+    """
+    This pass lowers a math expression once into a vectorized NumPy function of its variables.
+
+    Args:
+        model (Union[MathExpr, list[MathExpr]]): [`MathExpr`][oqd_core.interface.math.MathExpr] to compile,
+            or list of [`MathExpr`][oqd_core.interface.math.MathExpr] to compile into a single function
+            sharing their common subexpressions
+        variables (tuple[str]): Names of the [`MathVar`][oqd_core.interface.math.MathVar] bound to
+            the positional arguments of the compiled function
+
+    Returns:
+        function (Callable): Function accepting scalars or NumPy arrays (broadcast against each other)
+            for each variable, in the order given by `variables`. For a list of expressions, the
+            function returns a tuple with the value of each expression.
+
+    Example:
+        for model = MathStr(string="cos(w*t)") and variables = ("w", "t"),
+        the output f satisfies f(w, t) == np.cos(w * t)
+    """
+    rule = CompileMathExpr(variables=variables)
+    result = Post(rule)(model)
+
+    if isinstance(result, list):
+        result = "({})".format("".join(f"{r}, " for r in result))
+
+    arguments = ", ".join(f"_v{n}" for n in range(len(variables)))
+    body = "".join(f"    {line}\n" for line in rule.lines)
+
+    namespace = {"np": np}
+    exec(
+        compile(
+            f"def compiled_math_expr({arguments}):\n{body}    return {result}\n",
+            "<compiled MathExpr>",
+            "exec",
+        ),
+        namespace,
+    )
+    return namespace["compiled_math_expr"]
+
+
+def differentiate_math_expr(model, variable):
+    """
+    This pass differentiates a math expression with respect to a variable.
+
+    Args:
+        model (MathExpr): [`MathExpr`][oqd_core.interface.math.MathExpr] to differentiate
+        variable (str): Name of the [`MathVar`][oqd_core.interface.math.MathVar] to differentiate with
+            respect to
+
+    Returns:
+        model (MathExpr): Derivative of the expression, sharing its subexpressions with model
+
+    Example:
+        for model = MathStr(string="a * sin(w * t)") and variable = "w", the output is
+        MathStr(string="a * (cos(w * t) * t)"). Primal and derivative can be evaluated together with
+        compile_math_expr([model, derivative], variables=("a", "w", "t")).
+    """
+    return Post(DifferentiateMathExpr(variable=variable))(model)
+
+
+def sweep_math_expr(model, variables):
+    """
+    This pass evaluates a math expression over a sweep of parameter points in a single walk.
+
+    Args:
+        model (MathExpr): [`MathExpr`][oqd_core.interface.math.MathExpr] to evaluate
+        variables (dict[str, ArrayLike]): Values bound to each [`MathVar`][oqd_core.interface.math.MathVar],
+            broadcast against each other
+
+    Returns:
+        result (np.ndarray): Value of the expression at each parameter point, with the broadcast shape
+            of the bound values
+
+    Raises:
+        TypeError: if the expression contains a variable that is not bound
+
+    Example:
+        for model = MathStr(string="a * cos(t)"), variables = {"a": np.ones((3, 1)), "t": np.zeros(4)},
+        the output is np.ones((3, 4))
+    """
+    names = list(variables.keys())
+    values = np.broadcast_arrays(*(np.asarray(variables[name]) for name in names))
+
+    result = Post(EvaluateMathExpr(variables=dict(zip(names, values))))(model)
+
+    shape = values[0].shape if values else ()
+    return np.array(np.broadcast_to(result, shape))
+
+
+def intern_math_expr(model):
+    """
+    This pass interns the math expressions inside a model, such that structurally equal subexpressions
+    are shared as a single instance.
+
+    Args:
+        model (VisitableBaseModel): model containing [`MathExpr`][oqd_core.interface.math.MathExpr]
+
+    Returns:
+        model (VisitableBaseModel): model whose [`MathExpr`][oqd_core.interface.math.MathExpr] are interned
+
+    Note:
+        Use `Post(InternMathExpr())` with the same rule instance to share subexpressions across models.
+    """
+    return Post(InternMathExpr())(model)
+
+
+def eliminate_common_math_expr(model):
+    """
+    This pass turns the math expressions inside a model into a DAG of unique subexpressions.
+
+    Args:
+        model (Union[VisitableBaseModel, list[MathExpr]]): [`MathExpr`][oqd_core.interface.math.MathExpr],
+            list of [`MathExpr`][oqd_core.interface.math.MathExpr] or model containing
+            [`MathExpr`][oqd_core.interface.math.MathExpr], e.g. an
+            [`AnalogCircuit`][oqd_core.interface.analog.operation.AnalogCircuit]
+
+    Returns:
+        nodes (list[MathExpr]): Unique subexpressions, in topological order (children before parents)
+        roots (list[int]): Position in nodes of each expression of the forest, in walk order
+
+    Example:
+        for model = [MathStr(string="cos(t) * 2"), MathStr(string="cos(t) + 1")], the output is
+        nodes = [t, cos(t), 2, cos(t) * 2, 1, cos(t) + 1] and roots = [3, 5]
+    """
+    rule = EliminateCommonMathExpr()
+    result = Post(rule)(model)
+
+    if isinstance(result, MathExpr):
+        rule.roots.append(rule.index[id(result)])
+
+    return rule.nodes, rule.roots
+
+
+def walk_math_dag(rule, nodes, roots):
+    """
+    This pass applies a conversion rule to a DAG of unique subexpressions, such that each subexpression
+    is converted once and its result is reused by all of its parents.
+
+    Args:
+        rule (ConversionRule): Rule to apply, e.g. [`EvaluateMathExpr`][oqd_core.compiler.math.rules.EvaluateMathExpr]
+        nodes (list[MathExpr]): Unique subexpressions in topological order, see
+            [`eliminate_common_math_expr`][oqd_core.compiler.math.passes.eliminate_common_math_expr]
+        roots (list[int]): Position in nodes of the expressions to return
+
+    Returns:
+        results (list): Result of the rule for each root
+
+    Example:
+        walk_math_dag(EvaluateMathExpr(variables={"t": times}), nodes, roots) evaluates cos(t) once for
+        nodes and roots of [MathStr(string="cos(t) * 2"), MathStr(string="cos(t) + 1")]
+    """
+    index = {id(node): n for n, node in enumerate(nodes)}
+
+    results = []
+    for node in nodes:
+        operands = {}
+        for key in node.__class__.model_fields.keys():
+            if key == "class_":
+                continue
+            value = getattr(node, key)
+            operands[key] = (
+                results[index[id(value)]] if isinstance(value, MathExpr) else value
+            )
+
+        rule.operands = operands
+        results.append(rule(node))
+
+    return [results[root] for root in roots]
@@ -13,16 +13,19 @@
 # limitations under the License.
 
 import math
+import weakref
 from typing import Union
 
 import numpy as np
 from oqd_compiler_infrastructure import ConversionRule, RewriteRule
 
 ########################################################################################
+from oqd_core.compiler.tracking import TrackedRewriteRule
 from oqd_core.interface.math import (
     MathAdd,
     MathBinaryOp,
     MathDiv,
+    MathExpr,
     MathFunc,
     MathImag,
     MathMul,
@@ -41,13 +44,43 @@ __all__ = [
     "DistributeMathExpr",
     "PartitionMathExpr",
     "ProperOrderMathExpr",
+    "CanonicalOrderMathExpr",
     "PruneMathExpr",
     "SimplifyMathExpr",
+    "MathPolynomial",
+    "FoldMathExpr",
+    "DifferentiateMathExpr",
     "EvaluateMathExpr",
+    "CompileMathExpr",
+    "InternMathExpr",
+    "EliminateCommonMathExpr",
 ]
 
 ########################################################################################
 
+numpy_functions = dict(
+    sin="sin",
+    cos="cos",
+    tan="tan",
+    exp="exp",
+    log="log",
+    sinh="sinh",
+    cosh="cosh",
+    tanh="tanh",
+    atan="arctan",
+    acos="arccos",
+    asin="arcsin",
+    atanh="arctanh",
+    asinh="arcsinh",
+    acosh="arccosh",
+    conj="conj",
+)
+"""
+Names of the NumPy ufuncs implementing the named functions of a [`MathFunc`][oqd_core.interface.math.MathFunc]
+"""
+
+########################################################################################
+
 
 class PrintMathExpr(ConversionRule):
     """
@@ -176,7 +209,7 @@ class PrintMathExpr(ConversionRule):
 ########################################################################################
 
 
-class DistributeMathExpr(RewriteRule):
+class DistributeMathExpr(TrackedRewriteRule):
     """
     This distributes [`MathExpr`][oqd_core.interface.math.MathExpr] objects.
 
@@ -306,28 +339,119 @@ class ProperOrderMathExpr(RewriteRule):
         pass
 
 
+class CanonicalOrderMathExpr(RewriteRule):
+    """
+    This flattens every chain of [`MathAdd`][oqd_core.interface.math.MathAdd] and
+    [`MathMul`][oqd_core.interface.math.MathMul] into its list of terms or factors, orders the list with a
+    single stable sort and rebuilds it as a left associated chain. This produces in one walk the bracketing of
+    [`ProperOrderMathExpr`][oqd_core.compiler.math.rules.ProperOrderMathExpr] and the ordering of
+    [`PartitionMathExpr`][oqd_core.compiler.math.rules.PartitionMathExpr].
+
+    Args:
+        model (MathExpr): The rule only acts on [`MathExpr`][oqd_core.interface.math.MathExpr] objects.
+
+    Returns:
+        model (MathExpr):
+
+    Assumptions:
+        [`DistributeMathExpr`][oqd_core.compiler.math.rules.DistributeMathExpr]
+
+    Note:
+        Requires a [`Pre`][oqd_compiler_infrastructure.walk.Pre] walk, such that each chain is ordered once
+        from its root.
+
+    Example:
+        - MathStr(string = '1j * 3 + (1 + t * 2)') => MathStr(string = '1 + 2 * t + 1j * 3')
+        - MathStr(string = 't * (2 * 1j)') => MathStr(string = '1j * 2 * t')
+    """
+
+    priority = dict(MathImag=4, MathNum=3, MathVar=2, MathFunc=1, MathPow=0)
+
+    def __init__(self):
+        super().__init__()
+
+        self._ordered = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def flatten(model, cls):
+        """
+        Returns the list of operands of a chain of binary operations of type cls, from left to right.
+        """
+        operands = []
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, cls):
+                stack.append(node.expr2)
+                stack.append(node.expr1)
+            else:
+                operands.append(node)
+        return operands
+
+    def _build(self, operands, cls):
+        model = operands[0]
+        for operand in operands[1:]:
+            model = cls(expr1=model, expr2=operand)
+            self._ordered[id(model)] = model
+        return model
+
+    def _order_factors(self, model: MathMul):
+        factors = sorted(
+            self.flatten(model, MathMul),
+            key=lambda factor: -self.priority.get(factor.__class__.__name__, -1),
+        )
+        return self._build(factors, MathMul)
+
+    @staticmethod
+    def _is_imaginary(model):
+        while isinstance(model, MathMul):
+            model = model.expr1
+        return isinstance(model, MathImag)
+
+    def map_MathAdd(self, model: MathAdd):
+        if self._ordered.get(id(model)) is model:
+            return None
+
+        terms = [
+            self._order_factors(term) if isinstance(term, MathMul) else term
+            for term in self.flatten(model, MathAdd)
+        ]
+        terms = sorted(terms, key=self._is_imaginary)
+        return self._build(terms, MathAdd)
+
+    def map_MathMul(self, model: MathMul):
+        if self._ordered.get(id(model)) is model:
+            return None
+
+        return self._order_factors(model)
+
+
 class PruneMathExpr(RewriteRule):
     """
     This is constant fold operation where scalar addition, multiplication and power are simplified
     """
 
+    @staticmethod
+    def _is_num(model, value):
+        return isinstance(model, MathNum) and model.value == value
+
     def map_MathAdd(self, model):
-        if model.expr1 == MathNum(value=0):
+        if self._is_num(model.expr1, 0):
             return model.expr2
-        if model.expr2 == MathNum(value=0):
+        if self._is_num(model.expr2, 0):
             return model.expr1
 
     def map_MathMul(self, model):
-        if model.expr1 == MathNum(value=1):
+        if self._is_num(model.expr1, 1):
             return model.expr2
-        if model.expr2 == MathNum(value=1):
+        if self._is_num(model.expr2, 1):
             return model.expr1
 
-        if model.expr1 == MathNum(value=0) or model.expr2 == MathNum(value=0):
+        if self._is_num(model.expr1, 0) or self._is_num(model.expr2, 0):
             return MathNum(value=0)
 
     def map_MathPow(self, model):
-        if model.expr1 == MathNum(value=1) or model.expr2 == MathNum(value=1):
+        if self._is_num(model.expr1, 1) or self._is_num(model.expr2, 1):
             return model.expr1
 
 
@@ -364,13 +488,492 @@ class SimplifyMathExpr(RewriteRule):
 ########################################################################################
 
 
+class MathPolynomial(dict):
+    """
+    Sum of monomials used by [`FoldMathExpr`][oqd_core.compiler.math.rules.FoldMathExpr], mapping the key of
+    each monomial to its (coefficient, monomial) pair. A monomial maps the key of each atom to its exponent.
+    """
+
+    pass
+
+
+class FoldMathExpr(ConversionRule):
+    """
+    This folds [`MathExpr`][oqd_core.interface.math.MathExpr] objects in a single bottom-up walk into a sum of
+    monomials with complex coefficients. Constants, including [`MathImag`][oqd_core.interface.math.MathImag],
+    are folded together, like terms are collected and powers of the same atom are merged. Variables, named
+    functions of non-constant arguments and non-constant powers are kept as atoms.
+
+    Args:
+        model (VisitableBaseModel): The rule folds every [`MathExpr`][oqd_core.interface.math.MathExpr]
+            inside the model.
+
+    Returns:
+        model (VisitableBaseModel): model where every [`MathExpr`][oqd_core.interface.math.MathExpr] that is
+            not nested in another one is folded. A [`MathExpr`][oqd_core.interface.math.MathExpr] root is
+            returned as a [`MathPolynomial`][oqd_core.compiler.math.rules.MathPolynomial], use
+            `materialize` to convert it back.
+
+    Assumptions:
+        None
+
+    Example:
+        - MathStr(string = '1j * 1 * -1 * 2') => MathStr(string = '1j * -2')
+        - MathStr(string = 't * t / 2 + t**2 - 3 * 1j * 1j') => MathStr(string = '1.5 * t**2 + 3')
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.atoms = {}
+
+    @staticmethod
+    def _normalize(value):
+        if isinstance(value, complex):
+            if value.imag == 0:
+                return float(value.real)
+            return complex(value)
+        if isinstance(value, (bool, np.bool_)):
+            return int(value)
+        if isinstance(value, np.integer):
+            return int(value)
+        if isinstance(value, np.floating):
+            return float(value)
+        return value
+
+    def _constant(self, value):
+        value = self._normalize(value)
+        if value == 0:
+            return MathPolynomial()
+        return MathPolynomial({frozenset(): (value, {})})
+
+    @staticmethod
+    def _as_constant(poly):
+        if not poly:
+            return 0
+        if len(poly) == 1 and frozenset() in poly:
+            return poly[frozenset()][0]
+        return None
+
+    def _atom(self, key, expr, exponent=1):
+        self.atoms.setdefault(key, expr)
+        monomial = {key: exponent}
+        return MathPolynomial({frozenset(monomial.items()): (1, monomial)})
+
+    @staticmethod
+    def _poly_key(poly):
+        return frozenset((k, c) for k, (c, _) in poly.items())
+
+    def _accumulate(self, poly, key, coeff, monomial):
+        if key in poly:
+            coeff = self._normalize(poly[key][0] + coeff)
+            if coeff == 0:
+                del poly[key]
+                return
+            monomial = poly[key][1]
+        poly[key] = (coeff, monomial)
+
+    def _add(self, poly1, poly2):
+        result = MathPolynomial(poly1)
+        for key, (coeff, monomial) in poly2.items():
+            self._accumulate(result, key, coeff, monomial)
+        return result
+
+    def _scale(self, poly, value):
+        value = self._normalize(value)
+        if value == 0:
+            return MathPolynomial()
+        return MathPolynomial(
+            {k: (self._normalize(c * value), m) for k, (c, m) in poly.items()}
+        )
+
+    def _mul(self, poly1, poly2):
+        result = MathPolynomial()
+        for coeff1, monomial1 in poly1.values():
+            for coeff2, monomial2 in poly2.values():
+                monomial = dict(monomial1)
+                for atom, exponent in monomial2.items():
+                    exponent = monomial.get(atom, 0) + exponent
+                    if exponent == 0:
+                        monomial.pop(atom, None)
+                        continue
+                    monomial[atom] = exponent
+                self._accumulate(
+                    result,
+                    frozenset(monomial.items()),
+                    self._normalize(coeff1 * coeff2),
+                    monomial,
+                )
+        return result
+
+    def _pow(self, poly, exponent):
+        """
+        Raises a folded expression to a real constant exponent.
+        """
+        if len(poly) == 1:
+            ((coeff, monomial),) = poly.values()
+            if isinstance(exponent, int) or (
+                coeff == 1
+                and all(e == 1 for e in monomial.values())
+                and len(monomial) == 1
+            ):
+                monomial = {a: e * exponent for a, e in monomial.items()}
+                return MathPolynomial(
+                    {
+                        frozenset(monomial.items()): (
+                            self._normalize(coeff**exponent),
+                            monomial,
+                        )
+                    }
+                )
+
+        return self._atom(
+            ("MathExpr", self._poly_key(poly)), self.materialize(poly), exponent
+        )
+
+    def _fold(self, func, *args):
+        try:
+            return self._constant(func(*args))
+        except (ZeroDivisionError, ValueError, OverflowError, TypeError):
+            return None
+
+    def materialize(self, poly):
+        """
+        Converts a folded expression back into a [`MathExpr`][oqd_core.interface.math.MathExpr], as a left
+        associated sum of products, with the real part of each coefficient before its imaginary part.
+        """
+        if isinstance(poly, list):
+            return [self.materialize(e) for e in poly]
+        if not isinstance(poly, MathPolynomial):
+            return poly
+
+        terms = []
+        for coeff, monomial in poly.values():
+            factors = []
+            for atom, exponent in monomial.items():
+                factor = self.atoms[atom]
+                if exponent != 1:
+                    factor = MathPow(expr1=factor, expr2=MathNum(value=exponent))
+                factors.append(factor)
+
+            parts = []
+            if isinstance(coeff, complex):
+                if coeff.real != 0:
+                    parts.append([MathNum(value=coeff.real)])
+                parts.append(
+                    [MathImag()]
+                    + ([] if coeff.imag == 1 else [MathNum(value=coeff.imag)])
+                )
+            else:
+                parts.append([] if coeff == 1 and factors else [MathNum(value=coeff)])
+
+            for part in parts:
+                term = None
+                for factor in part + factors:
+                    term = factor if term is None else MathMul(expr1=term, expr2=factor)
+                terms.append(term)
+
+        expr = None
+        for term in terms:
+            expr = term if expr is None else MathAdd(expr1=expr, expr2=term)
+        return MathNum(value=0) if expr is None else expr
+
+    def map_VisitableBaseModel(self, model, operands):
+        return model.__class__(**{k: self.materialize(v) for k, v in operands.items()})
+
+    def map_MathNum(self, model: MathNum, operands):
+        return self._constant(model.value)
+
+    def map_MathImag(self, model: MathImag, operands):
+        return self._constant(1j)
+
+    def map_MathVar(self, model: MathVar, operands):
+        return self._atom(("MathVar", model.name), model)
+
+    def map_MathFunc(self, model: MathFunc, operands):
+        value = self._as_constant(operands["expr"])
+
+        if value is not None:
+            if model.func == "heaviside":
+                poly = self._fold(lambda x: np.heaviside(x, 1), value)
+            elif isinstance(value, complex) or not getattr(math, model.func, None):
+                poly = self._fold(getattr(np, numpy_functions[model.func]), value)
+            else:
+                poly = self._fold(getattr(math, model.func), value)
+
+            if poly is not None:
+                return poly
+
+        expr = self.materialize(operands["expr"])
+        return self._atom(
+            ("MathFunc", model.func, self._poly_key(operands["expr"])),
+            MathFunc(func=model.func, expr=expr),
+        )
+
+    def map_MathAdd(self, model: MathAdd, operands):
+        return self._add(operands["expr1"], operands["expr2"])
+
+    def map_MathSub(self, model: MathSub, operands):
+        return self._add(operands["expr1"], self._scale(operands["expr2"], -1))
+
+    def map_MathMul(self, model: MathMul, operands):
+        return self._mul(operands["expr1"], operands["expr2"])
+
+    def map_MathDiv(self, model: MathDiv, operands):
+        value = self._as_constant(operands["expr2"])
+        if value is not None and value != 0:
+            return self._scale(operands["expr1"], 1 / value)
+
+        if value is None:
+            if self._poly_key(operands["expr1"]) == self._poly_key(operands["expr2"]):
+                return self._constant(1)
+            return self._mul(operands["expr1"], self._pow(operands["expr2"], -1))
+
+        return self._mul(
+            operands["expr1"],
+            self._atom(
+                ("MathExpr", self._poly_key(operands["expr2"])),
+                self.materialize(operands["expr2"]),
+                -1,
+            ),
+        )
+
+    def map_MathPow(self, model: MathPow, operands):
+        base = self._as_constant(operands["expr1"])
+        exponent = self._as_constant(operands["expr2"])
+
+        if base is not None and exponent is not None:
+            poly = self._fold(lambda x, y: x**y, base, exponent)
+            if poly is not None:
+                return poly
+
+        if base == 1:
+            return self._constant(1)
+
+        if exponent is not None and not isinstance(exponent, complex):
+            if exponent == 0:
+                return self._constant(1)
+            if base != 0:
+                if isinstance(exponent, float) and exponent.is_integer():
+                    exponent = int(exponent)
+                return self._pow(operands["expr1"], exponent)
+
+        return self._atom(
+            (
+                "MathPow",
+                self._poly_key(operands["expr1"]),
+                self._poly_key(operands["expr2"]),
+            ),
+            MathPow(
+                expr1=self.materialize(operands["expr1"]),
+                expr2=self.materialize(operands["expr2"]),
+            ),
+        )
+
+
+########################################################################################
+
+
+class DifferentiateMathExpr(ConversionRule):
+    """
+    This differentiates [`MathExpr`][oqd_core.interface.math.MathExpr] objects with respect to a variable.
+    The derivative refers to the nodes of the differentiated expression (the primal) instead of copying
+    them, such that common subexpressions are shared between the primal and its derivative.
+
+    Args:
+        model (MathExpr): The rule only acts on [`MathExpr`][oqd_core.interface.math.MathExpr] objects.
+
+    Returns:
+        model (MathExpr): Derivative of the expression
+
+    Assumptions:
+        None
+
+    Note:
+        The variable is assumed to be real, i.e. the derivative of conj(f) is conj(f'). The derivative of
+        heaviside is taken as zero.
+
+    Example:
+        MathStr(string = 'sin(w * t)') with variable 't' => MathStr(string = 'cos(w * t) * w')
+    """
+
+    def __init__(self, *, variable):
+        super().__init__()
+
+        self.variable = variable
+
+    @staticmethod
+    def _is_num(model, value):
+        return isinstance(model, MathNum) and model.value == value
+
+    def _add(self, expr1, expr2):
+        if self._is_num(expr1, 0):
+            return expr2
+        if self._is_num(expr2, 0):
+            return expr1
+        return MathAdd(expr1=expr1, expr2=expr2)
+
+    def _sub(self, expr1, expr2):
+        if self._is_num(expr2, 0):
+            return expr1
+        if self._is_num(expr1, 0):
+            return MathMul(expr1=MathNum(value=-1), expr2=expr2)
+        return MathSub(expr1=expr1, expr2=expr2)
+
+    def _mul(self, expr1, expr2):
+        if self._is_num(expr1, 0) or self._is_num(expr2, 0):
+            return MathNum(value=0)
+        if self._is_num(expr1, 1):
+            return expr2
+        if self._is_num(expr2, 1):
+            return expr1
+        return MathMul(expr1=expr1, expr2=expr2)
+
+    def _div(self, expr1, expr2):
+        if self._is_num(expr1, 0):
+            return MathNum(value=0)
+        return MathDiv(expr1=expr1, expr2=expr2)
+
+    def _derivative_MathFunc(self, model: MathFunc):
+        u = model.expr
+
+        if model.func == "sin":
+            return MathFunc(func="cos", expr=u)
+        if model.func == "cos":
+            return MathMul(expr1=MathNum(value=-1), expr2=MathFunc(func="sin", expr=u))
+        if model.func == "tan":
+            return MathDiv(
+                expr1=MathNum(value=1),
+                expr2=MathPow(
+                    expr1=MathFunc(func="cos", expr=u), expr2=MathNum(value=2)
+                ),
+            )
+        if model.func == "exp":
+            return model
+        if model.func == "log":
+            return MathDiv(expr1=MathNum(value=1), expr2=u)
+        if model.func == "sinh":
+            return MathFunc(func="cosh", expr=u)
+        if model.func == "cosh":
+            return MathFunc(func="sinh", expr=u)
+        if model.func == "tanh":
+            return MathSub(
+                expr1=MathNum(value=1),
+                expr2=MathPow(expr1=model, expr2=MathNum(value=2)),
+            )
+
+        u2 = MathPow(expr1=u, expr2=MathNum(value=2))
+        if model.func == "atan":
+            return MathDiv(
+                expr1=MathNum(value=1), expr2=MathAdd(expr1=MathNum(value=1), expr2=u2)
+            )
+        if model.func == "atanh":
+            return MathDiv(
+                expr1=MathNum(value=1), expr2=MathSub(expr1=MathNum(value=1), expr2=u2)
+            )
+
+        if model.func in ("asin", "acos"):
+            root = MathPow(
+                expr1=MathSub(expr1=MathNum(value=1), expr2=u2),
+                expr2=MathNum(value=0.5),
+            )
+            sign = 1 if model.func == "asin" else -1
+            return MathDiv(expr1=MathNum(value=sign), expr2=root)
+        if model.func in ("asinh", "acosh"):
+            shift = 1 if model.func == "asinh" else -1
+            root = MathPow(
+                expr1=MathAdd(expr1=u2, expr2=MathNum(value=shift)),
+                expr2=MathNum(value=0.5),
+            )
+            return MathDiv(expr1=MathNum(value=1), expr2=root)
+
+        # heaviside, every other function of Functions is handled above
+        return MathNum(value=0)
+
+    def map_MathVar(self, model: MathVar, operands):
+        return MathNum(value=1 if model.name == self.variable else 0)
+
+    def map_MathNum(self, model: MathNum, operands):
+        return MathNum(value=0)
+
+    def map_MathImag(self, model: MathImag, operands):
+        return MathNum(value=0)
+
+    def map_MathFunc(self, model: MathFunc, operands):
+        if self._is_num(operands["expr"], 0):
+            return MathNum(value=0)
+        if model.func == "conj":
+            return MathFunc(func="conj", expr=operands["expr"])
+        return self._mul(self._derivative_MathFunc(model), operands["expr"])
+
+    def map_MathAdd(self, model: MathAdd, operands):
+        return self._add(operands["expr1"], operands["expr2"])
+
+    def map_MathSub(self, model: MathSub, operands):
+        return self._sub(operands["expr1"], operands["expr2"])
+
+    def map_MathMul(self, model: MathMul, operands):
+        return self._add(
+            self._mul(operands["expr1"], model.expr2),
+            self._mul(model.expr1, operands["expr2"]),
+        )
+
+    def map_MathDiv(self, model: MathDiv, operands):
+        return self._sub(
+            self._div(operands["expr1"], model.expr2),
+            self._div(
+                self._mul(model, operands["expr2"]),
+                model.expr2,
+            ),
+        )
+
+    def map_MathPow(self, model: MathPow, operands):
+        if self._is_num(operands["expr2"], 0):
+            return self._mul(
+                self._mul(
+                    model.expr2,
+                    MathPow(
+                        expr1=model.expr1,
+                        expr2=MathSub(expr1=model.expr2, expr2=MathNum(value=1)),
+                    ),
+                ),
+                operands["expr1"],
+            )
+
+        return self._mul(
+            model,
+            self._add(
+                self._mul(operands["expr2"], MathFunc(func="log", expr=model.expr1)),
+                self._div(self._mul(model.expr2, operands["expr1"]), model.expr1),
+            ),
+        )
+
+
+########################################################################################
+
+
 class EvaluateMathExpr(ConversionRule):
     """
-    This evalaluates MathExpr objects
+    This evalaluates MathExpr objects. Values for [`MathVar`][oqd_core.interface.math.MathVar] can be bound
+    through the variables attribute, either as numbers or as NumPy arrays, in which case the expression is
+    evaluated elementwise with broadcasting.
+
+    Example:
+        MathStr(string = 'a * t') with variables {'a': 2, 't': np.array([0, 1])} => np.array([0, 2])
     """
 
+    def __init__(self, *, variables=None):
+        super().__init__()
+
+        self.variables = {} if variables is None else variables
+
     def map_MathVar(self, model: MathVar, operands):
-        raise TypeError
+        if model.name not in self.variables:
+            raise TypeError(
+                f"Unbound variable '{model.name}' in MathExpr, "
+                + f"expected one of {tuple(self.variables.keys())}."
+            )
+        return self.variables[model.name]
 
     def map_MathNum(self, model: MathNum, operands):
         return model.value
@@ -379,14 +982,16 @@ class EvaluateMathExpr(ConversionRule):
         return complex("1j")
 
     def map_MathFunc(self, model: MathFunc, operands):
-        if getattr(math, model.func, None):
-            return getattr(math, model.func)(operands["expr"])
-
         if model.func == "heaviside":
             return np.heaviside(operands["expr"], 1)
 
-        if model.func == "conj":
-            return np.conj(operands["expr"])
+        if isinstance(operands["expr"], (int, float)) and getattr(
+            math, model.func, None
+        ):
+            return getattr(math, model.func)(operands["expr"])
+
+        # arrays and complex operands, e.g. sin(1j*t) at a scalar t, go through the NumPy ufuncs
+        return getattr(np, numpy_functions[model.func])(operands["expr"])
 
     def map_MathAdd(self, model: MathAdd, operands):
         return operands["expr1"] + operands["expr2"]
@@ -402,3 +1007,223 @@ class EvaluateMathExpr(ConversionRule):
 
     def map_MathPow(self, model: MathPow, operands):
         return operands["expr1"] ** operands["expr2"]
+
+
+########################################################################################
+
+
+class CompileMathExpr(ConversionRule):
+    """
+    This lowers [`MathExpr`][oqd_core.interface.math.MathExpr] objects to straight-line NumPy source code,
+    assigning the value of each composite node to a temporary variable. The generated statements are
+    stored in the `lines` attribute. Subexpressions with the same source, e.g. shared between several
+    expressions compiled by the same rule instance, are assigned to a single temporary variable.
+
+    Args:
+        model (MathExpr): The rule only acts on [`MathExpr`][oqd_core.interface.math.MathExpr] objects.
+
+    Returns:
+        name (str): Name of the temporary variable (or literal) holding the value of the expression.
+
+    Assumptions:
+        None
+
+    Example:
+        MathStr(string = 'cos(w * t)') with variables ('w', 't') => '_t1' with lines
+        ['_t0 = _v0 * _v1', '_t1 = np.cos(_t0)']
+    """
+
+    def __init__(self, *, variables=("t",)):
+        super().__init__()
+
+        self.variables = {name: f"_v{n}" for n, name in enumerate(variables)}
+        self.lines = []
+        self.temporaries = {}
+
+    def _assign(self, source):
+        if source in self.temporaries:
+            return self.temporaries[source]
+
+        name = f"_t{len(self.lines)}"
+        self.lines.append(f"{name} = {source}")
+        self.temporaries[source] = name
+        return name
+
+    def map_MathVar(self, model: MathVar, operands):
+        if model.name not in self.variables:
+            raise TypeError(
+                f"Unbound variable '{model.name}' in MathExpr, "
+                + f"expected one of {tuple(self.variables.keys())}."
+            )
+        return self.variables[model.name]
+
+    def map_MathNum(self, model: MathNum, operands):
+        if isinstance(model.value, float) and not math.isfinite(model.value):
+            return f"float('{model.value}')"
+        return f"({model.value!r})"
+
+    def map_MathImag(self, model: MathImag, operands):
+        return "1j"
+
+    def map_MathFunc(self, model: MathFunc, operands):
+        if model.func == "heaviside":
+            return self._assign("np.heaviside({}, 1)".format(operands["expr"]))
+        return self._assign(
+            "np.{}({})".format(numpy_functions[model.func], operands["expr"])
+        )
+
+    def map_MathAdd(self, model: MathAdd, operands):
+        return self._assign("{} + {}".format(operands["expr1"], operands["expr2"]))
+
+    def map_MathSub(self, model: MathSub, operands):
+        return self._assign("{} - {}".format(operands["expr1"], operands["expr2"]))
+
+    def map_MathMul(self, model: MathMul, operands):
+        return self._assign("{} * {}".format(operands["expr1"], operands["expr2"]))
+
+    def map_MathDiv(self, model: MathDiv, operands):
+        return self._assign("{} / {}".format(operands["expr1"], operands["expr2"]))
+
+    def map_MathPow(self, model: MathPow, operands):
+        return self._assign("{} ** {}".format(operands["expr1"], operands["expr2"]))
+
+
+########################################################################################
+
+
+class InternMathExpr(ConversionRule):
+    """
+    This hash-conses [`MathExpr`][oqd_core.interface.math.MathExpr] objects, such that structurally equal
+    subexpressions are represented by a single shared instance. Reusing the same rule instance across several
+    walks shares subexpressions between all the interned trees.
+
+    Args:
+        model (VisitableBaseModel): The rule interns every [`MathExpr`][oqd_core.interface.math.MathExpr]
+            inside the model.
+
+    Returns:
+        model (VisitableBaseModel): model with interned [`MathExpr`][oqd_core.interface.math.MathExpr]
+
+    Assumptions:
+        None
+
+    Note:
+        Interned expressions are shared and must be treated as immutable. For two expressions interned by
+        the same rule instance, structural equality reduces to identity, i.e. `expr1 == expr2` if and
+        only if `expr1 is expr2`.
+
+    Example:
+        MathStr(string = 'cos(t) * cos(t)') => MathMul(expr1 = e, expr2 = e) with e = MathStr(string = 'cos(t)')
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.table = {}
+        self.keys = {}
+
+    def structural_key(self, model):
+        """
+        Returns the cached structural key of an interned expression.
+        """
+        return self.keys[id(model)]
+
+    def structural_hash(self, model):
+        """
+        Returns the structural hash of an interned expression.
+        """
+        return hash(self.keys[id(model)])
+
+    def _intern(self, model, key, fields):
+        if key in self.table:
+            return self.table[key]
+
+        if any(getattr(model, k) is not v for k, v in fields.items()):
+            model = model.__class__(**fields)
+
+        self.table[key] = model
+        self.keys[id(model)] = key
+        return model
+
+    def map_VisitableBaseModel(self, model, operands):
+        return model.__class__(**operands)
+
+    def map_MathNum(self, model: MathNum, operands):
+        key = ("MathNum", type(model.value), model.value)
+        return self._intern(model, key, {})
+
+    def map_MathVar(self, model: MathVar, operands):
+        key = ("MathVar", model.name)
+        return self._intern(model, key, {})
+
+    def map_MathImag(self, model: MathImag, operands):
+        key = ("MathImag",)
+        return self._intern(model, key, {})
+
+    def map_MathFunc(self, model: MathFunc, operands):
+        key = ("MathFunc", model.func, id(operands["expr"]))
+        return self._intern(model, key, dict(func=model.func, expr=operands["expr"]))
+
+    def map_MathBinaryOp(self, model: MathBinaryOp, operands):
+        key = (
+            model.__class__.__name__,
+            id(operands["expr1"]),
+            id(operands["expr2"]),
+        )
+        return self._intern(model, key, operands)
+
+
+class EliminateCommonMathExpr(InternMathExpr):
+    """
+    This eliminates common subexpressions in a forest of [`MathExpr`][oqd_core.interface.math.MathExpr]
+    objects, e.g. all the coefficients of an [`AnalogCircuit`][oqd_core.interface.analog.operation.AnalogCircuit].
+    Structurally equal subexpressions are interned as in
+    [`InternMathExpr`][oqd_core.compiler.math.rules.InternMathExpr] and the resulting DAG is stored in the
+    `nodes` attribute, listing every unique subexpression once, after all of its children. The `roots`
+    attribute stores the position in `nodes` of each [`MathExpr`][oqd_core.interface.math.MathExpr] that is
+    not nested in another one, in walk order.
+
+    Args:
+        model (VisitableBaseModel): The rule acts on every [`MathExpr`][oqd_core.interface.math.MathExpr]
+            inside the model.
+
+    Returns:
+        model (VisitableBaseModel): model with interned [`MathExpr`][oqd_core.interface.math.MathExpr]
+
+    Assumptions:
+        None
+
+    Example:
+        [MathStr(string = 'cos(t) * 2'), MathStr(string = 'cos(t) + 1')] => nodes [t, cos(t), 2, cos(t) * 2,
+        1, cos(t) + 1] and roots [3, 5]
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.nodes = []
+        self.roots = []
+        self.index = {}
+
+    def _intern(self, model, key, fields):
+        new = key not in self.table
+
+        model = super()._intern(model, key, fields)
+
+        if new:
+            self.index[id(model)] = len(self.nodes)
+            self.nodes.append(model)
+        return model
+
+    def _roots(self, operands):
+        for operand in operands:
+            if isinstance(operand, MathExpr):
+                self.roots.append(self.index[id(operand)])
+
+    def map_list(self, model, operands):
+        self._roots(model)
+        return model
+
+    def map_VisitableBaseModel(self, model, operands):
+        self._roots(operands.values())
+        return super().map_VisitableBaseModel(model, operands)
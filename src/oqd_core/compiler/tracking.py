@@ -0,0 +1,182 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import namedtuple
+
+from oqd_compiler_infrastructure import PassBase, RewriteRule, RuleBase, WalkBase
+
+########################################################################################
+
+__all__ = [
+    "TrackedRewriteRule",
+    "TrackedFixedPoint",
+    "FixedPointInfo",
+    "fixed_point_statistics",
+]
+
+########################################################################################
+
+
+class TrackedRewriteRule(RewriteRule):
+    """
+    RewriteRule which counts the rewrites it applies, such that a
+    [`TrackedFixedPoint`][oqd_core.compiler.tracking.TrackedFixedPoint] detects convergence without comparing trees.
+
+    Note:
+        - A rewrite is counted whenever a map function returns an object other than None and its input,
+            map functions must therefore return None (or their input) when they leave the model unchanged.
+        - The counter is never reset, such that nested fixed points observe the rewrites of each other.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.changes = 0
+
+    def map(self, model):
+        new_model = super().map(model)
+        if new_model is not None and new_model is not model:
+            self.changes += 1
+        return new_model
+
+
+FixedPointInfo = namedtuple("FixedPointInfo", ["calls", "iterations"])
+
+
+class TrackedFixedPoint(PassBase):
+    """
+    Applies a pass until it converges to a fixed point or reaches a maximum iteration count, equivalent to
+    FixedPoint of oqd_compiler_infrastructure. Convergence is decided by the rewrite counters of the
+    [`TrackedRewriteRule`][oqd_core.compiler.tracking.TrackedRewriteRule] within the pass, instead of comparing
+    the whole tree with the previous iteration.
+
+    Args:
+        rule (PassBase): Pass applied until convergence
+        max_iter (int): Maximum number of iterations per call
+        name (Optional[str]): Name of the stage in [`fixed_point_statistics`][oqd_core.compiler.tracking.fixed_point_statistics],
+            defaults to the name of the rule
+
+    Note:
+        - Falls back to comparing trees if the pass contains rules other than
+            [`TrackedRewriteRule`][oqd_core.compiler.tracking.TrackedRewriteRule].
+        - The number of calls and of iterations are accumulated in `calls` and `iterations`.
+    """
+
+    def __init__(self, rule, *, max_iter=1000, name=None):
+        super().__init__()
+
+        self.rule = rule
+        self.max_iter = max_iter
+        self.name = name if name is not None else self._default_name(rule)
+        self.calls = 0
+        self.iterations = 0
+
+        self._tracked = self._tracked_rules(rule)
+
+    @property
+    def children(self):
+        return [self.rule]
+
+    @staticmethod
+    def _default_name(rule):
+        while isinstance(rule, WalkBase):
+            rule = rule.rule
+        return rule.__class__.__name__
+
+    @staticmethod
+    def _tracked_rules(rule):
+        """
+        Returns the tracked rules within a pass, or None if the pass contains untracked rules.
+        """
+        tracked = []
+        stack = [rule]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, TrackedRewriteRule):
+                tracked.append(node)
+            elif isinstance(node, RuleBase):
+                return None
+            else:
+                stack.extend(node.children)
+        return tracked
+
+    def _changes(self):
+        return sum(rule.changes for rule in self._tracked)
+
+    def map(self, model):
+        self.calls += 1
+
+        i = 0
+        while True:
+            i += 1
+            if self._tracked is None:
+                new_model = self.rule(model)
+                converged = new_model == model
+            else:
+                changes = self._changes()
+                new_model = self.rule(model)
+                converged = self._changes() == changes
+
+            if converged or i > self.max_iter:
+                self.iterations += i
+                return model if converged else new_model
+
+            model = new_model
+
+    def reset_statistics(self):
+        """
+        Resets the number of calls and iterations.
+        """
+        self.calls = 0
+        self.iterations = 0
+
+
+def fixed_point_statistics(rule, *, reset=False):
+    """
+    Collects the number of calls and iterations of the
+    [`TrackedFixedPoint`][oqd_core.compiler.tracking.TrackedFixedPoint] stages within a pass.
+
+    Args:
+        rule (PassBase): Pass containing the stages
+        reset (bool): Whether the statistics of the stages are reset after being collected
+
+    Returns:
+        statistics (Dict[str, FixedPointInfo]): Statistics by stage, named by the names of the enclosing stages joined
+            with dots. Stages sharing a name are accumulated, and each stage is counted once even if it is shared.
+
+    Example:
+        >>> chain = Chain(TrackedFixedPoint(Post(OperatorDistribute()), name="distribute"))
+        >>> chain(op)
+        >>> fixed_point_statistics(chain)
+        {'distribute': FixedPointInfo(calls=1, iterations=3)}
+    """
+    statistics = {}
+    visited = set()
+    stack = [(rule, ())]
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, TrackedFixedPoint):
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+
+            path = path + (node.name,)
+            key = ".".join(path)
+            calls, iterations = statistics.get(key, (0, 0))
+            statistics[key] = FixedPointInfo(
+                calls + node.calls, iterations + node.iterations
+            )
+            if reset:
+                node.reset_statistics()
+        stack.extend((child, path) for child in reversed(node.children))
+    return statistics
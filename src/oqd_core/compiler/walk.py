@@ -0,0 +1,173 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from oqd_compiler_infrastructure import ConversionRule, VisitableBaseModel
+from oqd_compiler_infrastructure import In as _In
+from oqd_compiler_infrastructure import Post as _Post
+from oqd_compiler_infrastructure import Pre as _Pre
+
+########################################################################################
+
+__all__ = [
+    "Post",
+    "Pre",
+    "In",
+]
+
+########################################################################################
+
+
+def _children(walker, model):
+    """
+    Returns the keys and values of the children of a node in walk order, or None for terminals.
+    """
+    if isinstance(model, VisitableBaseModel):
+        keys = [
+            key
+            for key in walker.controlled_reverse(
+                model.__class__.model_fields.keys(), walker.reverse
+            )
+            if key != "class_"
+        ]
+        return keys, [getattr(model, key) for key in keys]
+    if isinstance(model, dict):
+        items = list(walker.controlled_reverse(model.items(), walker.reverse))
+        return [k for k, _ in items], [v for _, v in items]
+    if isinstance(model, (list, tuple)):
+        values = list(walker.controlled_reverse(model, walker.reverse))
+        return None, values
+    return None
+
+
+def _rebuild(walker, model, keys, values):
+    """
+    Rebuilds a node from the walked values of its children, given in walk order.
+    """
+    if isinstance(model, VisitableBaseModel):
+        return dict(zip(keys, values))
+    if isinstance(model, dict):
+        return dict(walker.controlled_reverse(list(zip(keys, values)), walker.reverse))
+    return walker.controlled_reverse(
+        model.__class__(values), walker.reverse, restore_type=True
+    )
+
+
+class Post(_Post):
+    """
+    Post order tree traversal with an explicit stack, equivalent to Post of oqd_compiler_infrastructure,
+    such that arbitrarily deep trees are walked without reaching the recursion limit.
+    """
+
+    def walk(self, model):
+        results = []
+        # a node is either expanded into its children or combined from their results
+        stack = [(model, None)]
+        while stack:
+            node, children = stack.pop()
+
+            if children is None:
+                children = _children(self, node)
+                if children is None:
+                    results.append(self.rule(node))
+                    continue
+
+                stack.append((node, children))
+                stack.extend((value, None) for value in reversed(children[1]))
+                continue
+
+            keys, values = children
+            if values:
+                values = results[-len(values) :]
+                del results[-len(values) :]
+            new_model = _rebuild(self, node, keys, values)
+
+            if isinstance(node, VisitableBaseModel):
+                if isinstance(self.rule, ConversionRule):
+                    self.rule.operands = new_model
+                    results.append(self.rule(node))
+                    continue
+                new_model = node.__class__(**new_model)
+            elif isinstance(self.rule, ConversionRule):
+                self.rule.operands = new_model
+
+            results.append(self.rule(new_model))
+
+        return results[0]
+
+
+class Pre(_Pre):
+    """
+    Pre order tree traversal with an explicit stack, equivalent to Pre of oqd_compiler_infrastructure,
+    such that arbitrarily deep trees are walked without reaching the recursion limit.
+    """
+
+    def walk(self, model):
+        results = []
+        # a node is either expanded into its children or combined from their results
+        stack = [(model, None)]
+        while stack:
+            node, children = stack.pop()
+
+            if children is None:
+                node = self.rule(node)
+                children = _children(self, node)
+                if children is None:
+                    results.append(node)
+                    continue
+
+                stack.append((node, children))
+                stack.extend((value, None) for value in reversed(children[1]))
+                continue
+
+            keys, values = children
+            if values:
+                values = results[-len(values) :]
+                del results[-len(values) :]
+            new_model = _rebuild(self, node, keys, values)
+
+            if isinstance(node, VisitableBaseModel):
+                new_model = node.__class__(**new_model)
+            results.append(new_model)
+
+        return results[0]
+
+
+class In(_In):
+    """
+    In order tree traversal with an explicit stack, equivalent to In of oqd_compiler_infrastructure,
+    such that arbitrarily deep trees are walked without reaching the recursion limit.
+    """
+
+    def walk(self, model):
+        # a node is either visited or passed to the rule, the rule is applied to each node
+        # after all of its children but the last
+        stack = [(model, False)]
+        while stack:
+            node, apply = stack.pop()
+            if apply:
+                self.rule(node)
+                continue
+
+            children = _children(self, node)
+            if children is None:
+                self.rule(node)
+                continue
+
+            values = children[1]
+            if values:
+                stack.append((values[-1], False))
+            stack.append((node, True))
+            stack.extend((value, False) for value in reversed(values[:-1]))
+
+        return model
@@ -14,11 +14,10 @@
 
 from __future__ import annotations
 
-from typing import Union
-
-from oqd_compiler_infrastructure import TypeReflectBaseModel
+from typing import ClassVar, Union
 
 ########################################################################################
+from oqd_core.interface.base import TrustedBaseModel
 from oqd_core.interface.math import (
     MathExpr,
     MathExprSubtypes,
@@ -56,7 +55,7 @@ __all__ = [
 ########################################################################################
 
 
-class Operator(TypeReflectBaseModel):
+class Operator(TrustedBaseModel):
     """
     Class representing the abstract syntax tree (AST) for a quantum operator
     """
@@ -221,6 +220,8 @@ class OperatorScalarMul(Operator):
         expr (MathExpr): [`MathExpr`][oqd_core.interface.math.MathExpr] to multiply by
     """
 
+    _trusted_fields: ClassVar[dict] = dict(op=Operator, expr=MathExpr)
+
     op: OperatorSubtypes
     expr: MathExprSubtypes
 
@@ -230,7 +231,7 @@ class OperatorBinaryOp(Operator):
     Class representing binary operations on [`Operators`][oqd_core.interface.analog.operator.Operator]
     """
 
-    pass
+    _trusted_fields: ClassVar[dict] = dict(op1=Operator, op2=Operator)
 
 
 class OperatorAdd(OperatorBinaryOp):
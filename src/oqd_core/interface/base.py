@@ -0,0 +1,97 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import ClassVar
+
+from oqd_compiler_infrastructure import TypeReflectBaseModel
+
+########################################################################################
+
+__all__ = [
+    "TrustedBaseModel",
+    "trusted_construction",
+]
+
+########################################################################################
+
+_trusted = ContextVar("trusted_construction", default=False)
+
+
+@contextmanager
+def trusted_construction():
+    """
+    Context manager under which [`TrustedBaseModel`][oqd_core.interface.base.TrustedBaseModel] objects are
+    constructed without validation, whenever all of their fields are given as already valid values. Terminal
+    values such as names are still checked against their constraints.
+
+    This is meant for compiler passes, which rebuild nodes from children that are already valid nodes.
+    User-facing construction outside of the context manager keeps validating.
+
+    Examples:
+        >>> with trusted_construction():
+        ...     model = analog_operator_canonicalization(hamiltonian)
+
+    """
+    token = _trusted.set(True)
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
+
+
+class TrustedBaseModel(TypeReflectBaseModel):
+    """
+    Class representing a datastruct with type reflection that supports trusted construction, see
+    [`trusted_construction`][oqd_core.interface.base.trusted_construction].
+
+    Attributes:
+        _trusted_fields (dict[str, type]): Types for which the value of each field is used without
+            validation during trusted construction
+        _trusted_checks (dict[str, Callable]): Checks of the constraints of terminal values, e.g. names and literals,
+            which the value of a field must pass to be used without validation during trusted construction
+    """
+
+    _trusted_fields: ClassVar[dict] = {}
+    _trusted_checks: ClassVar[dict] = {}
+
+    def __init__(self, /, **data):
+        if _trusted.get():
+            for key, value in data.items():
+                if not isinstance(value, self._trusted_fields.get(key, ())):
+                    break
+                check = self._trusted_checks.get(key)
+                if check is not None and not check(value):
+                    break
+            else:
+                fields = {"class_": self.__class__.__name__}
+                fields.update(data)
+                if len(fields) == len(self.__class__.__pydantic_fields__):
+                    object.__setattr__(self, "__dict__", fields)
+                    object.__setattr__(self, "__pydantic_fields_set__", set(fields))
+                    object.__setattr__(self, "__pydantic_extra__", None)
+                    object.__setattr__(self, "__pydantic_private__", None)
+                    return
+
+        super().__init__(**data)
+
+    @classmethod
+    def construct_trusted(cls, **data):
+        """
+        Constructs the model without validation, assuming all fields are given and valid.
+        """
+        fields = {"class_": cls.__name__}
+        fields.update(data)
+        return cls.model_construct(**fields)
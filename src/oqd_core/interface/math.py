@@ -15,12 +15,16 @@
 from __future__ import annotations
 
 import ast
-from typing import Annotated, Any, Literal, Union
+import functools
+from typing import Annotated, Any, ClassVar, Literal, Union, get_args
 
 import numpy as np
-from oqd_compiler_infrastructure import ConversionRule, TypeReflectBaseModel
+from oqd_compiler_infrastructure import ConversionRule
 from pydantic import AfterValidator, BeforeValidator
 
+########################################################################################
+from oqd_core.interface.base import TrustedBaseModel
+
 ########################################################################################
 
 __all__ = [
@@ -44,7 +48,7 @@ __all__ = [
 ########################################################################################
 
 
-class MathExpr(TypeReflectBaseModel):
+class MathExpr(TrustedBaseModel):
     """
     Class representing the abstract syntax tree (AST) for a mathematical expression
     """
@@ -192,8 +196,33 @@ class AST_to_MathExpr(ConversionRule):
         raise TypeError
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_math_str(string):
+    # imported on use, the compiler depends on the interface
+    from oqd_core.compiler.math.passes import intern_math_expr
+
+    return intern_math_expr(AST_to_MathExpr()(ast.parse(string)))
+
+
 def MathStr(*, string):
-    return AST_to_MathExpr()(ast.parse(string))
+    """
+    Parses a string into a [`MathExpr`][oqd_core.interface.math.MathExpr].
+
+    Parsed expressions are kept in a bounded, thread-safe LRU cache keyed by the string, such that repeated
+    strings are parsed once. Each call returns the cached [`MathExpr`][oqd_core.interface.math.MathExpr], whose
+    structurally equal subexpressions are interned, see [`InternMathExpr`][oqd_core.compiler.math.rules.InternMathExpr].
+    Parsed expressions are shared and must not be mutated. Use `MathStr.cache_info()` for the hit/miss counters and
+    `MathStr.cache_clear()` to clear the cache.
+
+    Examples:
+        >>> MathStr(string="2 * cos(t)")
+
+    """
+    return _parse_math_str(string)
+
+
+MathStr.cache_info = _parse_math_str.cache_info
+MathStr.cache_clear = _parse_math_str.cache_clear
 
 
 ########################################################################################
@@ -216,6 +245,9 @@ class MathVar(MathTerminal):
 
     """
 
+    _trusted_fields: ClassVar[dict] = dict(name=str)
+    _trusted_checks: ClassVar[dict] = dict(name=str.isidentifier)
+
     name: VarName
 
 
@@ -224,6 +256,8 @@ class MathNum(MathTerminal):
     Class representing a number in a [`MathExpr`][oqd_core.interface.math.MathExpr]
     """
 
+    _trusted_fields: ClassVar[dict] = dict(value=(int, float))
+
     value: Union[int, float]
 
 
@@ -252,6 +286,11 @@ class MathFunc(MathUnaryOp):
         expr (MathExpr): Argument of the named function
     """
 
+    _trusted_fields: ClassVar[dict] = dict(func=str, expr=MathExpr)
+    _trusted_checks: ClassVar[dict] = dict(
+        func=frozenset(get_args(Functions)).__contains__
+    )
+
     func: Functions
     expr: CastMathExpr
 
@@ -261,7 +300,7 @@ class MathBinaryOp(MathExpr):
     Class representing binary operations on [`MathExprs`][oqd_core.interface.math.MathExpr] abstract syntax tree (AST)
     """
 
-    pass
+    _trusted_fields: ClassVar[dict] = dict(expr1=MathExpr, expr2=MathExpr)
 
 
 class MathAdd(MathBinaryOp):
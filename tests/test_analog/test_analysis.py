@@ -15,6 +15,10 @@
 from oqd_compiler_infrastructure import In
 
 from oqd_core.compiler.analog.analysis import TermIndex
+from oqd_core.compiler.analog.passes.analysis import (
+    analysis_canonical_hamiltonian_dim,
+    analysis_term_index,
+)
 from oqd_core.interface.analog import (
     Annihilation,
     Creation,
@@ -97,3 +101,29 @@ def test_kron_add_complicated_with_scalar():
     op = C @ (C * LI * A * C) + 3 * (X @ X) + A * C * A + 3 * Y + 2 * Z + C + LI
     expected = [[(1, 1), (3, 2)], [1, 1], [(3, 1)], [2], [3], [(1, 1)], [(0, 0)]]
     assert compute_term_index(operator=op) == expected
+
+
+def test_term_index_cache():
+    """TermIndex is cached by the structure of the operator"""
+    analysis_term_index.cache_clear()
+
+    op = X @ Y @ (C * LI * A * C) + 3 * (X @ X) + (A * C * A) @ PI @ C
+    expected = compute_term_index(operator=op)
+    assert analysis_term_index(op) == expected
+    assert analysis_term_index.cache_info().misses == 1
+
+    # coefficients do not change the TermIndex
+    op = X @ Y @ (C * LI * A * C) + 5 * (X @ X) + (A * C * A) @ PI @ C
+    assert analysis_term_index(op) == expected
+    assert analysis_canonical_hamiltonian_dim(op) == (2, 1)
+    assert analysis_term_index.cache_info().hits == 2
+
+    # the cached result is not shared with the caller
+    analysis_term_index(op)[0].append(0)
+    assert analysis_term_index(op) == expected
+
+    assert analysis_term_index(X @ Y + Y @ X) == [[1, 2], [2, 1]]
+    assert analysis_term_index.cache_info().misses == 2
+
+    analysis_term_index.cache_clear()
+    assert analysis_term_index.cache_info().currsize == 0
@@ -12,31 +12,72 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
+
 import pytest
-from oqd_compiler_infrastructure import FixedPoint, Post, Pre, RewriteRule, WalkBase
+from oqd_compiler_infrastructure import (
+    Chain,
+    FixedPoint,
+    In,
+    Post,
+    Pre,
+    RewriteRule,
+    WalkBase,
+)
 
+from oqd_core.compiler.analog.passes.analysis import analysis_term_index
+from oqd_core.compiler.analog.passes.canonicalize import (
+    CanonicalizationCache,
+    analog_circuit_canonicalization,
+    analog_operator_canonicalization,
+    canonicalization_cache,
+    dist_chain,
+    math_chain,
+    normal_order_chain,
+    pauli_chain,
+    verify_canonicalization,
+)
 from oqd_core.compiler.analog.rewrite.canonicalize import (
+    FusedCanonicalization,
     GatherMathExpr,
     GatherPauli,
+    LadderNormalOrder,
     NormalOrder,
     OperatorDistribute,
     PauliAlgebra,
+    PauliStringCanonicalization,
     ProperOrder,
     PruneIdentity,
     ScaleTerms,
     SortedOrder,
+    SortTerms,
+)
+from oqd_core.compiler.analog.verify import (
+    CanVerCanonicalForm,
+    VerifyHilberSpaceDim,
+)
+from oqd_core.compiler.math.rules import EvaluateMathExpr
+from oqd_core.compiler.tracking import (
+    FixedPointInfo,
+    TrackedFixedPoint,
+    fixed_point_statistics,
 )
 from oqd_core.interface.analog import (
+    AnalogCircuit,
+    AnalogGate,
     Annihilation,
     Creation,
     Identity,
     Operator,
+    OperatorAdd,
+    OperatorScalarMul,
     PauliI,
     PauliX,
     PauliY,
     PauliZ,
 )
-from oqd_core.interface.math import MathStr
+from oqd_core.interface.base import trusted_construction
+from oqd_core.interface.math import MathNum, MathStr, MathVar
 
 X, Y, Z, PI, A, C, LI = (
     PauliX(),
@@ -188,6 +229,63 @@ def test_normal_order_inside_pauli(normal_order_rule):
     assert canonicalize_operator(operator=op, rule=normal_order_rule) == expected
 
 
+@pytest.fixture
+def ladder_normal_order_rule():
+    return LadderNormalOrder()
+
+
+def test_ladder_normal_order_simple(ladder_normal_order_rule):
+    """Simple test"""
+    op = (A * C) @ (A * C)
+    expected = (LI + C * A) @ (LI + C * A)
+    assert (
+        canonicalize_operator(
+            operator=op, rule=ladder_normal_order_rule, walk_method=Pre
+        )
+        == expected
+    )
+
+
+def test_ladder_normal_order_closed_form(ladder_normal_order_rule):
+    """Like terms are merged with the closed form coefficients"""
+    op = A * A * A * C * C * C
+    expected = 6 * LI + 18 * (C * A) + 9 * (C * C * A * A) + C * C * C * A * A * A
+    assert (
+        canonicalize_operator(
+            operator=op, rule=ladder_normal_order_rule, walk_method=Pre
+        )
+        == expected
+    )
+
+
+def test_ladder_normal_order_mixed(ladder_normal_order_rule):
+    """Identities are dropped and normal ordered products are unchanged"""
+    op = X @ (C * A * LI * C) + Y @ (C * C * A)
+    expected = X @ (C + C * C * A) + Y @ (C * C * A)
+    assert (
+        canonicalize_operator(
+            operator=op, rule=ladder_normal_order_rule, walk_method=Pre
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("n", [3, 4, 5])
+def test_ladder_normal_order_canonicalization(n):
+    """High powers of ladder operators are canonicalized"""
+    op = A
+    for _ in range(n - 1):
+        op = op * A
+    for _ in range(n):
+        op = op * C
+
+    terms = canonical_terms(analog_operator_canonicalization(X @ op))
+    assert terms == [
+        ([1, (2 * (n - k), n - k)], math.comb(n, k) ** 2 * math.factorial(k))
+        for k in range(n, -1, -1)
+    ]
+
+
 @pytest.fixture
 def prune_identity_rule():
     return PruneIdentity()
@@ -233,6 +331,51 @@ def test_sorted_order_ladder(sorted_order_rule):
     assert canonicalize_operator(operator=op, rule=sorted_order_rule) == expected
 
 
+@pytest.fixture
+def sort_terms_rule():
+    return SortTerms()
+
+
+def test_sort_terms_simple(sort_terms_rule):
+    """Simple Test"""
+    op = X @ Y + X @ Z + PI @ Z
+    expected = PI @ Z + X @ Y + X @ Z
+    assert Pre(sort_terms_rule)(op) == expected
+
+
+def test_sort_terms_ladder(sort_terms_rule):
+    """Simple Test with ladder"""
+    op = X @ (C * A * A) + X @ (C * A)
+    expected = X @ (C * A) + X @ (C * A * A)
+    assert Pre(sort_terms_rule)(op) == expected
+
+
+def test_sort_terms_duplicates(sort_terms_rule):
+    """Duplicate terms are collected in their original order"""
+    op = 2 * (Z @ X) + X @ Y + 3 * (Z @ X) + PI @ Z + Z @ X
+    expected = (
+        PI @ Z
+        + X @ Y
+        + (MathStr(string="2") + MathStr(string="3") + MathStr(string="1")) * (Z @ X)
+    )
+    assert Pre(sort_terms_rule)(op) == expected
+
+
+def test_sort_terms_matches_sorted_order(sort_terms_rule, sorted_order_rule):
+    """Sorting in a single step agrees with the fixed point of SortedOrder"""
+    op = (
+        X @ (C * A)
+        + 2 * (PI @ LI)
+        + Z @ A
+        + MathStr(string="t") * (X @ (C * A))
+        + Y @ C
+        + PI @ LI
+    )
+    assert Pre(sort_terms_rule)(op) == canonicalize_operator(
+        operator=op, rule=sorted_order_rule
+    )
+
+
 @pytest.fixture
 def scale_terms_rule():
     return ScaleTerms()
@@ -273,3 +416,458 @@ def test_scale_terms_terminals(scale_terms_rule):
         canonicalize_operator(operator=op, rule=scale_terms_rule, walk_method=Pre)
         == expected
     )
+
+
+########################################################################################
+
+
+def canonicalize_with_rules(model):
+    return Chain(
+        FixedPoint(dist_chain),
+        FixedPoint(Post(ProperOrder())),
+        FixedPoint(pauli_chain),
+        FixedPoint(Post(GatherPauli())),
+        In(VerifyHilberSpaceDim(), reverse=True),
+        FixedPoint(normal_order_chain),
+        FixedPoint(Post(PruneIdentity())),
+        FixedPoint(
+            Chain(FixedPoint(Pre(ScaleTerms())), FixedPoint(Post(GatherMathExpr())))
+        ),
+        FixedPoint(Post(SortedOrder())),
+        math_chain,
+        verify_canonicalization,
+    )(model)
+
+
+def canonical_terms(operator: Operator):
+    terms = []
+    while isinstance(operator, OperatorAdd):
+        terms.append(operator.op2)
+        operator = operator.op1
+    terms.append(operator)
+    terms = [
+        term if isinstance(term, OperatorScalarMul) else 1 * term for term in terms
+    ]
+
+    return [
+        (
+            analysis_term_index(term.op)[0],
+            complex(Post(EvaluateMathExpr(variables={"t": 0.3}))(term.expr)),
+        )
+        for term in reversed(terms)
+    ]
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        X,
+        X @ (Y + Z) + 2 * (X @ Y),
+        (X + Y) * (Y + Z),
+        X * Y * Z,
+        (X @ Y) * (Y @ X) - PI @ PI,
+        MathVar(name="t") * (X @ Z) - 1j * ((Z @ X) * (Y @ PI)),
+        (Y @ (X + 2j * Z)) * (Z @ Y) + MathStr(string="sin(t)") * (Z @ X),
+    ],
+)
+def test_pauli_string_canonicalization(op):
+    """Pauli string canonicalization agrees with the canonicalization rules"""
+    canonical = PauliStringCanonicalization(math_pass=math_chain).canonicalize(op)
+    verify_canonicalization(canonical)
+
+    expected = canonical_terms(canonicalize_with_rules(op))
+    terms = canonical_terms(canonical)
+    assert [term for term, _ in terms] == [term for term, _ in expected]
+    assert [coefficient for _, coefficient in terms] == pytest.approx(
+        [coefficient for _, coefficient in expected]
+    )
+
+
+def test_pauli_string_canonicalization_fallback():
+    """Operators with ladders are left to the canonicalization rules"""
+    gate = AnalogGate(hamiltonian=X @ A + Y @ C)
+
+    rule = PauliStringCanonicalization()
+    assert Pre(rule)(gate) == gate
+    assert rule.fallback
+
+    assert analog_operator_canonicalization(gate) == canonicalize_with_rules(gate)
+
+
+def test_pauli_string_canonicalization_ising():
+    """Large Ising Hamiltonians are canonicalized without the canonicalization rules"""
+    n = 40
+    op = None
+    for k in range(2000):
+        i, j = k % n, (k % n + k // n % (n - 1) + 1) % n
+        string = [PI] * n
+        string[i], string[j] = Z, Z
+        term = string[0]
+        for pauli in string[1:]:
+            term = term @ pauli
+        term = 0.5 * term
+        op = term if op is None else op + term
+
+    canonical = analog_operator_canonicalization(op, cache=None)
+
+    n_terms = 1
+    while isinstance(canonical, OperatorAdd):
+        assert isinstance(canonical.op2, OperatorScalarMul)
+        n_terms += 1
+        canonical = canonical.op1
+    assert n_terms == len(
+        {frozenset((k % n, (k % n + k // n % (n - 1) + 1) % n)) for k in range(2000)}
+    )
+
+
+def test_pauli_string_canonicalization_verified(monkeypatch):
+    """Results of the Pauli string canonicalization are verified"""
+    verified = []
+    verify_map = CanVerCanonicalForm.map
+
+    def spy(self, model):
+        verified.append(model)
+        return verify_map(self, model)
+
+    monkeypatch.setattr(CanVerCanonicalForm, "map", spy)
+    canonical = analog_operator_canonicalization(X @ (Y + Z), cache=None)
+
+    assert verified == [canonical]
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        A * C,
+        X @ (A * C) + 2 * (Z @ (C * A)),
+        (A + C) * (A + C) * (A + C),
+        (X @ A) * (Y @ C) - 1j * (Z @ (A * A * C)),
+        (A @ X @ C) * (C @ (Y + Z) @ A) + MathStr(string="sin(t)") * (LI @ PI @ C),
+        (X @ (A * LI)) * (X @ (C * C)) + MathVar(name="t") * (Y @ LI),
+    ],
+)
+def test_fused_canonicalization(op):
+    """Fused canonicalization agrees with the canonicalization rules"""
+    canonical = analog_operator_canonicalization(op, cache=None, engine="fused")
+    verify_canonicalization(canonical)
+
+    expected = canonical_terms(canonicalize_with_rules(op))
+    terms = canonical_terms(canonical)
+    assert [term for term, _ in terms] == [term for term, _ in expected]
+    assert [coefficient for _, coefficient in terms] == pytest.approx(
+        [coefficient for _, coefficient in expected]
+    )
+
+
+def test_fused_canonicalization_fallback():
+    """Operators acting on inconsistent Hilbert spaces are left to the canonicalization rules"""
+    op = X @ A + A @ X
+
+    assert FusedCanonicalization().canonicalize(op) is None
+    assert analog_operator_canonicalization(
+        op, cache=None, engine="fused"
+    ) == analog_operator_canonicalization(op, cache=None)
+
+    with pytest.raises(ValueError):
+        analog_operator_canonicalization(op, engine="unknown")
+
+
+def test_fused_canonicalization_large():
+    """Hamiltonians with ladders are canonicalized in a single traversal"""
+    n = 6
+    op = None
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            string = [PI] * n
+            string[i], string[j] = X, Z
+            term = string[0]
+            for pauli in string[1:]:
+                term = term @ pauli
+            term = (i + j) * (term @ (C * A + A * C))
+            op = term if op is None else op + term
+
+    canonical = analog_operator_canonicalization(op, cache=None, engine="fused")
+
+    verify_canonicalization(canonical)
+    assert canonical_terms(canonical) == canonical_terms(
+        analog_operator_canonicalization(op, cache=None)
+    )
+
+
+def test_fused_canonicalization_verified(monkeypatch):
+    """Results of the fused canonicalization are verified before they are cached"""
+    verified = []
+    verify_map = CanVerCanonicalForm.map
+
+    def spy(self, model):
+        verified.append(model)
+        return verify_map(self, model)
+
+    monkeypatch.setattr(CanVerCanonicalForm, "map", spy)
+    cache = CanonicalizationCache()
+    canonical = analog_operator_canonicalization(
+        X @ (A * C) + Y @ (C * C), cache=cache, engine="fused"
+    )
+
+    assert verified == [canonical]
+    assert cache.cache_info().misses == 1
+
+
+def test_canonicalization_cache_circuit():
+    """Repeated gates of a circuit are canonicalized once"""
+    hamiltonians = [X @ (A * C) + 2 * (Z @ (C * A)), Y @ (A * A * C) + X @ C]
+    circuit = AnalogCircuit()
+    for i in range(10):
+        circuit.evolve(duration=1 + i, gate=AnalogGate(hamiltonian=hamiltonians[i % 2]))
+
+    cache = CanonicalizationCache(maxsize=8)
+    canonical = analog_operator_canonicalization(circuit, cache=cache)
+
+    assert canonical == analog_operator_canonicalization(circuit, cache=None)
+    assert cache.cache_info() == (8, 2, 8, 2)
+
+    # coefficients are part of the key
+    analog_operator_canonicalization(3 * (X @ (A * C)) + 2 * (Z @ (C * A)), cache=cache)
+    assert cache.cache_info().misses == 3
+
+
+def test_canonicalization_cache_maxsize():
+    """Least recently used operators are evicted"""
+    cache = CanonicalizationCache(maxsize=2)
+    for op in [X, Y, Z, X]:
+        analog_operator_canonicalization(op, cache=cache)
+
+    assert cache.cache_info() == (0, 4, 2, 2)
+
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_canonicalization_cache_maxnodes():
+    """Least recently used operators are evicted once the cache holds too many nodes"""
+    nodes = len(CanonicalizationCache.key(X)) + len(
+        CanonicalizationCache.key(analog_operator_canonicalization(X))
+    )
+
+    cache = CanonicalizationCache(maxnodes=2 * nodes)
+    for op in [X, Y, Z]:
+        analog_operator_canonicalization(op, cache=cache)
+    assert cache.cache_info() == (0, 3, 1024, 2)
+
+    # operators larger than the bound are not held
+    cache = CanonicalizationCache(maxnodes=1)
+    analog_operator_canonicalization(X, cache=cache)
+    assert cache.cache_info().currsize == 0
+
+
+def test_canonicalization_cache_opt_in():
+    """Operators are only cached in caches passed explicitly"""
+    circuit = AnalogCircuit()
+    circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=X))
+
+    canonicalization_cache.cache_clear()
+    analog_operator_canonicalization(X @ (Y + Z))
+    analog_circuit_canonicalization(circuit, max_workers=1)
+    assert canonicalization_cache.cache_info() == (0, 0, 1024, 0)
+
+    analog_operator_canonicalization(X @ (Y + Z), cache=canonicalization_cache)
+    assert canonicalization_cache.cache_info().misses == 1
+    canonicalization_cache.cache_clear()
+
+
+def test_canonicalization_cache_persistence(tmp_path):
+    """Canonicalized operators are reused across caches through the disk"""
+    op = X @ (A * A * C) + MathStr(string="sin(t)") * (Y @ C)
+
+    cache = CanonicalizationCache(path=tmp_path)
+    canonical = analog_operator_canonicalization(op, cache=cache)
+    assert cache.cache_info().misses == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    cache = CanonicalizationCache(path=tmp_path)
+    assert analog_operator_canonicalization(op, cache=cache) == canonical
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().misses == 0
+
+
+def test_canonicalization_cache_terminal_types():
+    """Terminals of equal values but different types have different keys"""
+    # booleans are only kept by trusted construction, validation converts them to integers
+    with trusted_construction():
+        keys = {
+            CanonicalizationCache.key(MathNum(value=value) * X)
+            for value in [1, 1.0, True]
+        }
+    assert len(keys) == 3
+
+
+def test_canonicalization_cache_copies():
+    """Mutating a canonicalized operator does not alter the cache"""
+    op = X @ (A * C) + 2 * (Z @ (C * A))
+    cache = CanonicalizationCache()
+
+    canonical = analog_operator_canonicalization(op, cache=cache)
+    expected = canonical.model_copy(deep=True)
+    canonical.op2.expr = MathNum(value=5)
+
+    assert analog_operator_canonicalization(op, cache=cache) == expected
+    assert cache.cache_info().hits == 1
+
+    circuit = AnalogCircuit()
+    for _ in range(2):
+        circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=op))
+    canonical = analog_circuit_canonicalization(circuit, max_workers=1, cache=cache)
+    gates = [instruction.gate.hamiltonian for instruction in canonical.sequence]
+    assert gates[0] == gates[1] and gates[0] is not gates[1]
+
+
+@pytest.mark.parametrize("cache", [None, CanonicalizationCache()])
+def test_canonicalization_multiple_gates_scaled(cache):
+    """Operators of the gates of a circuit are scaled independently of the previous gates"""
+    circuit = AnalogCircuit()
+    circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=X @ A + Y @ C))
+    circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=Z @ (C * A)))
+
+    for canonical in [
+        analog_operator_canonicalization(circuit, cache=cache),
+        analog_circuit_canonicalization(circuit, max_workers=1, cache=cache),
+    ]:
+        gates = [instruction.gate.hamiltonian for instruction in canonical.sequence]
+        assert gates[1] == 1 * (Z @ (C * A))
+        verify_canonicalization(gates[0])
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("engine", ["chain", "fused"])
+def test_circuit_canonicalization(max_workers, engine):
+    """Gates canonicalized across processes are reassembled in order"""
+    hamiltonians = [
+        X @ (A * C) + 2 * (Z @ (C * A)),
+        MathStr(string="sin(t)") * (Y @ (A * A * C)) + X @ C,
+        (X + Y) @ ((A + C) * (A + C)),
+    ]
+    circuit = AnalogCircuit()
+    for i in range(7):
+        circuit.evolve(duration=1 + i, gate=AnalogGate(hamiltonian=hamiltonians[i % 3]))
+
+    cache = CanonicalizationCache()
+    canonical = analog_circuit_canonicalization(
+        circuit, max_workers=max_workers, cache=cache, engine=engine
+    )
+
+    assert canonical == analog_operator_canonicalization(
+        circuit, cache=None, engine=engine
+    )
+    assert cache.cache_info().misses == 3
+
+    assert (
+        analog_circuit_canonicalization(
+            circuit, max_workers=max_workers, cache=cache, engine=engine
+        )
+        == canonical
+    )
+    assert cache.cache_info().hits == 3
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [OperatorDistribute, GatherMathExpr, ProperOrder, PauliAlgebra, PruneIdentity],
+)
+def test_tracked_fixed_point(rule):
+    """Tracked fixed points converge to the same operator as fixed points"""
+    op = (2 * X + Y * Z) @ (X @ (Y @ (3 * PI))) + (A * LI) @ (Z * (X + Y))
+
+    assert TrackedFixedPoint(Post(rule()))(op) == FixedPoint(Post(rule()))(op)
+
+
+def test_tracked_fixed_point_unchanged():
+    """Rules report no change on operators they leave unchanged"""
+    op = ((X @ Y) @ Z) + (X @ Y) @ PI
+
+    rule = ProperOrder()
+    stage = TrackedFixedPoint(Post(rule))
+    assert stage(op) == op
+    assert rule.changes == 0
+    assert (stage.calls, stage.iterations) == (1, 1)
+
+    stage(X @ (Y @ (Z @ PI)))
+    assert rule.changes == 3
+    assert (stage.calls, stage.iterations) == (2, 4)
+
+
+def test_canonicalization_statistics():
+    """Iterations of each stage are accumulated across canonicalized operators"""
+    op = X @ (A * C) + 2 * (Z @ (C * A))
+
+    statistics = {}
+    analog_operator_canonicalization(op, cache=None, statistics=statistics)
+    assert statistics["distribute"].calls == 1
+    assert statistics["normal_order.LadderNormalOrder"].calls >= 1
+
+    single = dict(statistics)
+    analog_operator_canonicalization(op, cache=None, statistics=statistics)
+    assert statistics == {
+        stage: FixedPointInfo(2 * info.calls, 2 * info.iterations)
+        for stage, info in single.items()
+    }
+
+    chain = Chain(TrackedFixedPoint(dist_chain, name="distribute"))
+    chain(op)
+    assert set(fixed_point_statistics(chain, reset=True)) == {
+        "distribute",
+        "distribute.OperatorDistribute",
+        "distribute.GatherMathExpr",
+    }
+    assert fixed_point_statistics(chain)["distribute"] == (0, 0)
+
+
+@pytest.mark.parametrize("verification", ["sampled", "off"])
+def test_canonicalization_verification_level(verification):
+    """Verification levels do not change the canonicalized operator"""
+    op = X @ (A * C) + 2 * (Z @ (C * A)) + Y @ ((A + C) * C)
+
+    assert analog_operator_canonicalization(
+        op, cache=None, verification=verification
+    ) == analog_operator_canonicalization(op, cache=None)
+
+    with pytest.raises(ValueError):
+        analog_operator_canonicalization(op, cache=None, verification="partial")
+
+
+def test_canonicalization_cache_verification_level(monkeypatch):
+    """Operators canonicalized with a lower verification level are verified again at the full level"""
+    op = X @ (A * C) + 2 * (Z @ (C * A))
+    cache = CanonicalizationCache()
+    circuit = AnalogCircuit()
+    circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=op))
+
+    analog_operator_canonicalization(op, cache=cache, verification="off")
+    analog_circuit_canonicalization(
+        circuit, max_workers=1, cache=cache, verification="off"
+    )
+    assert cache.cache_info().misses == 1
+
+    verified = []
+    verify_map = CanVerCanonicalForm.map
+
+    def spy(self, model):
+        if self.level == "full":
+            verified.append(model)
+        return verify_map(self, model)
+
+    monkeypatch.setattr(CanVerCanonicalForm, "map", spy)
+    analog_operator_canonicalization(op, cache=cache)
+    analog_circuit_canonicalization(circuit, max_workers=1, cache=cache)
+
+    assert len(verified) == 1
+    assert cache.cache_info().misses == 2
+
+
+def test_canonicalization_single_term_scaled():
+    """Single terms are scaled regardless of previously canonicalized operators"""
+    analog_operator_canonicalization(X @ A + X @ C, cache=None)
+
+    canonical = analog_operator_canonicalization(C * A, cache=None)
+    assert isinstance(canonical, OperatorScalarMul)
@@ -15,10 +15,11 @@
 
 # %%
 import pytest
-from oqd_compiler_infrastructure import Post, Pre, RewriteRule, WalkBase
+from oqd_compiler_infrastructure import Chain, Post, Pre, RewriteRule, WalkBase
 
 from oqd_core.compiler.analog.error import CanonicalFormError
 from oqd_core.compiler.analog.verify.canonicalize import (
+    CanVerCanonicalForm,
     CanVerGatherMathExpr,
     CanVerGatherPauli,
     CanVerNormalOrder,
@@ -36,6 +37,7 @@ from oqd_core.interface.analog import (
     Creation,
     Identity,
     Operator,
+    OperatorAdd,
     PauliI,
     PauliX,
     PauliY,
@@ -699,3 +701,66 @@ class TestCanonicalizationVerificationScaleTerms(CanonicalFormErrors):
         self.assert_canonical_form_error_raised(
             operator=op, rule=self.rule, walk_method=self.walk_method
         )
+
+
+class TestCanonicalizationVerificationCanonicalForm:
+    @staticmethod
+    def error(rule, operator):
+        try:
+            rule(operator)
+        except CanonicalFormError as e:
+            return str(e)
+        return None
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            1 * (X @ Y) + 2 * (Y @ PI),
+            X @ (Y + Z),
+            X @ (1 * Z),
+            X @ (Y @ Z),
+            2 * (X @ (Y * Z)),
+            2 * (X @ A @ Y),
+            2 * (X @ (A * LI)),
+            2 * (X @ (A * C)),
+            2 * (Y @ PI) + 1 * (X @ Y),
+            2 * (X @ Z) + (Y @ PI) + 2 * (Z @ Z),
+            (X @ Y + (2 * (3j) * (X @ Y))) + (Y @ PI) + (Z @ PI),
+            X @ (A * C) + 2 * (Y * Z) @ (Y @ (Z @ X)),
+        ],
+    )
+    def test_equivalence(self, op):
+        """Single traversal reports the error of the chain of verification rules"""
+        chain = Chain(
+            Post(CanVerOperatorDistribute()),
+            Post(CanVerGatherMathExpr()),
+            Post(CanVerProperOrder()),
+            Post(CanVerPauliAlgebra()),
+            Post(CanVerGatherPauli()),
+            Post(CanVerNormalOrder()),
+            Post(CanVerPruneIdentity()),
+            Post(CanVerSortedOrder()),
+            Pre(CanVerScaleTerm()),
+        )
+        assert self.error(CanVerCanonicalForm(), op) == self.error(chain, op)
+
+    def test_sampled(self):
+        """Sampled verification checks every addition and a sample of the terms"""
+        paulis = [PI, X, Y, Z]
+        terms = [1 * (paulis[k // 4] @ paulis[k % 4]) for k in range(16)]
+        op = terms[0]
+        for term in terms[1:]:
+            op = OperatorAdd(op1=op, op2=term)
+
+        CanVerCanonicalForm(level="sampled", samples=4)(op)
+
+        unscaled = OperatorAdd(op1=op.op1, op2=op.op2.op)
+        assert (
+            self.error(CanVerCanonicalForm(level="sampled", samples=4), unscaled)
+            == "some operators between addition are not scaled properly"
+        )
+        assert CanVerCanonicalForm(level="off")(unscaled) == unscaled
+
+    def test_unknown_level(self):
+        with pytest.raises(ValueError):
+            CanVerCanonicalForm(level="partial")
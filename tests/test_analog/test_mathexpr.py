@@ -14,12 +14,31 @@
 
 from typing import Union
 
+import numpy as np
 import pytest
-from oqd_compiler_infrastructure import ConversionRule, Post, RewriteRule, WalkBase
+from oqd_compiler_infrastructure import ConversionRule, Post, Pre, RewriteRule, WalkBase
 
 ########################################################################################
-from oqd_core.compiler.math.rules import EvaluateMathExpr
-from oqd_core.interface.math import MathStr
+from oqd_core.compiler.analog.passes.canonicalize import math_chain
+from oqd_core.compiler.math.passes import (
+    compile_math_expr,
+    differentiate_math_expr,
+    eliminate_common_math_expr,
+    fold_math_expr,
+    intern_math_expr,
+    sweep_math_expr,
+    walk_math_dag,
+)
+from oqd_core.compiler.math.rules import (
+    CanonicalOrderMathExpr,
+    CompileMathExpr,
+    EvaluateMathExpr,
+    InternMathExpr,
+    PrintMathExpr,
+)
+from oqd_core.interface.analog.operation import AnalogCircuit, AnalogGate
+from oqd_core.interface.analog.operator import OperatorScalarMul, PauliX, PauliZ
+from oqd_core.interface.math import MathNum, MathStr
 
 ########################################################################################
 
@@ -51,3 +70,248 @@ def evaluate_math_expr(
 )
 def test_math_expressions(math_str, expected):
     assert pytest.approx(evaluate_math_expr(math_str), 0.001) == expected
+
+
+@pytest.mark.parametrize(
+    "math_str, expected",
+    [
+        ("3+5", 8),
+        ("3**2.01", 9.10),
+        ("sin(exp(2))", 0.894),
+        ("2*3 + 5*(1j)", 6 + 5j),
+        ("1+2*3 + 9 - 0.1 + 7*(2+3*5+(10/3))", 158.233),
+    ],
+)
+def test_compiled_constant_expressions(math_str, expected):
+    assert (
+        pytest.approx(
+            compile_math_expr(MathStr(string=math_str), variables=())(), 0.001
+        )
+        == expected
+    )
+
+
+def test_compiled_expression_vectorized():
+    t = np.linspace(0, 2, 11)
+    f = compile_math_expr(
+        MathStr(string="cos(w*t)*exp(-t/2) + 1j*heaviside(t-1) - atan(t)**2"),
+        variables=("w", "t"),
+    )
+    expected = (
+        np.cos(3 * t) * np.exp(-t / 2) + 1j * np.heaviside(t - 1, 1) - np.arctan(t) ** 2
+    )
+    assert np.allclose(f(3, t), expected)
+    assert np.isclose(f(3, t[4]), expected[4])
+
+
+def test_compiled_expression_unbound_variable():
+    with pytest.raises(TypeError):
+        compile_math_expr(MathStr(string="w*t"), variables=("t",))
+
+
+def test_sweep_expression_broadcast():
+    amplitude = np.linspace(0, 1, 3)[:, None]
+    t = np.linspace(0, 2, 5)
+    result = sweep_math_expr(
+        MathStr(string="a*sin(w*t) + 1j*a"), {"a": amplitude, "w": 2.0, "t": t}
+    )
+    assert result.shape == (3, 5)
+    assert np.allclose(result, amplitude * np.sin(2.0 * t) + 1j * amplitude)
+
+    # complex scalar bindings and complex subexpressions at scalar bindings
+    result = sweep_math_expr(
+        MathStr(string="a*sin(w*t) + cos(1j*t)"), {"a": 1 + 2j, "w": 2.0, "t": 0.5}
+    )
+    assert result.shape == ()
+    assert np.isclose(result, (1 + 2j) * np.sin(1.0) + np.cos(0.5j))
+
+
+def test_sweep_constant_expression():
+    result = sweep_math_expr(MathStr(string="2*3"), {"t": np.zeros(4)})
+    assert np.array_equal(result, np.full(4, 6))
+
+
+def test_sweep_expression_unbound_variable():
+    with pytest.raises(TypeError, match="Unbound variable 'w'"):
+        sweep_math_expr(MathStr(string="w*t"), {"t": np.zeros(4)})
+
+
+def test_intern_shares_equal_subexpressions():
+    expr = MathStr(string="cos(t)*cos(t) + 2*cos(t)")
+    interned = intern_math_expr(expr)
+    assert interned == expr
+    assert interned.expr1.expr1 is interned.expr1.expr2
+    assert interned.expr2.expr2 is interned.expr1.expr1
+
+
+def test_intern_across_walks():
+    rule = InternMathExpr()
+    expr1 = Post(rule)(MathStr(string="1 + sin(w*t)"))
+    expr2 = Post(rule)(MathStr(string="1 + sin(w*t)"))
+    expr3 = Post(rule)(MathStr(string="1.0 + sin(w*t)"))
+    assert expr1 is expr2
+    assert rule.structural_hash(expr1) == rule.structural_hash(expr2)
+    assert expr3 is not expr1 and expr3.expr2 is expr1.expr2
+
+
+@pytest.mark.parametrize(
+    ("math_str", "expected"),
+    [
+        ("c + (b*(2*a) + 3)", "(c + ((2 * b) * a)) + 3"),
+        ("t*2 + 1j", "((2 * t) + 0.0) + (1j * 1.0)"),
+        ("1j*3 + (1 + t*2)", "(((0.0 * 3) + 1) + (2 * t)) + ((1j * 1.0) * 3)"),
+        ("a*(b*(1j*2))", "(((0.0 * 2) * a) * b) + ((((1j * 1.0) * 2) * a) * b)"),
+    ],
+)
+def test_canonical_order(math_str, expected):
+    ordered = math_chain(MathStr(string=math_str))
+    assert Post(PrintMathExpr(verbose=True))(ordered) == expected
+    assert Pre(CanonicalOrderMathExpr())(ordered) == ordered
+
+
+def test_canonical_order_preserves_value():
+    expr = MathStr(string="1j*sin(t)*3 + t**2*2 + 1j + cos(t)")
+    ordered = Pre(CanonicalOrderMathExpr())(expr)
+    assert np.isclose(
+        Post(EvaluateMathExpr(variables={"t": 0.3}))(ordered),
+        Post(EvaluateMathExpr(variables={"t": 0.3}))(expr),
+    )
+
+
+@pytest.mark.parametrize(
+    ("math_str", "expected"),
+    [
+        ("1j * 1 * -1 * 2", "1j * -2.0"),
+        ("t * t / 2 + t**2 - 3 * 1j * 1j", "(1.5 * (t ** 2)) + 3.0"),
+        ("(1 + t)**2 - (t + 1)**2", "0"),
+        ("x**0.5 * x**0.5 * 1**y", "x"),
+        ("2 * (t + 1)**2 / (t + 1)", "2 * (t + 1)"),
+        ("cos(t) / cos(t) + sin(0)", "1"),
+        ("(1 + 1j) * (1 - 1j) * t", "2.0 * t"),
+    ],
+)
+def test_fold_math_expr(math_str, expected):
+    expr = MathStr(string=math_str)
+    folded = fold_math_expr(expr)
+    assert Post(PrintMathExpr(verbose=True))(folded) == expected
+
+    variables = {"t": 0.3, "x": 1.7, "y": 0.2}
+    assert np.isclose(
+        Post(EvaluateMathExpr(variables=variables))(folded),
+        Post(EvaluateMathExpr(variables=variables))(expr),
+    )
+
+
+def test_fold_math_expr_inside_operator():
+    op = (MathStr(string="1j * 1j * t") + MathStr(string="t")) * PauliX()
+    folded = fold_math_expr(op)
+    assert isinstance(folded, OperatorScalarMul)
+    assert folded.expr == MathNum(value=0)
+
+
+def test_math_str_cache():
+    MathStr.cache_clear()
+
+    expr1 = MathStr(string="2 * cos(w * t)")
+    expr2 = MathStr(string="2 * cos(w * t)")
+    expr3 = MathStr(string="2 * cos(w*t)")
+
+    # repeated strings share the cached expression
+    assert expr1 is expr2
+    assert expr3 == expr1 and expr3 is not expr1
+
+    info = MathStr.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+    # equal subexpressions of a parsed expression are interned
+    expr = MathStr(string="cos(t) * cos(t)")
+    assert expr.expr1 is expr.expr2
+
+    MathStr.cache_clear()
+    assert MathStr.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        "sin",
+        "cos",
+        "tan",
+        "exp",
+        "log",
+        "sinh",
+        "cosh",
+        "tanh",
+        "atan",
+        "acos",
+        "asin",
+        "atanh",
+        "asinh",
+        "acosh",
+        "conj",
+    ],
+)
+def test_differentiate_math_expr(func):
+    argument = "1 + 0.3 * t**2" if func == "acosh" else "0.3 * t**2"
+    expr = MathStr(string=f"{func}({argument}) * t / (1 + t) + t**t + 2**t")
+    derivative = differentiate_math_expr(expr, "t")
+
+    f = compile_math_expr(expr)
+    t, h = 0.7, 1e-6
+    assert np.isclose(
+        compile_math_expr(derivative)(t), (f(t + h) - f(t - h)) / (2 * h), rtol=1e-5
+    )
+
+
+def test_differentiate_math_expr_shares_primal():
+    expr = MathStr(string="exp(w * t) * cos(w * t)")
+    derivative = differentiate_math_expr(expr, "w")
+    assert differentiate_math_expr(expr, "a") == MathNum(value=0)
+
+    rule = CompileMathExpr(variables=("w", "t"))
+    Post(rule)([expr, derivative])
+    assert sum("np.exp" in line for line in rule.lines) == 1
+    assert sum("np.cos" in line for line in rule.lines) == 1
+
+    w, t = 0.4, np.linspace(0, 1, 5)
+    value, gradient = compile_math_expr([expr, derivative], variables=("w", "t"))(w, t)
+    assert np.allclose(value, np.exp(w * t) * np.cos(w * t))
+    assert np.allclose(
+        gradient, t * np.exp(w * t) * np.cos(w * t) - t * np.exp(w * t) * np.sin(w * t)
+    )
+
+
+def test_eliminate_common_math_expr():
+    nodes, roots = eliminate_common_math_expr(
+        [MathStr(string="cos(t) * 2"), MathStr(string="cos(t) + 1")]
+    )
+    assert len(nodes) == 6 and roots == [3, 5]
+    assert nodes[3].expr1 is nodes[5].expr1
+
+    class CountingEvaluateMathExpr(EvaluateMathExpr):
+        calls = 0
+
+        def map_MathFunc(self, model, operands):
+            self.calls += 1
+            return super().map_MathFunc(model, operands)
+
+    rule = CountingEvaluateMathExpr(variables={"t": np.linspace(0, 1, 4)})
+    values = walk_math_dag(rule, nodes, roots)
+    assert rule.calls == 1
+    assert np.allclose(values[0], 2 * np.cos(np.linspace(0, 1, 4)))
+    assert walk_math_dag(PrintMathExpr(), nodes, roots) == ["cos(t) * 2", "cos(t) + 1"]
+
+
+def test_eliminate_common_math_expr_circuit():
+    coefficient = MathStr(string="cos(t)")
+    circuit = AnalogCircuit()
+    circuit.evolve(
+        duration=1,
+        gate=AnalogGate(
+            hamiltonian=coefficient * PauliX() + 2 * coefficient * PauliZ()
+        ),
+    )
+
+    nodes, roots = eliminate_common_math_expr(circuit)
+    assert len(roots) == 2
+    assert nodes[roots[1]].expr2 is nodes[roots[0]]
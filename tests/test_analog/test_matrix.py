@@ -0,0 +1,176 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import qutip as qt
+from scipy.sparse.linalg import expm_multiply
+
+from oqd_core.compiler.analog.matrix import OperatorMatrix, factor_matrix
+from oqd_core.compiler.analog.passes import (
+    analog_operator_canonicalization,
+    analog_operator_coefficient_grid,
+    analog_operator_linear_operator,
+    analog_operator_matrix,
+    analog_operator_term_matrices,
+)
+from oqd_core.compiler.walk import Post
+from oqd_core.interface.analog import (
+    Annihilation,
+    Creation,
+    Identity,
+    PauliI,
+    PauliX,
+    PauliY,
+    PauliZ,
+)
+from oqd_core.interface.math import MathStr, MathVar
+
+X, Y, Z, PI, A, C, LI = (
+    PauliX(),
+    PauliY(),
+    PauliZ(),
+    PauliI(),
+    Annihilation(),
+    Creation(),
+    Identity(),
+)
+
+N = 4
+x, y, z, i, a, j = (
+    qt.sigmax(),
+    qt.sigmay(),
+    qt.sigmaz(),
+    qt.qeye(2),
+    qt.destroy(N),
+    qt.qeye(N),
+)
+
+
+@pytest.mark.parametrize(
+    "op, expected",
+    [
+        (X, x),
+        (X @ Y - 2 * (Z @ PI), qt.tensor(x, y) - 2 * qt.tensor(z, i)),
+        (X @ (Y + Z) @ (A * C), qt.tensor(x, y + z, a * a.dag())),
+        ((C * A * LI) @ X, qt.tensor(a.dag() * a, x)),
+        (1j * (Y @ (C * C)) + X @ A, 1j * qt.tensor(y, a.dag() ** 2) + qt.tensor(x, a)),
+    ],
+)
+def test_operator_matrix(op, expected):
+    """Operators are lowered to the matrices of their tensor products"""
+    matrix = Post(OperatorMatrix(fock_cutoff=N))(op)
+
+    np.testing.assert_allclose(matrix.toarray(), expected.full())
+
+
+def test_analog_operator_matrix():
+    """Canonical operators are lowered term by term with evaluated coefficients"""
+    op = X @ (Y + Z) @ (C * A) + MathStr(string="sin(t)") * (Z @ X @ (C * C))
+    canonical = analog_operator_canonicalization(op, cache=None)
+
+    expected = qt.tensor(x, y + z, a.dag() * a) + np.sin(0.3) * qt.tensor(
+        z, x, a.dag() ** 2
+    )
+
+    matrix = analog_operator_matrix(canonical, N, variables={"t": 0.3})
+    np.testing.assert_allclose(matrix.toarray(), expected.full())
+
+    qobj = analog_operator_matrix(canonical, N, variables={"t": 0.3}, qobj=True)
+    assert qobj.dims == [[2, 2, N], [2, 2, N]]
+    assert (qobj - expected).norm() == pytest.approx(0)
+
+    terms = analog_operator_term_matrices(canonical, N)
+    assert len(terms) == 3
+    assert terms[-1][0] == MathStr(string="sin(t)")
+
+    with pytest.raises(TypeError):
+        analog_operator_matrix(canonical, N)
+
+
+def test_analog_operator_coefficient_grid():
+    """Coefficients sampled on the time grid reproduce the matrices at the midpoints of the steps"""
+    op = X @ (C * A) + MathStr(string="w * sin(t)") * (Z @ (C * C)) + 1j * (Y @ A)
+    canonical = analog_operator_canonicalization(op, cache=None)
+
+    times, coefficients = analog_operator_coefficient_grid(
+        canonical, 1, 0.3, variables={"w": 2}
+    )
+    np.testing.assert_allclose(times, [0.125, 0.375, 0.625, 0.875])
+    assert coefficients.shape == (3, 4)
+
+    terms = analog_operator_term_matrices(canonical, N)
+    for step, t in enumerate(times):
+        matrix = sum(c * m for c, (_, m) in zip(coefficients[:, step], terms))
+        expected = analog_operator_matrix(canonical, N, variables={"t": t, "w": 2})
+        np.testing.assert_allclose(matrix.toarray(), expected.toarray())
+
+    with pytest.raises(TypeError):
+        analog_operator_coefficient_grid(canonical, 1, 0.3)
+
+
+def test_factor_matrix_cache():
+    """Single-site matrices are shared per Fock cutoff and read-only"""
+    assert factor_matrix(A, N) is factor_matrix(Annihilation(), N)
+    assert factor_matrix(A, N) is not factor_matrix(A, N + 1)
+    assert factor_matrix(X, N) is factor_matrix(X, N + 1)
+
+    with pytest.raises(ValueError):
+        factor_matrix(A, N).data[0] = 2
+
+    assert (
+        analog_operator_matrix(1 * X + MathVar(name="w") * Z, N, variables={"w": 0}).nnz
+        == 2
+    )
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        X @ Y + 2 * (Z @ Z) - 3j * (Y @ PI) + Y @ Y,
+        X @ (Y + Z) @ (C * A) + MathVar(name="t") * (Z @ X @ (C * C)),
+        X @ (A + C) @ (C * A * A) + Y @ (A * C) @ LI + Z @ LI @ A,
+    ],
+)
+def test_analog_operator_linear_operator(op):
+    """Matrix-free operators agree with the sparse matrices, their adjoints and the exponential"""
+    canonical = analog_operator_canonicalization(op, cache=None)
+    matrix = analog_operator_matrix(canonical, N, variables={"t": 0.3})
+    operator = analog_operator_linear_operator(canonical, N, variables={"t": 0.3})
+    assert operator.shape == matrix.shape
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(matrix.shape[0], 3)) + 1j * rng.normal(
+        size=(matrix.shape[0], 3)
+    )
+
+    np.testing.assert_allclose(operator @ vectors[:, 0], matrix @ vectors[:, 0])
+    np.testing.assert_allclose(operator @ vectors, matrix @ vectors)
+    np.testing.assert_allclose(operator.H @ vectors, matrix.conj().T @ vectors)
+
+    np.testing.assert_allclose(
+        expm_multiply(-0.5j * operator, vectors[:, 0], traceA=operator.trace()),
+        expm_multiply(-0.5j * matrix, vectors[:, 0]),
+    )
+    assert operator.trace() == pytest.approx(matrix.trace())
+
+    parts = operator.split(2)
+    np.testing.assert_allclose(sum(part @ vectors for part in parts), matrix @ vectors)
+
+    terms = analog_operator_term_matrices(canonical, N)
+    coefficients = rng.normal(size=len(terms))
+    np.testing.assert_allclose(
+        operator.with_coefficients(coefficients) @ vectors,
+        sum(c * m for c, (_, m) in zip(coefficients, terms)) @ vectors,
+    )
@@ -26,12 +26,15 @@ from oqd_core.interface.analog import (
     Creation,
     Identity,
     Operator,
+    OperatorAdd,
+    OperatorScalarMul,
     PauliI,
     PauliX,
     PauliY,
     PauliZ,
 )
-from oqd_core.interface.math import MathStr
+from oqd_core.interface.base import trusted_construction
+from oqd_core.interface.math import MathFunc, MathMul, MathNum, MathStr, MathVar
 
 ########################################################################################
 
@@ -264,3 +267,35 @@ class TestHilbertSpaceDimVerification:
             walk_method=self._walk_method,
             reverse=self._reverse,
         )
+
+
+class TestTrustedConstruction:
+    def test_trusted_equals_validated(self):
+        expr = MathStr(string="2 * cos(t)")
+        validated = OperatorAdd(op1=OperatorScalarMul(op=X, expr=expr), op2=A * C)
+
+        with trusted_construction():
+            trusted = OperatorAdd(op1=OperatorScalarMul(op=X, expr=expr), op2=A * C)
+
+        assert trusted == validated
+        assert trusted.model_dump_json() == validated.model_dump_json()
+        assert OperatorAdd.model_validate_json(trusted.model_dump_json()) == validated
+
+    def test_trusted_casts_and_validates_other_values(self):
+        with trusted_construction():
+            assert MathMul(expr1=2, expr2=MathNum(value=3)).expr1 == MathNum(value=2)
+
+            with pytest.raises(Exception):
+                OperatorScalarMul(op=MathNum(value=1), expr=MathNum(value=1))
+
+            assert isinstance(MathStr(string="t") * X, OperatorScalarMul)
+
+    def test_trusted_validates_terminal_values(self):
+        validated = MathFunc(func="sin", expr=MathVar(name="t"))
+        with trusted_construction():
+            assert MathFunc(func="sin", expr=MathVar(name="t")) == validated
+
+            with pytest.raises(Exception):
+                MathVar(name="1 bad")
+            with pytest.raises(Exception):
+                MathFunc(func="bogus", expr=MathNum(value=1))
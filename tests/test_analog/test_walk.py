@@ -0,0 +1,145 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+import oqd_compiler_infrastructure as infrastructure
+import pytest
+
+from oqd_core.compiler.analog.analysis import TermIndex
+from oqd_core.compiler.analog.passes import (
+    XXGateAnalyzer,
+    analog_operator_canonicalization,
+    analysis_canonical_hamiltonian_dim,
+)
+from oqd_core.compiler.analog.passes.canonicalize import verify_canonicalization
+from oqd_core.compiler.analog.rewrite.canonicalize import (
+    OperatorDistribute,
+    ProperOrder,
+)
+from oqd_core.compiler.analog.utils import PrintOperator
+from oqd_core.compiler.math.passes import print_math_expr
+from oqd_core.compiler.walk import In, Post, Pre
+from oqd_core.interface.analog import (
+    AnalogCircuit,
+    AnalogGate,
+    Annihilation,
+    Creation,
+    OperatorAdd,
+    OperatorKron,
+    OperatorScalarMul,
+    PauliI,
+    PauliX,
+    PauliY,
+    PauliZ,
+)
+from oqd_core.interface.base import trusted_construction
+from oqd_core.interface.math import MathAdd, MathNum, MathStr, MathVar
+
+X, Y, Z, PI, A, C = PauliX(), PauliY(), PauliZ(), PauliI(), Annihilation(), Creation()
+
+
+def deep_hamiltonian(n_terms, n_qubits=6):
+    """Left-deep sum of distinct Pauli strings, built without validation"""
+    paulis = [PI, X, Y, Z]
+    op = None
+    with trusted_construction():
+        for k in range(n_terms):
+            term = paulis[(k + 1) % 4]
+            for q in range(1, n_qubits):
+                term = OperatorKron(op1=term, op2=paulis[(k + 1) // 4**q % 4])
+            term = OperatorScalarMul(op=term, expr=MathNum(value=k % 3 + 1))
+            op = term if op is None else OperatorAdd(op1=op, op2=term)
+    return op
+
+
+def circuit():
+    circuit = AnalogCircuit()
+    circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=X @ (Y + Z) - 2 * (A * C)))
+    circuit.evolve(
+        duration=2,
+        gate=AnalogGate(hamiltonian=MathStr(string="sin(t)") * (Z @ (X @ Y))),
+    )
+    return circuit
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize(
+    "walk, rule",
+    [
+        ("Post", OperatorDistribute),
+        ("Post", ProperOrder),
+        ("Post", PrintOperator),
+        ("Pre", OperatorDistribute),
+        ("Pre", ProperOrder),
+    ],
+)
+def test_walk_equivalence(walk, rule, reverse):
+    """Iterative walks agree with the recursive walks"""
+    model = circuit()
+
+    expected = getattr(infrastructure, walk)(rule(), reverse=reverse)(model)
+    assert {"Post": Post, "Pre": Pre}[walk](rule(), reverse=reverse)(model) == expected
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_in_walk_equivalence(reverse):
+    """Iterative in order walks visit nodes in the order of the recursive walk"""
+    op = X @ (Y + Z) + 2 * (A * C) @ X
+
+    expected = TermIndex()
+    infrastructure.In(expected, reverse=reverse)(op)
+    rule = TermIndex()
+    In(rule, reverse=reverse)(op)
+    assert rule.term_idx == expected.term_idx
+
+
+def test_deep_hamiltonian():
+    """Hamiltonians deeper than the recursion limit go through the pipeline"""
+    n_terms = 10000
+    # enough qubits for the Pauli strings to be distinct, 4**7 > n_terms
+    n_qubits = 7
+    op = deep_hamiltonian(n_terms, n_qubits)
+
+    canonical = analog_operator_canonicalization(op, cache=None)
+    verify_canonicalization(canonical)
+    assert analysis_canonical_hamiltonian_dim(canonical) == (n_qubits, 0)
+
+    string = Post(PrintOperator())(canonical)
+    assert string.count(" + ") == n_terms - 1
+
+
+def test_deep_math_expr():
+    """Math expressions deeper than the recursion limit are printed"""
+    expr = MathVar(name="t")
+    for k in range(3 * sys.getrecursionlimit()):
+        expr = MathAdd(expr1=expr, expr2=MathNum(value=k))
+
+    assert print_math_expr(expr).count("+") == 3 * sys.getrecursionlimit()
+
+
+def test_deep_xx_analysis():
+    """Positions of X operators are extracted from deep Kron products"""
+    n = 3 * sys.getrecursionlimit()
+    op = X
+    with trusted_construction():
+        for q in range(1, n):
+            op = OperatorKron(op1=op, op2=X if q == n - 1 else PI)
+
+    analyzer = XXGateAnalyzer()
+    assert analyzer._count_qubits(op) == n
+    assert len(analyzer._extract_x_positions(op)) == 2
+    assert analyzer._is_time_dependent(
+        MathAdd(expr1=MathNum(value=1), expr2=MathVar(name="t"))
+    )
@@ -0,0 +1,221 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import qutip as qt
+import scipy.linalg
+
+from oqd_core.backend.expectation import ExpectationEngine
+from oqd_core.backend.local import LocalBackend
+from oqd_core.backend.metric import (
+    EntanglementEntropyReyni,
+    EntanglementEntropyVN,
+    Expectation,
+)
+from oqd_core.backend.task import Task, TaskArgsAnalog, TaskResultAnalog
+from oqd_core.compiler.analog.passes import (
+    analog_operator_canonicalization,
+    analog_operator_matrix,
+    canonicalize,
+)
+from oqd_core.interface.analog import (
+    AnalogCircuit,
+    AnalogGate,
+    Annihilation,
+    Creation,
+    Identity,
+    PauliI,
+    PauliX,
+    PauliY,
+    PauliZ,
+)
+
+########################################################################################
+from oqd_core.interface.math import MathStr
+
+########################################################################################
+
+X, Y, Z, PI, A, C, LI = (
+    PauliX(),
+    PauliY(),
+    PauliZ(),
+    PauliI(),
+    Annihilation(),
+    Creation(),
+    Identity(),
+)
+
+N = 4
+
+
+def task():
+    circuit = AnalogCircuit()
+    circuit.evolve(
+        duration=1,
+        gate=AnalogGate(hamiltonian=X @ PI @ (A + C) + 0.5 * (Z @ Z @ (C * A))),
+    )
+    circuit.evolve(
+        duration=0.7,
+        gate=AnalogGate(
+            hamiltonian=MathStr(string="cos(t)") * (PI @ X @ LI) + Y @ Y @ (A + C)
+        ),
+    )
+    circuit.measure()
+
+    args = TaskArgsAnalog(
+        fock_cutoff=N,
+        dt=0.05,
+        n_shots=100,
+        metrics={
+            "Z0": Expectation(operator=Z @ PI @ LI),
+            "n": Expectation(operator=PI @ PI @ (C * A)),
+            "S": EntanglementEntropyVN(qreg=[0]),
+            "S2": EntanglementEntropyReyni(alpha=2, qreg=[0], qmode=[0]),
+        },
+    )
+    return Task(program=circuit, args=args)
+
+
+def expected_state():
+    x, y, z, i, j, a = (
+        qt.sigmax(),
+        qt.sigmay(),
+        qt.sigmaz(),
+        qt.qeye(2),
+        qt.qeye(N),
+        qt.destroy(N),
+    )
+    psi = qt.tensor(qt.basis(2, 0), qt.basis(2, 0), qt.basis(N, 0))
+    psi = (
+        -1j * (qt.tensor(x, i, a + a.dag()) + 0.5 * qt.tensor(z, z, a.dag() * a))
+    ).expm() * psi
+    return qt.sesolve(
+        [[qt.tensor(i, x, j), np.cos], qt.tensor(y, y, a + a.dag())],
+        psi,
+        [0, 0.7],
+        options={"atol": 1e-10, "rtol": 1e-10},
+    ).states[-1]
+
+
+@pytest.mark.parametrize("n_threads", [None, 2])
+@pytest.mark.parametrize("engine", ["dense", "sparse", "matrix-free"])
+def test_local_backend(engine, n_threads):
+    """Engines agree with each other and with the evolution of qutip"""
+    result = LocalBackend(engine=engine, n_threads=n_threads, seed=0).run(task())
+    reference = LocalBackend(engine="dense", seed=0).run(task())
+
+    assert isinstance(result, TaskResultAnalog)
+    assert len(result.times) == 35
+    assert result.times[-1] == pytest.approx(1.7)
+    assert sum(result.counts.values()) == 100
+    assert result.counts == reference.counts
+    assert result.runtime > 0
+
+    state = np.array([complex(c.real, c.imag) for c in result.state])
+    # coefficients are constant over the steps, up to second order in dt
+    assert abs(np.vdot(expected_state().full().ravel(), state)) == pytest.approx(
+        1, abs=1e-6
+    )
+
+    for name, values in result.metrics.items():
+        assert len(values) == len(result.times)
+        np.testing.assert_allclose(values, reference.metrics[name], atol=1e-10)
+    assert result.metrics["Z0"][0] == 1
+    assert result.metrics["S"][0] == pytest.approx(0)
+
+
+def test_local_backend_unknown_engine():
+    with pytest.raises(ValueError):
+        LocalBackend(engine="gpu")
+
+
+@pytest.mark.parametrize("cache_bytes", [2**18, 256])
+def test_expectation_engine(cache_bytes):
+    """Stacked expectation values agree with the expectation values of each operator"""
+    operators = {
+        "Z0": 1 * (Z @ PI @ LI),
+        "ZZ": 2 * (Z @ Z @ LI),
+        "XY": 1 * (X @ Y @ LI) + 1 * (Y @ X @ LI),
+        "n": 1 * (PI @ PI @ (C * A)),
+        "x": 1 * (X @ PI @ (A + C)),
+    }
+    canonical = {
+        name: analog_operator_canonicalization(op, cache=None)
+        for name, op in operators.items()
+    }
+    engine = ExpectationEngine(canonical, N, cache_bytes=cache_bytes)
+
+    rng = np.random.default_rng(0)
+    states = rng.normal(size=(5, 4 * N)) + 1j * rng.normal(size=(5, 4 * N))
+
+    engine.allocate(7)
+    engine.write(states[:3], start=0)
+    engine.write(states[3:], start=3)
+    for name, op in canonical.items():
+        matrix = analog_operator_matrix(op, N)
+        expected = [np.vdot(state, matrix @ state).real for state in states]
+        np.testing.assert_allclose(engine.values[name][:5], expected)
+        assert list(engine.values[name][5:]) == [0, 0]
+
+    assert ExpectationEngine({}, N).evaluate(states).shape == (0, 5)
+
+    if cache_bytes == 2**18:
+        # operators of small systems are applied by a single stacked product
+        assert len(engine._stacks) == 1
+
+
+@pytest.mark.parametrize("block_size", [1, 7])
+def test_local_backend_block_size(block_size):
+    """Metrics do not depend on the blocks of states they are evaluated on"""
+    result = LocalBackend(block_size=block_size).run(task())
+    reference = LocalBackend().run(task())
+
+    for name, values in result.metrics.items():
+        np.testing.assert_allclose(values, reference.metrics[name])
+
+
+def test_local_backend_single_process(monkeypatch):
+    """Circuits are canonicalized without worker processes"""
+
+    def executor(*args, **kwargs):
+        raise AssertionError("worker processes spawned")
+
+    monkeypatch.setattr(canonicalize, "ProcessPoolExecutor", executor)
+    assert sum(LocalBackend().run(task()).counts.values()) == 100
+
+
+def test_local_backend_dense_propagators(monkeypatch):
+    """Dense propagators are exponentiated once per run of steps with the same coefficients"""
+    expm = scipy.linalg.expm
+    calls = []
+
+    def spy(A):
+        calls.append(A)
+        return expm(A)
+
+    monkeypatch.setattr(scipy.linalg, "expm", spy)
+
+    circuit = AnalogCircuit()
+    circuit.evolve(
+        duration=1,
+        gate=AnalogGate(
+            hamiltonian=MathStr(string="heaviside(t - 0.5)") * X + Z,
+        ),
+    )
+    circuit.measure()
+    args = TaskArgsAnalog(fock_cutoff=N, dt=0.1, n_shots=10)
+    LocalBackend(engine="dense").run(Task(program=circuit, args=args))
+
+    assert len(calls) == 2
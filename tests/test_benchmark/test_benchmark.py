@@ -0,0 +1,249 @@
+# Copyright 2024-2025 Open Quantum Design
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks of the math and operator passes.
+
+Each benchmark records the best wall time over a few repetitions and the peak memory allocated during one
+run (with tracemalloc), and compares them against `baselines.json`. Baselines are machine dependent, so the
+benchmarks are skipped unless run with `OQD_BENCHMARK=1`. Run with `OQD_BENCHMARK_UPDATE=1` to record them, and
+with `OQD_BENCHMARK_TOLERANCE=<factor>` to change the allowed slowdown (default 3, with an additional 10 ms of
+slack on the wall time).
+"""
+
+import functools
+import json
+import os
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from oqd_core.compiler.analog.passes.analysis import analysis_term_index
+from oqd_core.compiler.analog.passes.assign import assign_analog_circuit_dim
+from oqd_core.compiler.analog.passes.canonicalize import (
+    analog_operator_canonicalization,
+    math_chain,
+)
+from oqd_core.compiler.math.passes import simplify_math_expr
+
+########################################################################################
+from oqd_core.interface.analog import (
+    AnalogCircuit,
+    AnalogGate,
+    Annihilation,
+    Creation,
+    Identity,
+    PauliI,
+    PauliX,
+    PauliY,
+    PauliZ,
+)
+from oqd_core.interface.math import MathFunc, MathNum, MathVar
+
+########################################################################################
+
+BASELINES = Path(__file__).parent / "baselines.json"
+UPDATE = os.environ.get("OQD_BENCHMARK_UPDATE", "0") == "1"
+ENABLED = UPDATE or os.environ.get("OQD_BENCHMARK", "0") == "1"
+TOLERANCE = float(os.environ.get("OQD_BENCHMARK_TOLERANCE", "3"))
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(
+        not ENABLED, reason="benchmarks are machine dependent, set OQD_BENCHMARK=1"
+    ),
+]
+
+########################################################################################
+
+
+def random_math_expr(rng, depth, variables=("t",)):
+    """
+    Generates a random [`MathExpr`][oqd_core.interface.math.MathExpr] tree of the given depth.
+    """
+    if depth == 0:
+        if rng.random() < 0.5:
+            return MathVar(name=rng.choice(variables))
+        return MathNum(value=rng.randint(1, 9))
+
+    if rng.random() < 0.2:
+        return MathFunc(
+            func=rng.choice(["sin", "cos", "exp"]),
+            expr=random_math_expr(rng, depth - 1, variables),
+        )
+
+    expr1 = random_math_expr(rng, depth - 1, variables)
+    expr2 = random_math_expr(rng, depth - 1, variables)
+    return rng.choice([expr1 + expr2, expr1 * expr2, expr1 - expr2])
+
+
+def random_hamiltonian(rng, n_qreg, n_qmode, n_terms, depth):
+    """
+    Generates a random Hamiltonian on n_qreg qubits and n_qmode modes, as a sum of n_terms Kron products of
+    Paulis and Ladders with random coefficients of the given depth.
+    """
+    paulis = [PauliI, PauliX, PauliY, PauliZ]
+    ladders = [Annihilation, Creation, Identity]
+
+    hamiltonian = None
+    for _ in range(n_terms):
+        factors = [rng.choice(paulis)() for _ in range(n_qreg)]
+        for _ in range(n_qmode):
+            ladder = rng.choice(ladders)()
+            for _ in range(rng.randint(0, 2)):
+                ladder = ladder * rng.choice(ladders)()
+            factors.append(ladder)
+
+        term = factors[0]
+        for factor in factors[1:]:
+            term = term @ factor
+
+        term = random_math_expr(rng, depth) * term
+        hamiltonian = term if hamiltonian is None else hamiltonian + term
+    return hamiltonian
+
+
+def measure(function, model, repeat=3):
+    """
+    Returns the best wall time over repeat runs and the peak memory allocated during one run.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(model)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function(model)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return dict(time=min(times), peak=peak)
+
+
+########################################################################################
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    yield baselines
+    if UPDATE:
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def check(baselines, name, result):
+    if UPDATE:
+        baselines[name] = result
+        return
+
+    if name not in baselines:
+        pytest.skip(f"No baseline recorded for {name}")
+
+    baseline = baselines[name]
+    assert result["time"] <= TOLERANCE * baseline["time"] + 1e-2, (
+        f"{name} took {result['time']:.4f}s, baseline {baseline['time']:.4f}s"
+    )
+    assert result["peak"] <= TOLERANCE * baseline["peak"], (
+        f"{name} allocated {result['peak']}B, baseline {baseline['peak']}B"
+    )
+
+
+@functools.lru_cache
+def canonical_circuit(n_qreg, n_qmode, n_terms, depth):
+    hamiltonian = analog_operator_canonicalization(
+        random_hamiltonian(random.Random(0), n_qreg, n_qmode, n_terms, depth)
+    )
+    circuit = AnalogCircuit()
+    circuit.evolve(duration=1, gate=AnalogGate(hamiltonian=hamiltonian))
+    circuit.measure()
+    return circuit
+
+
+########################################################################################
+
+sizes = [(2, 0, 4, 2), (4, 0, 8, 2), (2, 1, 4, 2), (4, 1, 8, 3)]
+"""
+(n_qreg, n_qmode, n_terms, depth) of the benchmarked Hamiltonians
+"""
+
+
+@pytest.mark.parametrize(("n_qreg", "n_qmode", "n_terms", "depth"), sizes)
+def test_canonicalization(baselines, n_qreg, n_qmode, n_terms, depth):
+    hamiltonian = random_hamiltonian(random.Random(0), n_qreg, n_qmode, n_terms, depth)
+    check(
+        baselines,
+        f"canonicalization[{n_qreg}-{n_qmode}-{n_terms}-{depth}]",
+        measure(
+            lambda model: analog_operator_canonicalization(model, cache=None),
+            hamiltonian,
+        ),
+    )
+
+
+@pytest.mark.parametrize(("n_qreg", "n_qmode", "n_terms", "depth"), sizes)
+def test_term_index(baselines, n_qreg, n_qmode, n_terms, depth):
+    circuit = canonical_circuit(n_qreg, n_qmode, n_terms, depth)
+    check(
+        baselines,
+        f"term_index[{n_qreg}-{n_qmode}-{n_terms}-{depth}]",
+        # the cache is cleared on each run, such that the analysis is measured instead of cache hits
+        measure(
+            lambda model: (
+                analysis_term_index.cache_clear(),
+                analysis_term_index(model),
+            ),
+            circuit.sequence[0].gate.hamiltonian,
+        ),
+    )
+
+
+@pytest.mark.parametrize(("n_qreg", "n_qmode", "n_terms", "depth"), sizes)
+def test_assign_dim(baselines, n_qreg, n_qmode, n_terms, depth):
+    circuit = canonical_circuit(n_qreg, n_qmode, n_terms, depth)
+    check(
+        baselines,
+        f"assign_dim[{n_qreg}-{n_qmode}-{n_terms}-{depth}]",
+        measure(assign_analog_circuit_dim, circuit),
+    )
+
+
+@pytest.mark.parametrize(("n_qreg", "n_qmode", "n_terms", "depth"), sizes)
+def test_serialization(baselines, n_qreg, n_qmode, n_terms, depth):
+    circuit = canonical_circuit(n_qreg, n_qmode, n_terms, depth)
+    check(
+        baselines,
+        f"serialization[{n_qreg}-{n_qmode}-{n_terms}-{depth}]",
+        measure(
+            lambda model: AnalogCircuit.model_validate_json(model.model_dump_json()),
+            circuit,
+        ),
+    )
+
+
+@pytest.mark.parametrize("depth", [4, 6, 8])
+def test_math_chain(baselines, depth):
+    expr = random_math_expr(random.Random(0), depth, variables=("t", "w"))
+    check(baselines, f"math_chain[{depth}]", measure(math_chain, expr))
+
+
+@pytest.mark.parametrize("depth", [4, 6, 8])
+def test_simplify_math_expr(baselines, depth):
+    expr = random_math_expr(random.Random(0), depth, variables=("t", "w"))
+    check(baselines, f"simplify_math_expr[{depth}]", measure(simplify_math_expr, expr))